@@ -1,6 +1,10 @@
 import os
+from pathlib import Path
 from typing import List
 
+# Generative/ - bundled data files resolve against it, not the working directory
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
 
 class Settings:
     """Application settings and configuration"""
@@ -46,5 +50,106 @@ class Settings:
     # Logging Configuration
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
+    # Funneling Log Configuration
+    FUNNELING_LOG_PATH: str = os.getenv("FUNNELING_LOG_PATH", "funneling_logs.jsonl")
+    FUNNELING_LOG_FLUSH_EVERY: int = int(os.getenv("FUNNELING_LOG_FLUSH_EVERY", "20"))
+    FUNNELING_LOG_RETAIN_EVENTS: int = int(os.getenv("FUNNELING_LOG_RETAIN_EVENTS", "50000"))
+
+    # LLM Provider Circuit Breakers
+    PROVIDER_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("PROVIDER_BREAKER_FAILURE_THRESHOLD", "3"))
+    PROVIDER_BREAKER_COOLDOWN_SECONDS: float = float(os.getenv("PROVIDER_BREAKER_COOLDOWN_SECONDS", "30"))
+
+    # Hedged Roadmap Agent Requests
+    ROADMAP_HEDGING_ENABLED: bool = os.getenv("ROADMAP_HEDGING_ENABLED", "False").lower() == "true"
+    ROADMAP_HEDGE_PERCENTILE: float = float(os.getenv("ROADMAP_HEDGE_PERCENTILE", "0.9"))
+    ROADMAP_HEDGE_DEFAULT_DELAY_SECONDS: float = float(os.getenv("ROADMAP_HEDGE_DEFAULT_DELAY_SECONDS", "12"))
+    ROADMAP_HEDGE_MIN_DELAY_SECONDS: float = float(os.getenv("ROADMAP_HEDGE_MIN_DELAY_SECONDS", "2"))
+
+    # Roadmap Agent Quorum ("count:min_confidence" rules; any satisfied rule stops waiting)
+    ROADMAP_QUORUM_RULES: str = os.getenv("ROADMAP_QUORUM_RULES", "2:0.5,1:0.8")
+    ROADMAP_QUORUM_DEADLINE_SECONDS: float = float(os.getenv("ROADMAP_QUORUM_DEADLINE_SECONDS", "45"))
+
+    # Roadmap Model Cascade (small model first, escalate below the confidence threshold)
+    MODEL_CASCADE_ENABLED: bool = os.getenv("MODEL_CASCADE_ENABLED", "False").lower() == "true"
+    MODEL_CASCADE_SMALL_MODEL: str = os.getenv("MODEL_CASCADE_SMALL_MODEL", "llama-3.1-8b-instant")
+    MODEL_CASCADE_THRESHOLD: float = float(os.getenv("MODEL_CASCADE_THRESHOLD", "0.6"))
+
+    # LLM Response Cache
+    RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "True").lower() == "true"
+    RESPONSE_CACHE_PATH: str = os.getenv("RESPONSE_CACHE_PATH", "response_cache.sqlite3")
+    RESPONSE_CACHE_MEMORY_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MEMORY_ENTRIES", "512"))
+    RESPONSE_CACHE_DISK_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_DISK_ENTRIES", "10000"))
+    RESPONSE_CACHE_TTL_SECONDS: float = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "86400"))
+
+    # Semantic Roadmap Cache
+    ROADMAP_CACHE_ENABLED: bool = os.getenv("ROADMAP_CACHE_ENABLED", "True").lower() == "true"
+    ROADMAP_CACHE_SIMILARITY_THRESHOLD: float = float(os.getenv("ROADMAP_CACHE_SIMILARITY_THRESHOLD", "0.8"))
+    ROADMAP_CACHE_MAX_ENTRIES: int = int(os.getenv("ROADMAP_CACHE_MAX_ENTRIES", "500"))
+    ROADMAP_CACHE_VERSION: str = os.getenv("ROADMAP_CACHE_VERSION", "1")
+    ROADMAP_CACHE_TTL_SECONDS: float = float(os.getenv("ROADMAP_CACHE_TTL_SECONDS", "604800"))
+
+    # Popular Roadmap Precomputation (the warmer generates funneled roadmaps in the background only when enabled;
+    # a snapshot written by scripts/warm_roadmap_cache.py is always loaded at startup; targets are level-only,
+    # so requests that also send current_skills usually miss them)
+    ROADMAP_WARMER_ENABLED: bool = os.getenv("ROADMAP_WARMER_ENABLED", "False").lower() == "true"
+    ROADMAP_WARMER_TOP_N: int = int(os.getenv("ROADMAP_WARMER_TOP_N", "8"))
+    ROADMAP_WARMER_LEVELS: str = os.getenv("ROADMAP_WARMER_LEVELS", "Beginner,Intermediate")
+    ROADMAP_WARMER_REFRESH_SECONDS: float = float(os.getenv("ROADMAP_WARMER_REFRESH_SECONDS", "86400"))
+    ROADMAP_WARMER_CONCURRENCY: int = int(os.getenv("ROADMAP_WARMER_CONCURRENCY", "1"))
+    ROADMAP_WARM_SNAPSHOT_PATH: str = os.getenv("ROADMAP_WARM_SNAPSHOT_PATH", "roadmap_warm_cache.jsonl")
+
+    # Provider Rate Limiting
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
+    RATE_LIMIT_DEFAULT_RPM: int = int(os.getenv("RATE_LIMIT_DEFAULT_RPM", "30"))
+    RATE_LIMIT_DEFAULT_TPM: int = int(os.getenv("RATE_LIMIT_DEFAULT_TPM", "30000"))
+    RATE_LIMIT_MAX_QUEUE: int = int(os.getenv("RATE_LIMIT_MAX_QUEUE", "20"))
+    RATE_LIMIT_MAX_WAIT_SECONDS: float = float(os.getenv("RATE_LIMIT_MAX_WAIT_SECONDS", "15"))
+    # Completion tokens held per call until actual usage is known (capped at the call's max_tokens)
+    RATE_LIMIT_COMPLETION_RESERVE_TOKENS: int = int(os.getenv("RATE_LIMIT_COMPLETION_RESERVE_TOKENS", "1024"))
+
+    # Blocking Work Executors (CPU_EXECUTOR_WORKERS=0 uses the CPU count)
+    PROVIDER_EXECUTOR_WORKERS: int = int(os.getenv("PROVIDER_EXECUTOR_WORKERS", "16"))
+    IO_EXECUTOR_WORKERS: int = int(os.getenv("IO_EXECUTOR_WORKERS", "4"))
+    CPU_EXECUTOR_WORKERS: int = int(os.getenv("CPU_EXECUTOR_WORKERS", "0"))
+
+    # Agent Pipeline Retries (the deadline covers every stage of one analysis request)
+    AGENT_RETRY_MAX_ATTEMPTS: int = int(os.getenv("AGENT_RETRY_MAX_ATTEMPTS", "3"))
+    AGENT_RETRY_BASE_DELAY_SECONDS: float = float(os.getenv("AGENT_RETRY_BASE_DELAY_SECONDS", "0.5"))
+    AGENT_RETRY_MAX_DELAY_SECONDS: float = float(os.getenv("AGENT_RETRY_MAX_DELAY_SECONDS", "8"))
+    AGENT_REQUEST_DEADLINE_SECONDS: float = float(os.getenv("AGENT_REQUEST_DEADLINE_SECONDS", "120"))
+    AGENT_SCHEMA_REPAIRS: int = int(os.getenv("AGENT_SCHEMA_REPAIRS", "1"))
+
+    # Resource Search (YouTube query variants in flight at once)
+    RESOURCE_SEARCH_CONCURRENCY: int = int(os.getenv("RESOURCE_SEARCH_CONCURRENCY", "3"))
+
+    # YouTube Data API Quota (searches get cheaper below the fractions; cache-only below the reserve)
+    YOUTUBE_QUOTA_DAILY_UNITS: int = int(os.getenv("YOUTUBE_QUOTA_DAILY_UNITS", "10000"))
+    YOUTUBE_QUOTA_TIMEZONE: str = os.getenv("YOUTUBE_QUOTA_TIMEZONE", "America/Los_Angeles")
+    YOUTUBE_QUOTA_REDUCED_FRACTION: float = float(os.getenv("YOUTUBE_QUOTA_REDUCED_FRACTION", "0.5"))
+    YOUTUBE_QUOTA_MINIMAL_FRACTION: float = float(os.getenv("YOUTUBE_QUOTA_MINIMAL_FRACTION", "0.2"))
+    YOUTUBE_QUOTA_RESERVE_UNITS: int = int(os.getenv("YOUTUBE_QUOTA_RESERVE_UNITS", "200"))
+    YOUTUBE_QUOTA_LEDGER_PATH: str = os.getenv("YOUTUBE_QUOTA_LEDGER_PATH", "youtube_quota.json")
+
+    # Curated Resource Catalog (JSON lines, re-read when the file changes; ships in Generative/data)
+    RESOURCE_CATALOG_PATH: str = os.getenv("RESOURCE_CATALOG_PATH", str(PACKAGE_ROOT / "data" / "resource_catalog.jsonl"))
+
+    # Resource Search Cache (fresh TTLs per resource type, then served stale while refreshing)
+    RESOURCE_CACHE_ENABLED: bool = os.getenv("RESOURCE_CACHE_ENABLED", "True").lower() == "true"
+    RESOURCE_CACHE_PATH: str = os.getenv("RESOURCE_CACHE_PATH", "resource_cache.sqlite3")
+    RESOURCE_CACHE_MEMORY_ENTRIES: int = int(os.getenv("RESOURCE_CACHE_MEMORY_ENTRIES", "256"))
+    RESOURCE_CACHE_DISK_ENTRIES: int = int(os.getenv("RESOURCE_CACHE_DISK_ENTRIES", "5000"))
+    RESOURCE_CACHE_TTLS: str = os.getenv("RESOURCE_CACHE_TTLS", "youtube:21600,courses:259200,books:2592000,certifications:2592000")
+    RESOURCE_CACHE_DEFAULT_TTL_SECONDS: float = float(os.getenv("RESOURCE_CACHE_DEFAULT_TTL_SECONDS", "86400"))
+    RESOURCE_CACHE_STALE_SECONDS: float = float(os.getenv("RESOURCE_CACHE_STALE_SECONDS", "86400"))
+    RESOURCE_CACHE_NEGATIVE_TTL_SECONDS: float = float(os.getenv("RESOURCE_CACHE_NEGATIVE_TTL_SECONDS", "300"))
+
+    # Background Provider Probing
+    PROVIDER_PROBE_ENABLED: bool = os.getenv("PROVIDER_PROBE_ENABLED", "True").lower() == "true"
+    PROVIDER_PROBE_INTERVAL_SECONDS: float = float(os.getenv("PROVIDER_PROBE_INTERVAL_SECONDS", "30"))
+    PROVIDER_PROBE_TIMEOUT_SECONDS: float = float(os.getenv("PROVIDER_PROBE_TIMEOUT_SECONDS", "2"))
+
+    # Service Container (False builds services lazily on first request)
+    SERVICE_EAGER_STARTUP: bool = os.getenv("SERVICE_EAGER_STARTUP", "True").lower() == "true"
+
 # Global settings instance
 settings = Settings()
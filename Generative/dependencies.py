@@ -3,6 +3,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from models.schemas import User
 from services.auth_service import auth_service
 from services.mock_user_service import user_service
+from services.container import container
 from typing import Optional
 
 security = HTTPBearer(auto_error=False)
@@ -58,3 +59,18 @@ async def get_current_user_required(credentials: HTTPAuthorizationCredentials =
         created_at=user["created_at"],
         updated_at=user["updated_at"]
     )
+
+
+def get_ai_service():
+    """Shared AIService instance"""
+    return container.get("ai_service")
+
+
+def get_funnel_service():
+    """Shared MultiAgentFunnelService instance"""
+    return container.get("funnel_service")
+
+
+def get_enhanced_multi_agent_service():
+    """Shared EnhancedMultiAgentService instance"""
+    return container.get("enhanced_multi_agent_service")
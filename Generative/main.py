@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -9,15 +10,42 @@ import os
 load_dotenv()
 
 from config.settings import settings
-from routes import analyze, health, mock_test, auth, update_skills, ai_search, agents
+from routes import analyze, health, mock_test, auth, update_skills, ai_search, agents, metrics
 from routes import resources as resources_routes
 from routes import multi_agent_roadmap  # NEW: Multi-agent system
+from services.container import container
+from services.http_client import close_http_client
+from services.provider_prober import provider_prober
+from services.roadmap_warmer import roadmap_warmer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown hooks"""
+    # Build shared services once instead of per request
+    if settings.SERVICE_EAGER_STARTUP:
+        container.startup()
+    # Provider reachability is refreshed off the request path
+    if settings.PROVIDER_PROBE_ENABLED:
+        provider_prober.start()
+    # Popular roadmaps: load the precomputed snapshot, then keep it fresh in the background
+    if settings.ROADMAP_CACHE_ENABLED:
+        roadmap_warmer.load_snapshot()
+        if settings.ROADMAP_WARMER_ENABLED:
+            roadmap_warmer.start()
+    yield
+    await roadmap_warmer.stop()
+    await provider_prober.stop()
+    # Release pooled provider connections
+    await close_http_client()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.API_TITLE,
     version=settings.API_VERSION,
-    description=settings.API_DESCRIPTION
+    description=settings.API_DESCRIPTION,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -48,6 +76,7 @@ app.include_router(mock_test.router)  # has prefix="/mock-test"
 app.include_router(agents.router)  # has prefix="/agents" 
 app.include_router(resources_routes.router)  # has prefix="/resources"
 app.include_router(health.router, prefix="/api")  # avoid conflict with frontend route
+app.include_router(metrics.router, prefix="/api")  # /api/metrics
 app.include_router(analyze.router)
 app.include_router(update_skills.router)
 app.include_router(ai_search.router)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 
@@ -63,6 +63,12 @@ class HealthResponse(BaseModel):
     service: str
 
 
+class ProviderHealthResponse(BaseModel):
+    """LLM provider circuit breaker state"""
+    status: str
+    providers: Dict[str, Dict[str, Any]]
+
+
 class RootResponse(BaseModel):
     """Root endpoint response"""
     message: str
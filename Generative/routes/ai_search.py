@@ -1,11 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from services.ai_service import AIService
+from dependencies import get_ai_service
 from typing import List, Dict, Any
 
 router = APIRouter(tags=["ai-search"])
-# Move AIService initialization inside the function to ensure proper environment loading
-# ai_service = AIService()  # This line will be removed
 
 
 class SkillSuggestionRequest(BaseModel):
@@ -149,14 +148,14 @@ async def suggest_skills(request: SkillSuggestionRequest):
         raise HTTPException(status_code=500, detail=f"Error generating skill suggestions: {str(e)}")
 
 @router.post("/ai/enhance-analysis")
-async def enhance_analysis_with_ai(request: EnhancedAnalysisRequest):
+async def enhance_analysis_with_ai(
+    request: EnhancedAnalysisRequest,
+    ai_service: AIService = Depends(get_ai_service)
+):
     """
     Enhanced career analysis using AI for more intelligent recommendations
     """
     try:
-        # Initialize AIService inside the function to ensure environment variables are loaded
-        ai_service = AIService()
-
         # Use the existing AI service with enhanced prompting
         enhanced_prompt = f"""
         Analyze the following skills and expertise for career guidance:
@@ -179,7 +178,7 @@ async def enhance_analysis_with_ai(request: EnhancedAnalysisRequest):
         """
 
         # Call the AI service with enhanced context
-        analysis = ai_service.generate_career_analysis(request.skills, request.expertise)
+        analysis = await ai_service.generate_career_analysis(request.skills, request.expertise)
 
         return analysis
 
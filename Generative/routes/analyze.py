@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from models.schemas import AnalyzeRequest, AnalyzeResponse, CareerPath, RoadmapStep, Course, Certification, User
 from services.ai_service import AIService
-from dependencies import get_current_user
+from services.disconnect import ClientDisconnected, disconnect_guard
+from services.single_flight import analysis_flights, canonical_key
+from dependencies import get_current_user, get_ai_service
 from typing import Optional
 import logging
 
@@ -22,13 +24,12 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["analyze"])
 
-# Expose a module-level AI service instance for tests and reuse
-ai_service = AIService()
-
 @router.post("/analyze", response_model=AnalyzeResponse)
 async def analyze_career_paths(
     request: AnalyzeRequest,
-    current_user: Optional[User] = Depends(get_current_user)
+    http_request: Request,
+    current_user: Optional[User] = Depends(get_current_user),
+    ai_service: AIService = Depends(get_ai_service)
 ):
     """
     Analyze skills and expertise to generate career paths, roadmap, and courses.
@@ -37,7 +38,9 @@ async def analyze_career_paths(
 
     Args:
         request: Analyze request with skills and expertise
+        http_request: Raw request, watched for client disconnects
         current_user: Optional authenticated user
+        ai_service: Shared AI service (overridable via app.dependency_overrides)
     """
     try:
         # Use skills and expertise from request or user profile
@@ -52,35 +55,17 @@ async def analyze_career_paths(
 
         user_id = str(current_user.id) if current_user else None
 
-        # Try agent-based analysis first (automatically falls back if agents are unavailable)
-        analysis = None
-        if AGENT_SYSTEM_AVAILABLE:
-            try:
-                logger.info("Attempting agent-based career analysis")
-                orchestrator = CareerGuidanceOrchestrator()
-                analysis = await orchestrator.analyze_career(
-                    skills=skills,
-                    expertise=expertise,
-                    user_id=user_id,
-                    use_agents=True
-                )
-
-                if analysis and analysis.get("career_paths"):
-                    logger.info("Agent-based analysis completed successfully")
-                else:
-                    logger.warning("Agent-based analysis returned empty results, falling back to standard AI service")
-                    analysis = None
-
-            except Exception as agent_error:
-                logger.warning(f"Agent-based analysis failed: {str(agent_error)}, falling back to standard AI service")
-                analysis = None
-        else:
-            logger.info("Agent system not available, using standard AI service")
-
-        # Fallback to standard AI service if agents failed or disabled
-        if not analysis:
-            logger.info("Using standard AI service for career analysis")
-            analysis = ai_service.generate_career_analysis(skills, expertise)
+        # Identical concurrent requests share one analysis; the agent path is per-user.
+        # If this client disconnects, its share of the analysis is cancelled.
+        flight_key = canonical_key(skills, expertise, user_id if AGENT_SYSTEM_AVAILABLE else None)
+        analysis = await disconnect_guard.run(
+            http_request,
+            "analyze",
+            lambda: analysis_flights.do(
+                flight_key,
+                lambda: _run_career_analysis(ai_service, skills, expertise, user_id)
+            )
+        )
 
         # Validate analysis structure
         if not analysis or not isinstance(analysis, dict):
@@ -157,6 +142,43 @@ async def analyze_career_paths(
     except HTTPException:
         # Re-raise HTTP exceptions
         raise
+    except ClientDisconnected:
+        raise HTTPException(status_code=499, detail="Client closed request")
     except Exception as e:
         logger.error(f"Unexpected error in career analysis: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error analyzing career paths: {str(e)}")
+
+
+async def _run_career_analysis(ai_service: AIService, skills: str, expertise: str, user_id: Optional[str]) -> dict:
+    """Run agent-based analysis when enabled, falling back to the standard AI service."""
+    # Try agent-based analysis first (automatically falls back if agents are unavailable)
+    analysis = None
+    if AGENT_SYSTEM_AVAILABLE:
+        try:
+            logger.info("Attempting agent-based career analysis")
+            orchestrator = CareerGuidanceOrchestrator()
+            analysis = await orchestrator.analyze_career(
+                skills=skills,
+                expertise=expertise,
+                user_id=user_id,
+                use_agents=True
+            )
+
+            if analysis and analysis.get("career_paths"):
+                logger.info("Agent-based analysis completed successfully")
+            else:
+                logger.warning("Agent-based analysis returned empty results, falling back to standard AI service")
+                analysis = None
+
+        except Exception as agent_error:
+            logger.warning(f"Agent-based analysis failed: {str(agent_error)}, falling back to standard AI service")
+            analysis = None
+    else:
+        logger.info("Agent system not available, using standard AI service")
+
+    # Fallback to standard AI service if agents failed or disabled
+    if not analysis:
+        logger.info("Using standard AI service for career analysis")
+        analysis = await ai_service.generate_career_analysis(skills, expertise)
+
+    return analysis
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
-from models.schemas import HealthResponse, RootResponse
+from models.schemas import HealthResponse, RootResponse, ProviderHealthResponse
+from services.provider_health import provider_health, ProviderHealth
 
 router = APIRouter(tags=["health"])
 
@@ -12,3 +13,10 @@ async def root():
 async def health_check():
     """Health check endpoint"""
     return HealthResponse(status="healthy", service="career-analyzer")
+
+@router.get("/health/providers", response_model=ProviderHealthResponse)
+async def provider_health_check():
+    """Live circuit breaker state, error rates and latencies for each LLM provider"""
+    providers = provider_health.snapshot()
+    degraded = any(p["state"] != ProviderHealth.CLOSED for p in providers.values())
+    return ProviderHealthResponse(status="degraded" if degraded else "healthy", providers=providers)
@@ -0,0 +1,48 @@
+from fastapi import APIRouter
+
+from config.settings import settings
+from services.response_cache import response_cache
+from services.roadmap_cache import roadmap_cache
+from services.roadmap_warmer import roadmap_warmer
+from services.disconnect import disconnect_guard
+from services.executors import executor_stats
+from services.hedge_latency import hedge_latency
+from services.model_cascade import cascade_stats
+from services.provider_prober import provider_availability
+from services.rate_limiter import rate_limiter
+from services.resource_cache import resource_cache
+from services.resource_catalog import resource_catalog
+from services.retry_policy import agent_retry_policy
+from services.single_flight import analysis_flights, roadmap_flights
+from services.youtube_quota import youtube_quota
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("")
+async def get_metrics():
+    """Runtime counters for caches and provider traffic"""
+    return {
+        "response_cache": response_cache.stats() if response_cache is not None else {"enabled": False},
+        "roadmap_cache": roadmap_cache.stats() if settings.ROADMAP_CACHE_ENABLED else {"enabled": False},
+        "roadmap_warmer": roadmap_warmer.stats(),
+        "resource_cache": resource_cache.stats() if resource_cache is not None else {"enabled": False},
+        "youtube_quota": youtube_quota.stats(),
+        "resource_catalog": resource_catalog.stats(),
+        "rate_limits": rate_limiter.stats(),
+        "provider_availability": provider_availability.stats(),
+        "executors": executor_stats(),
+        "model_cascades": cascade_stats(),
+        "hedge_latency": hedge_latency.snapshot(),
+        "disconnects": disconnect_guard.stats(),
+        "agent_retries": agent_retry_policy.stats(),
+        "single_flight": {
+            group.name: group.stats() for group in (analysis_flights, roadmap_flights)
+        },
+    }
+
+
+@router.get("/youtube-quota")
+async def get_youtube_quota():
+    """YouTube Data API unit spend, projected exhaustion and the current search plan"""
+    return youtube_quota.stats()
@@ -2,26 +2,22 @@ from fastapi import APIRouter, HTTPException, Depends
 from fastapi.security import HTTPBearer
 from models.schemas import MockTestRequest, MockTestResponse, MockTestQuestion, User
 from services.ai_service import AIService
-from dependencies import get_current_user
+from dependencies import get_current_user, get_ai_service
 from typing import Optional
 
 router = APIRouter(prefix="/mock-test", tags=["mock-test"])
-# Move AIService initialization inside the function to ensure proper environment loading
-# ai_service = AIService()  # This line will be removed
 security = HTTPBearer()
 
 @router.post("", response_model=MockTestResponse)
 async def generate_mock_test(
     request: MockTestRequest,
-    current_user: Optional[User] = Depends(get_current_user)
+    current_user: Optional[User] = Depends(get_current_user),
+    ai_service: AIService = Depends(get_ai_service)
 ):
     """
     Generate a mock test based on skills and expertise using Vertex AI
     and save it to Firestore. Requires authentication.
     """
-    # Initialize AIService inside the function to ensure environment variables are loaded
-    ai_service = AIService()
-
     try:
         # Use skills and expertise from request or user profile
         skills = request.skills or (current_user.skills if current_user else "")
@@ -34,7 +30,7 @@ async def generate_mock_test(
             )
 
         # Generate mock test using Vertex AI
-        test_data = ai_service.generate_mock_test(
+        test_data = await ai_service.generate_mock_test(
             skills=skills,
             expertise=expertise,
             topic=request.topic or "",
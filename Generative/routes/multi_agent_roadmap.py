@@ -3,10 +3,12 @@ FastAPI Route for Multi-Agent Funneling System
 New endpoints that don't interfere with existing routes
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 import asyncio
+import json
 from datetime import datetime
 import time
 import os
@@ -17,14 +19,13 @@ load_dotenv()
 
 # Import your new service AFTER loading env vars
 from services.multi_agent_service import MultiAgentFunnelService
-from services.enhanced_multi_agent_service import EnhancedMultiAgentService
 from services.revolutionary_multi_agent_service import RevolutionaryMultiAgentService
+from services.disconnect import ClientDisconnected, disconnect_guard
+from services.single_flight import roadmap_flights, canonical_key
+from dependencies import get_funnel_service, get_enhanced_multi_agent_service
 
 router = APIRouter(tags=["Multi-Agent Roadmap V2"])
 
-# Global service instance - Enhanced Multi-Agent System  
-multi_agent_service = EnhancedMultiAgentService()
-
 
 # Request/Response Models
 class UserBackground(BaseModel):
@@ -68,25 +69,74 @@ task_storage: Dict[str, Any] = {}
 
 
 @router.post("/multi-agent-roadmap", response_model=RoadmapResponse)
-async def generate_multi_agent_roadmap_direct(request: RoadmapRequest):
+async def generate_multi_agent_roadmap_direct(
+    request: RoadmapRequest,
+    http_request: Request,
+    funnel_service: MultiAgentFunnelService = Depends(get_funnel_service)
+):
     """
     Direct endpoint for multi-agent roadmap generation (frontend compatible)
     """
-    return await generate_multi_agent_roadmap_internal(request)
+    return await generate_multi_agent_roadmap_internal(request, funnel_service, http_request)
 
 @router.post("/api/v2/roadmap/generate", response_model=RoadmapResponse) 
-async def generate_multi_agent_roadmap(request: RoadmapRequest):
+async def generate_multi_agent_roadmap(
+    request: RoadmapRequest,
+    http_request: Request,
+    funnel_service: MultiAgentFunnelService = Depends(get_funnel_service)
+):
     """
     V2 API endpoint for multi-agent roadmap generation
     """
-    return await generate_multi_agent_roadmap_internal(request)
+    return await generate_multi_agent_roadmap_internal(request, funnel_service, http_request)
+
+@router.post("/multi-agent-roadmap/stream")
+async def stream_multi_agent_roadmap(
+    request: RoadmapRequest,
+    service: MultiAgentFunnelService = Depends(get_funnel_service)
+):
+    """
+    Stream multi-agent roadmap generation as Server-Sent Events
 
-async def generate_multi_agent_roadmap_internal(request: RoadmapRequest):
+    Events: agent_started, agent_finished, phase_preview (provisional nodes from the
+    first agent to finish), phase (each synthesized node), complete (full result)
+    and error.
+    """
+    background_dict = None
+    if request.background:
+        background_dict = request.background.model_dump(exclude_none=True)
+
+    async def event_stream():
+        try:
+            async for event, payload in service.stream_roadmap(request.query, background_dict):
+                yield format_sse(event, payload)
+        except Exception as e:
+            print(f"❌ Multi-Agent stream error: {e}")
+            yield format_sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def format_sse(event: str, payload: Dict[str, Any]) -> str:
+    """Encode one Server-Sent Event frame"""
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+async def generate_multi_agent_roadmap_internal(
+    request: RoadmapRequest,
+    funnel_service: Optional[MultiAgentFunnelService] = None,
+    http_request: Optional[Request] = None
+):
     """
     Generate a comprehensive learning roadmap using multiple AI agents
     
     This endpoint orchestrates 3 different AI agents to create roadmaps
     from different perspectives, then synthesizes them into one optimal result.
+    When `http_request` is given, the agents are cancelled if that client disconnects.
     
     - **query**: Your career goal or question (e.g., "I want to learn data science")
     - **background**: Optional background information for personalization
@@ -94,9 +144,7 @@ async def generate_multi_agent_roadmap_internal(request: RoadmapRequest):
     """
     
     try:
-        # Use the REAL multi-agent service instead of the fake one
-        from services.multi_agent_service import MultiAgentFunnelService
-        real_multi_agent_service = MultiAgentFunnelService()
+        funnel_service = funnel_service or get_funnel_service()
         
         # Convert background to dict if provided
         background_dict = None
@@ -107,14 +155,23 @@ async def generate_multi_agent_roadmap_internal(request: RoadmapRequest):
         print(f"🤖 Multi-Agent Processing: {request.query}")
         
         try:
-            # Call the REAL multi-agent service
-            result = await real_multi_agent_service.generate_funneled_roadmap(
-                user_query=request.query,
-                user_background=background_dict
+            # Call the REAL multi-agent service; identical concurrent requests share one run
+            result = await disconnect_guard.run(
+                http_request,
+                "multi_agent_roadmap",
+                lambda: roadmap_flights.do(
+                    canonical_key(request.query, background_dict),
+                    lambda: funnel_service.generate_funneled_roadmap(
+                        user_query=request.query,
+                        user_background=background_dict
+                    )
+                )
             )
             
             print(f"✅ Real Multi-Agent Results Generated!")
             
+        except ClientDisconnected:
+            raise
         except Exception as e:
             print(f"❌ Multi-Agent Error: {e}")
             import traceback
@@ -145,6 +202,8 @@ async def generate_multi_agent_roadmap_internal(request: RoadmapRequest):
             funneling_report=result.get("funneling_report", {})
         )
     
+    except ClientDisconnected:
+        raise HTTPException(status_code=499, detail="Client closed request")
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -208,8 +267,7 @@ async def process_roadmap_generation(task_id: str, request: RoadmapRequest):
     
     try:
         # Use the correct service
-        from services.enhanced_multi_agent_service import EnhancedMultiAgentService
-        enhanced_service = EnhancedMultiAgentService()
+        enhanced_service = get_enhanced_multi_agent_service()
         
         background_dict = None
         if request.background:
@@ -247,10 +305,11 @@ async def process_roadmap_generation(task_id: str, request: RoadmapRequest):
 async def test_service():
     """Test if global logs are working"""
     try:
-        from services.multi_agent_service import GLOBAL_FUNNELING_LOGS
+        from services.multi_agent_service import GLOBAL_FUNNELING_LOGS, ensure_logs_loaded, funneling_event_store
         
+        ensure_logs_loaded()
         logs_count = len(GLOBAL_FUNNELING_LOGS)
-        recent_sessions = list(set(log.get("session_id") for log in GLOBAL_FUNNELING_LOGS[-10:] if log.get("session_id")))
+        recent_sessions = [summary["session_id"] for summary in funneling_event_store.recent_sessions(10)]
         
         return {
             "success": True,
@@ -290,13 +349,16 @@ async def health_check():
 
 # Integration with existing /analyze endpoint
 @router.post("/analyze-enhanced")
-async def enhanced_analyze(request: RoadmapRequest):
+async def enhanced_analyze(
+    request: RoadmapRequest,
+    funnel_service: MultiAgentFunnelService = Depends(get_funnel_service)
+):
     """
     Enhanced version of the analyze endpoint using multi-agent system
     Compatible with existing frontend, drop-in replacement for /analyze
     """
     
-    result = await generate_multi_agent_roadmap(request)
+    result = await generate_multi_agent_roadmap_internal(request, funnel_service)
     
     # Format to match original /analyze response structure
     return {
@@ -327,15 +389,15 @@ def _extract_skills_from_roadmap(roadmap: str) -> List[str]:
 
 # New endpoints for funneling reports
 @router.get("/funneling-report/{session_id}")
-async def get_funneling_report(session_id: str):
+async def get_funneling_report(
+    session_id: str,
+    funnel_service: MultiAgentFunnelService = Depends(get_funnel_service)
+):
     """
     Get detailed funneling report for a specific session
     Shows how multiple agents worked together and which one was selected
     """
     try:
-        # Create a new instance of the service that has the method
-        from services.multi_agent_service import MultiAgentFunnelService
-        funnel_service = MultiAgentFunnelService()
         report = funnel_service.generate_funneling_report(session_id)
         
         if "error" in report:
@@ -364,27 +426,18 @@ async def list_all_sessions():
     Useful for teachers to see all student interactions
     """
     try:
-        global multi_agent_service
-        
-        # Import global logs
-        from services.multi_agent_service import GLOBAL_FUNNELING_LOGS
-        
-        # Get unique session IDs from logs
-        session_ids = list(set(
-            log.get("session_id") 
-            for log in GLOBAL_FUNNELING_LOGS 
-            if log.get("session_id")
-        ))
+        # Import the session index
+        from services.multi_agent_service import ensure_logs_loaded, funneling_event_store
         
+        ensure_logs_loaded()
         sessions_info = []
-        for session_id in session_ids[-20:]:  # Last 20 sessions
-            session_logs = [log for log in GLOBAL_FUNNELING_LOGS if log.get("session_id") == session_id]
-            session_start = next((log for log in session_logs if "user_query" in log), {})
-            completion_log = next((log for log in session_logs if log.get("event_type") == "SESSION_COMPLETE"), {})
+        for summary in funneling_event_store.recent_sessions(20):  # Last 20 sessions, newest first
+            session_start = summary["session_start"]
+            completion_log = summary["completion"]
             
             if session_start:
                 sessions_info.append({
-                    "session_id": session_id,
+                    "session_id": summary["session_id"],
                     "timestamp": datetime.fromtimestamp(session_start.get("timestamp", 0)).isoformat(),
                     "user_query": session_start.get("user_query", "")[:100] + "..." if len(session_start.get("user_query", "")) > 100 else session_start.get("user_query", ""),
                     "status": "completed" if completion_log else "in_progress",
@@ -392,9 +445,6 @@ async def list_all_sessions():
                     "phases_generated": completion_log.get("total_phases_generated", 0) if completion_log else 0
                 })
         
-        # Sort by timestamp (newest first)
-        sessions_info.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-        
         return {
             "success": True,
             "sessions": sessions_info,
@@ -415,8 +465,8 @@ async def get_demo_report():
     Generate a sample funneling report to show teachers what the system tracks
     """
     try:
-        # Create a demo service instance
-        service = EnhancedMultiAgentService()
+        # Shared demo service instance
+        service = get_enhanced_multi_agent_service()
         
         # Generate a demo report structure
         demo_report = {
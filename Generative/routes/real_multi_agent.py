@@ -3,13 +3,14 @@ REAL Multi-Agent System Route - Fixed Integration
 This replaces the broken multi-agent implementation with proper synthesis
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 import logging
 
 from services.multi_agent_service import MultiAgentFunnelService
+from dependencies import get_funnel_service
 
 router = APIRouter(tags=["Real Multi-Agent System"])
 
@@ -41,7 +42,10 @@ class MultiAgentRoadmapResponse(BaseModel):
     mastery_acceleration: Optional[Dict[str, Any]] = {}
 
 @router.post("/generate-roadmap", response_model=MultiAgentRoadmapResponse)
-async def generate_real_multi_agent_roadmap(request: MultiAgentRequest):
+async def generate_real_multi_agent_roadmap(
+    request: MultiAgentRequest,
+    multi_agent_service: MultiAgentFunnelService = Depends(get_funnel_service)
+):
     """
     REAL Multi-Agent Roadmap Generation with Proper Synthesis
     
@@ -54,9 +58,6 @@ async def generate_real_multi_agent_roadmap(request: MultiAgentRequest):
     logger.info(f"🚀 Starting REAL Multi-Agent Generation for: {request.query}")
     
     try:
-        # Initialize the real multi-agent service
-        multi_agent_service = MultiAgentFunnelService()
-        
         # Convert background to proper format
         background_dict = None
         if request.background:
@@ -128,10 +129,9 @@ async def health_check():
     }
 
 @router.get("/test-synthesis")
-async def test_synthesis():
+async def test_synthesis(service: MultiAgentFunnelService = Depends(get_funnel_service)):
     """Test the synthesis system with a simple query"""
     try:
-        service = MultiAgentFunnelService()
         
         # Test with minimal query
         result = await service.generate_roadmap(
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
 from typing import List, Optional, Literal
+from services.disconnect import ClientDisconnected, disconnect_guard
 from services.enhanced_resource_service import enhanced_resource_service
 
 router = APIRouter(prefix="/resources", tags=["resources"])
@@ -22,7 +23,7 @@ class SearchResourcesResponse(BaseModel):
     results: List[ResourceItem]
 
 @router.post("/search", response_model=SearchResourcesResponse)
-async def search_resources(payload: SearchResourcesRequest):
+async def search_resources(payload: SearchResourcesRequest, request: Request):
     """
     Search learning resources using REAL YouTube API and Google Gemini AI ONLY
     """
@@ -32,12 +33,17 @@ async def search_resources(payload: SearchResourcesRequest):
     print(f"🔥 REAL API SEARCH REQUEST: {payload.type} for '{payload.topic}' (limit: {payload.limit})")
     
     try:
-        # Use ONLY our enhanced resource service with REAL APIs
-        enhanced_results = enhanced_resource_service.get_enhanced_resources(
-            topic=payload.topic,
-            resource_type=payload.type,
-            limit=payload.limit,
-            level=payload.level or "intermediate"
+        # Use ONLY our enhanced resource service with REAL APIs; a disconnect cancels
+        # the in-flight searches
+        enhanced_results = await disconnect_guard.run(
+            request,
+            "resources_search",
+            lambda: enhanced_resource_service.get_enhanced_resources(
+                topic=payload.topic,
+                resource_type=payload.type,
+                limit=payload.limit,
+                level=payload.level or "intermediate"
+            )
         )
         
         # Convert to ResourceItem format
@@ -65,6 +71,8 @@ async def search_resources(payload: SearchResourcesRequest):
         
         return SearchResourcesResponse(results=results)
         
+    except ClientDisconnected:
+        raise HTTPException(status_code=499, detail="Client closed request")
     except Exception as e:
         print(f"❌ Enhanced resource service error: {e}")
         import traceback
@@ -0,0 +1,42 @@
+"""
+Batch job: precompute popular career roadmaps
+Generates funneled roadmaps for the top-N career queries and experience levels and writes the
+versioned snapshot that the API loads into its roadmap cache at startup.
+
+Usage (from the Generative directory):
+    python -m scripts.warm_roadmap_cache [--top-n 8] [--levels Beginner,Intermediate] [--force]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from config.settings import settings
+from services.roadmap_warmer import roadmap_warmer, warm_targets
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Precompute popular career roadmaps into the roadmap cache snapshot")
+    parser.add_argument("--top-n", type=int, default=settings.ROADMAP_WARMER_TOP_N, help="Number of popular careers")
+    parser.add_argument("--levels", default=settings.ROADMAP_WARMER_LEVELS, help="Comma-separated experience levels")
+    parser.add_argument("--force", action="store_true", help="Regenerate entries that are still fresh")
+    args = parser.parse_args()
+
+    roadmap_warmer.targets = warm_targets(args.top_n, [level.strip() for level in args.levels.split(",") if level.strip()])
+    roadmap_warmer.load_snapshot()
+    outcome = await roadmap_warmer.warm_once(force=args.force)
+
+    print(f"📦 Snapshot: {os.path.abspath(settings.ROADMAP_WARM_SNAPSHOT_PATH)} (cache version {settings.ROADMAP_CACHE_VERSION})")
+    print(f"📊 {outcome['generated']} generated, {outcome['failed']} failed, {outcome['fresh']} already fresh")
+    return 1 if outcome["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -6,6 +6,7 @@ import os
 import json
 import logging
 import asyncio
+from dataclasses import replace
 from typing import Dict, Any, Optional
 from pydantic import BaseModel
 
@@ -20,6 +21,12 @@ except ImportError:
     logger = logging.getLogger(__name__)
     logger.warning("Google ADK not available, will use fallback implementation")
 
+from services.executors import provider_executor
+from services.json_stream import parse_json
+from services.llm_client import llm_client, GenerationOptions
+from services.retry_policy import Attempt, Deadline, SchemaInvalidError, agent_retry_policy
+from services.stage_dag import Stage, StageDAG
+
 from .schemas import (
     SkillAssessment,
     CareerMatchAnalysis,
@@ -65,18 +72,10 @@ class AgentService:
             logger.info("AgentService initialized with Gemini fallback")
 
     def _init_gemini_fallback(self):
-        """Initialize Gemini API for fallback implementation"""
-        try:
-            import google.generativeai as genai
-            genai.configure(api_key=self.api_key)
-            self.genai_model = genai.GenerativeModel('gemini-2.0-flash-exp')
-            self.genai_available = True
-        except Exception as e:
-            logger.error(f"Failed to initialize Gemini fallback: {e}")
-            self.genai_available = False
-            # Try REST API approach
-            self.genai_api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent?key={self.api_key}"
-            self.genai_available = True
+        """Initialize Gemini REST settings for the fallback implementation"""
+        # Calls go through the shared async provider client, so no SDK setup is needed
+        self.genai_model_name = 'gemini-2.0-flash-exp'
+        self.genai_available = bool(self.api_key)
 
     def _get_skill_analyzer_instruction(self) -> str:
         """Get instruction for Skill Analyzer Agent"""
@@ -199,10 +198,14 @@ Prioritize:
 Respond with valid JSON matching the ResourceCollection schema.
 """
 
-    async def _call_gemini_with_schema(self, prompt: str, schema_class: BaseModel, max_retries: int = 3) -> Dict[str, Any]:
-        """Call Gemini API with schema validation"""
-        import requests
-
+    async def _call_gemini_with_schema(
+        self,
+        prompt: str,
+        schema_class: BaseModel,
+        max_retries: Optional[int] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Dict[str, Any]:
+        """Call Gemini API with schema validation, retried under the agent retry policy"""
         schema_json = schema_class.model_json_schema()
         full_prompt = f"""{prompt}
 
@@ -211,71 +214,54 @@ IMPORTANT: Respond with ONLY valid JSON that matches the following schema struct
 
 Do not include any markdown formatting, code blocks, or explanatory text. Return ONLY the JSON object."""
 
-        for attempt in range(max_retries):
+        options = GenerationOptions(
+            provider="gemini",
+            model=getattr(self, "genai_model_name", "gemini-2.0-flash-exp"),
+            api_key=self.api_key,
+            max_tokens=8192,
+            timeout=60
+        )
+
+        async def attempt_call(attempt: Attempt) -> Dict[str, Any]:
+            call_prompt = full_prompt
+            if attempt.repair:
+                call_prompt = self._repair_prompt(full_prompt, attempt.last_error)
+            # Never let one call outlive the request deadline
+            call_options = replace(options, timeout=max(1.0, min(options.timeout, attempt.remaining_seconds)))
+            result_text = await llm_client.generate(call_prompt, call_options)
+
+            # Tolerant parse: fences, prose, trailing commas and truncation are recovered
+            parsed = parse_json(result_text, expect=dict)
+            if parsed is None:
+                raise SchemaInvalidError(f"No JSON object in response: {result_text[:200]}", raw_text=result_text)
+
+            # Validate against schema (try to create instance)
             try:
-                if hasattr(self, 'genai_model') and self.genai_available:
-                    # Use SDK (avoid unsupported GenerationConfig fields for broad compatibility)
-                    response = self.genai_model.generate_content(full_prompt)
-                    result_text = getattr(response, "text", "")
-                else:
-                    # Use REST API
-                    payload = {
-                        "contents": [{
-                            "parts": [{
-                                "text": full_prompt
-                            }]
-                        }]
-                    }
-                    response = requests.post(self.genai_api_url, json=payload, timeout=60)
-                    response.raise_for_status()
-                    result = response.json()
-                    result_text = result.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "{}")
-
-                # Parse JSON
-                if isinstance(result_text, str):
-                    # Clean up JSON string
-                    result_text = result_text.strip()
-                    # Remove markdown code blocks
-                    if result_text.startswith("```json"):
-                        result_text = result_text[7:]
-                    elif result_text.startswith("```"):
-                        result_text = result_text[3:]
-                    if result_text.endswith("```"):
-                        result_text = result_text[:-3]
-                    result_text = result_text.strip()
-
-                    # Parse JSON
-                    try:
-                        parsed = json.loads(result_text)
-                    except json.JSONDecodeError as json_err:
-                        logger.warning(f"JSON parse error: {json_err}, text: {result_text[:200]}")
-                        # Try to extract JSON from text
-                        start_idx = result_text.find('{')
-                        end_idx = result_text.rfind('}') + 1
-                        if start_idx != -1 and end_idx > start_idx:
-                            parsed = json.loads(result_text[start_idx:end_idx])
-                        else:
-                            raise
-
-                    # Validate against schema (try to create instance)
-                    try:
-                        schema_class(**parsed)
-                    except Exception as validation_err:
-                        logger.warning(f"Schema validation warning: {validation_err}, but continuing with parsed data")
-
-                    return parsed
-                else:
-                    # Already a dict
-                    return result_text if isinstance(result_text, dict) else {}
+                schema_class(**parsed)
+            except Exception as validation_err:
+                raise SchemaInvalidError(f"Schema validation failed: {validation_err}", raw_text=result_text, parsed=parsed)
+            return parsed
 
-            except Exception as e:
-                logger.warning(f"Attempt {attempt + 1} failed: {e}")
-                if attempt == max_retries - 1:
-                    logger.error(f"All {max_retries} attempts failed for schema {schema_class.__name__}")
-                    raise
-                await asyncio.sleep(1)
-
-        raise Exception("Failed to get valid response from Gemini after all retries")
+        try:
+            return await agent_retry_policy.run(attempt_call, deadline, max_attempts=max_retries)
+        except SchemaInvalidError as e:
+            if e.parsed is None:
+                logger.error(f"No usable response for schema {schema_class.__name__}: {e}")
+                raise
+            logger.warning(f"Schema validation warning: {e}, but continuing with parsed data")
+            return e.parsed
+
+    @staticmethod
+    def _repair_prompt(full_prompt: str, error: BaseException) -> str:
+        """Re-ask with the rejected output and the reason it was rejected"""
+        raw_text = getattr(error, "raw_text", "")
+        return f"""{full_prompt}
+
+Your previous response could not be used: {error}
+Previous response:
+{raw_text[:4000]}
+
+Correct it and return ONLY the JSON object."""
 
     async def analyze_career_with_agents(
         self,
@@ -419,63 +405,60 @@ Please conduct a thorough analysis through all agent stages.
             return await self._analyze_with_fallback(skills, expertise, user_id, use_web_search)
 
     async def _analyze_with_fallback(self, skills: str, expertise: str, user_id: Optional[str] = None, use_web_search: bool = True) -> Dict[str, Any]:
-        """Analyze using direct Gemini API calls (fallback)"""
+        """Analyze using direct Gemini API calls (fallback), overlapping independent stages"""
         try:
-            # Stage 1: Skill Assessment
-            skill_prompt = f"""
+            # One deadline for the whole pipeline so retries stop once the request cannot finish in time
+            deadline = agent_retry_policy.deadline()
+
+            async def skill_assessment():
+                # Stage 1: Skill Assessment
+                skill_prompt = f"""
 {self._get_skill_analyzer_instruction()}
 
 User Skills: {skills}
 User Expertise: {expertise}
 """
-            skill_assessment = await self._call_gemini_with_schema(skill_prompt, SkillAssessment)
-
-            # Stage 2: Career Matching
-            career_prompt = self._get_career_matcher_instruction(skill_assessment)
-            career_analysis = await self._call_gemini_with_schema(career_prompt, CareerMatchAnalysis)
-
-            # Stage 3: Roadmap Generation
-            roadmap_prompt = self._get_roadmap_generator_instruction(skill_assessment, career_analysis)
-            learning_roadmap = await self._call_gemini_with_schema(roadmap_prompt, LearningRoadmap)
-
-            # Stage 4: Resource Curation (with web search if enabled)
-            resource_prompt = self._get_resource_curator_instruction(skill_assessment, career_analysis, learning_roadmap)
-
-            # Enhance with web search if enabled
-            if use_web_search:
-                try:
-                    from .tools import resource_discovery_tool
-
-                    # Get best match career for search
-                    best_match = career_analysis.get("best_match", {})
-                    career_title = best_match.get("title", "") if isinstance(best_match, dict) else ""
-
-                    if career_title:
-                        # Discover real-time resources
-                        discovered_courses = resource_discovery_tool.discover_courses_for_skill(
-                            career_title, level=expertise.lower()
-                        )
-                        discovered_certifications = resource_discovery_tool.discover_certifications_for_career(career_title)
-
-                        # Add discovered resources to prompt
-                        if discovered_courses or discovered_certifications:
-                            resource_prompt += "\n\nReal-time Discovered Resources:\n"
-                            if discovered_courses:
-                                resource_prompt += f"Courses: {json.dumps(discovered_courses[:5], indent=2)}\n"
-                            if discovered_certifications:
-                                resource_prompt += f"Certifications: {json.dumps(discovered_certifications[:3], indent=2)}\n"
-
-                            resource_prompt += "\nPlease incorporate these real-time resources into your recommendations."
-                except Exception as search_error:
-                    logger.warning(f"Web search failed, continuing without real-time resources: {search_error}")
-
-            resources = await self._call_gemini_with_schema(resource_prompt, ResourceCollection)
+                return await self._call_gemini_with_schema(skill_prompt, SkillAssessment, deadline=deadline)
+
+            async def career_analysis(skill_assessment):
+                # Stage 2: Career Matching
+                career_prompt = self._get_career_matcher_instruction(skill_assessment)
+                return await self._call_gemini_with_schema(career_prompt, CareerMatchAnalysis, deadline=deadline)
+
+            async def learning_roadmap(skill_assessment, career_analysis):
+                # Stage 3: Roadmap Generation
+                roadmap_prompt = self._get_roadmap_generator_instruction(skill_assessment, career_analysis)
+                return await self._call_gemini_with_schema(roadmap_prompt, LearningRoadmap, deadline=deadline)
+
+            async def discovered_resources(career_analysis):
+                # Web search only needs the career match, so it runs alongside roadmap generation
+                if not use_web_search:
+                    return {}
+                return await self._discover_resources(career_analysis, expertise)
+
+            async def resources(skill_assessment, career_analysis, learning_roadmap, discovered_resources):
+                # Stage 4: Resource Curation (with web search results if enabled)
+                resource_prompt = self._get_resource_curator_instruction(skill_assessment, career_analysis, learning_roadmap)
+                resource_prompt += self._discovered_resources_prompt(discovered_resources)
+                return await self._call_gemini_with_schema(resource_prompt, ResourceCollection, deadline=deadline)
+
+            pipeline = StageDAG([
+                Stage("skill_assessment", skill_assessment),
+                Stage("career_analysis", career_analysis, ("skill_assessment",)),
+                Stage("learning_roadmap", learning_roadmap, ("skill_assessment", "career_analysis")),
+                Stage("discovered_resources", discovered_resources, ("career_analysis",)),
+                Stage("resources", resources, ("skill_assessment", "career_analysis", "learning_roadmap", "discovered_resources")),
+            ])
+            results = await pipeline.run()
+            timings = pipeline.report()
+            logger.info(f"Agent pipeline finished in {timings['total_seconds']}s ({timings['overlap_seconds']}s overlapped)")
 
             return {
-                "skill_assessment": skill_assessment,
-                "career_analysis": career_analysis,
-                "learning_roadmap": learning_roadmap,
-                "resources": resources,
+                "skill_assessment": results["skill_assessment"],
+                "career_analysis": results["career_analysis"],
+                "learning_roadmap": results["learning_roadmap"],
+                "resources": results["resources"],
+                "stage_timings": timings,
                 "agent_run_successful": True
             }
 
@@ -483,6 +466,39 @@ User Expertise: {expertise}
             logger.error(f"Error in fallback analysis: {str(e)}", exc_info=True)
             raise
 
+    async def _discover_resources(self, career_analysis: Dict[str, Any], expertise: str) -> Dict[str, Any]:
+        """Run the blocking web-search tools on the executor; failures only lose the real-time resources"""
+        try:
+            from .tools import resource_discovery_tool
+
+            # Get best match career for search
+            best_match = career_analysis.get("best_match", {})
+            career_title = best_match.get("title", "") if isinstance(best_match, dict) else ""
+            if not career_title:
+                return {}
+
+            courses, certifications = await asyncio.gather(
+                provider_executor.run(resource_discovery_tool.discover_courses_for_skill, career_title, level=expertise.lower()),
+                provider_executor.run(resource_discovery_tool.discover_certifications_for_career, career_title),
+            )
+            return {"courses": courses, "certifications": certifications}
+        except Exception as search_error:
+            logger.warning(f"Web search failed, continuing without real-time resources: {search_error}")
+            return {}
+
+    @staticmethod
+    def _discovered_resources_prompt(discovered: Dict[str, Any]) -> str:
+        discovered_courses = discovered.get("courses")
+        discovered_certifications = discovered.get("certifications")
+        if not discovered_courses and not discovered_certifications:
+            return ""
+        prompt = "\n\nReal-time Discovered Resources:\n"
+        if discovered_courses:
+            prompt += f"Courses: {json.dumps(discovered_courses[:5], indent=2)}\n"
+        if discovered_certifications:
+            prompt += f"Certifications: {json.dumps(discovered_certifications[:3], indent=2)}\n"
+        return prompt + "\nPlease incorporate these real-time resources into your recommendations."
+
     def convert_agent_results_to_legacy_format(self, agent_results: Dict[str, Any]) -> Dict[str, Any]:
         """
         Convert agent results to the legacy format expected by the API
@@ -1,6 +1,4 @@
-import json
 import os
-import requests
 from typing import Dict, Any, List
 from datetime import datetime
 import re
@@ -65,6 +63,25 @@ except ImportError:
     genai_module = DummyGenai()
 
 from models.schemas import CareerPath, Course, RoadmapStep, MockTestQuestion
+from services.executors import provider_executor
+from services.json_stream import parse_json
+from services.llm_client import llm_client, GenerationOptions, ProviderError
+from services.provider_health import provider_health
+from services.provider_prober import provider_availability
+from services.response_cache import response_cache, make_cache_key
+
+# Sampling settings shared by the whole fallback chain. With the prompt they form the response
+# cache key, so cached answers survive providers going up or down.
+FALLBACK_GENERATION_PARAMS = {"temperature": 0.7, "max_tokens": 1000}
+
+VERTEX_MODEL_NAME = "gemini-1.0-pro"
+
+GEMINI_SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+]
 
 # Currency conversion utility
 
@@ -135,7 +152,7 @@ class AIService:
         if self.vertex_ai_available:
             try:
                 aiplatform_module.init(project=self.project_id)
-                self.model = GenerativeModelClass("gemini-1.0-pro")
+                self.model = GenerativeModelClass(VERTEX_MODEL_NAME)
                 print("✅ Vertex AI initialized successfully")
             except Exception as e:
                 print(f"Warning: Could not initialize Vertex AI: {e}")
@@ -149,14 +166,20 @@ class AIService:
                 print(f"Warning: Could not initialize Firestore client: {e}")
                 self.firestore_client = None
 
-        # Initialize fallback AI services
+        # Prompt -> response cache shared across instances
+        self.response_cache = response_cache
+
+        # Initialize fallback AI services; network-probed providers start from the
+        # last published availability and are kept current by the background prober
+        self.ollama_url = "http://localhost:11434/api/generate"
         self.fallback_apis = {
             'google_genai': self._init_google_genai(),
             'huggingface': self._init_huggingface(),
-            'ollama': self._init_ollama(),
+            'ollama': provider_availability.get('ollama'),
             'openai_free': self._init_openai_free(),
             'groq': self._init_groq()
         }
+        provider_availability.attach(self)
 
         print(f"🤖 AI Service initialized. Vertex AI: {'✅' if self.vertex_ai_available else '❌'}")
         available_fallbacks = [name for name, available in self.fallback_apis.items() if available]
@@ -175,23 +198,15 @@ class AIService:
     def _init_google_genai(self) -> bool:
         """Initialize Google Generative AI API (Gemini)"""
         try:
-            # Try both the SDK and direct REST API approach
             api_key = os.getenv('GOOGLE_GENAI_API_KEY', '')
             if not api_key or api_key == 'your_google_gemini_api_key_here':
                 print("⚠️  Google Generative AI API key not found or not configured in .env file")
                 return False
 
-            # Set up for direct REST API calls
+            # Calls go through the shared async REST client
             self.google_genai_api_key = api_key
-            self.google_genai_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent?key={api_key}"
-
-            if GOOGLE_GENAI_AVAILABLE:
-                # Also set up the SDK if available
-                genai_module.configure(api_key=api_key)
-                self.genai_model = genai_module.GenerativeModel('gemini-1.5-flash')
-                print("✅ Google Generative AI (Gemini) initialized successfully with SDK")
-            else:
-                print("✅ Google Generative AI (Gemini) initialized for direct REST API calls")
+            self.genai_model_name = 'gemini-1.5-flash'
+            print("✅ Google Generative AI (Gemini) initialized for async REST API calls")
 
             return True
         except Exception as e:
@@ -213,19 +228,6 @@ class AIService:
             print(f"Warning: Could not initialize Hugging Face API: {e}")
             return False
 
-    def _init_ollama(self) -> bool:
-        """Initialize Ollama (local AI models - completely free)"""
-        try:
-            # Check if Ollama is running locally
-            response = requests.get("http://localhost:11434/api/tags", timeout=2)
-            if response.status_code == 200:
-                self.ollama_url = "http://localhost:11434/api/generate"
-                print("✅ Ollama detected locally")
-                return True
-        except:
-            pass
-        return False
-
     def _init_groq(self) -> bool:
         """Initialize Groq API (fast and free)"""
         try:
@@ -245,183 +247,109 @@ class AIService:
         except:
             return False
 
-    def _generate_with_fallback_ai(self, prompt: str) -> str:
-        """Try different AI services as fallbacks with enhanced Gemini integration"""
-
-        # Try Google Generative AI first (Gemini) - Primary service
-        if self.fallback_apis['google_genai']:
-            try:
-                # Try SDK first if available
-                if hasattr(self, 'genai_model'):
-                    # Enhanced configuration for better responses
-                    generation_config = {
-                        "temperature": 0.7,
-                        "top_p": 0.9,
-                        "top_k": 40,
-                        "max_output_tokens": 1000,
-                    }
-
-                    response = self.genai_model.generate_content(
-                        prompt,
-                        generation_config=generation_config
-                    )
-                    if response.text:
-                        print("✅ Generated personalized content using Google Generative AI (Gemini SDK)")
-                        return response.text
-
-                # Fallback to direct REST API call with enhanced configuration
-                elif hasattr(self, 'google_genai_url'):
-                    payload = {
-                        "contents": [{
-                            "parts": [{
-                                "text": prompt
-                            }]
-                        }],
-                        "generationConfig": {
-                            "temperature": 0.7,
-                            "topP": 0.9,
-                            "topK": 40,
-                            "maxOutputTokens": 1000,
-                            "stopSequences": []
-                        },
-                        "safetySettings": [
-                            {
-                                "category": "HARM_CATEGORY_HARASSMENT",
-                                "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                            },
-                            {
-                                "category": "HARM_CATEGORY_HATE_SPEECH",
-                                "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                            },
-                            {
-                                "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                                "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                            },
-                            {
-                                "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
-                                "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                            }
-                        ]
-                    }
-                    response = requests.post(
-                        self.google_genai_url,
-                        json=payload,
-                        headers={"Content-Type": "application/json"},
-                        timeout=45  # Increased timeout for better responses
-                    )
-                    if response.status_code == 200:
-                        result = response.json()
-                        if 'candidates' in result and result['candidates']:
-                            text = result['candidates'][0]['content']['parts'][0]['text']
-                            print("✅ Generated personalized content using Google Generative AI (REST API)")
-                            return text
-                    else:
-                        print(f"Gemini API error: {response.status_code} - {response.text}")
-
-            except Exception as e:
-                print(f"Google Generative AI request failed: {e}")
-
-        # Try Ollama second (local, completely free)
-        if self.fallback_apis['ollama']:
+    def _fallback_generation_options(self) -> List[tuple]:
+        """Build (service key, label, options) for each configured fallback, in priority order"""
+        candidates = []
+
+        # Google Generative AI (Gemini) - Primary service
+        if self.fallback_apis.get('google_genai') and getattr(self, 'google_genai_api_key', ''):
+            candidates.append(('google_genai', "Google Generative AI (Gemini)", GenerationOptions(
+                provider="gemini",
+                model=self.genai_model_name,
+                api_key=self.google_genai_api_key,
+                temperature=FALLBACK_GENERATION_PARAMS["temperature"],
+                top_p=0.9,
+                top_k=40,
+                max_tokens=FALLBACK_GENERATION_PARAMS["max_tokens"],
+                timeout=45,  # Increased timeout for better responses
+                extra={"safetySettings": GEMINI_SAFETY_SETTINGS},
+            )))
+
+        # Ollama second (local, completely free)
+        if self.fallback_apis.get('ollama'):
+            candidates.append(('ollama', "Ollama (local AI)", GenerationOptions(
+                provider="ollama",
+                model="llama2",  # or "mistral", "codellama", etc.
+                base_url=getattr(self, 'ollama_url', ''),
+                timeout=30,
+            )))
+
+        if self.fallback_apis.get('huggingface'):
+            candidates.append(('huggingface', "Hugging Face API", GenerationOptions(
+                provider="huggingface",
+                model="microsoft/DialoGPT-large",
+                api_key=os.getenv('HUGGINGFACE_API_KEY', ''),
+                timeout=30,
+            )))
+
+        # Groq API (fast and free)
+        if self.fallback_apis.get('groq'):
+            candidates.append(('groq', "Groq API", GenerationOptions(
+                provider="groq",
+                model="mixtral-8x7b-32768",
+                api_key=self.groq_api_key,
+                timeout=30,
+            )))
+
+        if self.fallback_apis.get('openai_free'):
+            candidates.append(('openai_free', "OpenAI-compatible API", GenerationOptions(
+                provider="openai",
+                model="gpt-3.5-turbo",  # or whatever model the service provides
+                api_key=self.openai_free_key,
+                base_url=self.openai_free_url,
+                timeout=30,
+            )))
+
+        return candidates
+
+    async def _generate_with_vertex(self, prompt: str) -> str:
+        """Vertex AI generation on the provider SDK pool, sharing the response cache with the fallbacks"""
+        cache_key = make_cache_key(prompt, model=f"vertex:{VERTEX_MODEL_NAME}")
+        if self.response_cache is not None:
+            cached = await self.response_cache.aget(cache_key)
+            if cached:
+                print("⚡ Served Vertex AI response from cache")
+                return cached
+
+        response = await provider_executor.run(self.model.generate_content, prompt)
+        text = response.text
+        if text and self.response_cache is not None:
+            await self.response_cache.aset(cache_key, text)
+        return text
+
+    async def _generate_with_fallback_ai(self, prompt: str) -> str:
+        """Try different AI services as fallbacks, fastest healthy provider first"""
+        candidates = {options.provider: (label, options) for _, label, options in self._fallback_generation_options()}
+
+        cache_key = None
+        if self.response_cache is not None and candidates:
+            # Keyed on what was asked, not on which fallbacks happen to be available right now
+            cache_key = make_cache_key(prompt, model="fallback-ai", params=FALLBACK_GENERATION_PARAMS)
+            cached = await self.response_cache.aget(cache_key)
+            if cached:
+                print("⚡ Served AI response from cache")
+                return cached
+
+        for provider in provider_health.order(candidates):
+            label, options = candidates[provider]
             try:
-                response = requests.post(
-                    self.ollama_url,
-                    json={
-                        "model": "llama2",  # or "mistral", "codellama", etc.
-                        "prompt": prompt,
-                        "stream": False
-                    },
-                    timeout=30
-                )
-                if response.status_code == 200:
-                    result = response.json()
-                    if 'response' in result:
-                        print("✅ Generated content using Ollama (local AI)")
-                        return result['response']
-            except Exception as e:
-                print(f"Ollama request failed: {e}")
-
-        # Try Hugging Face API
-        if self.fallback_apis['huggingface']:
-            try:
-                # Use a better model for generation
-                hf_generation_url = "https://api-inference.huggingface.co/models/microsoft/DialoGPT-large"
-                response = requests.post(
-                    hf_generation_url,
-                    headers=self.hf_headers,
-                    json={
-                        "inputs": prompt,
-                        "parameters": {
-                            "max_length": 1000,
-                            "temperature": 0.7,
-                            "do_sample": True
-                        }
-                    },
-                    timeout=30
-                )
-                if response.status_code == 200:
-                    result = response.json()
-                    if isinstance(result, list) and len(result) > 0:
-                        print("✅ Generated content using Hugging Face API")
-                        return result[0].get('generated_text', '')
-            except Exception as e:
-                print(f"Hugging Face request failed: {e}")
-
-        # Try Groq API (fast and free)
-        if self.fallback_apis['groq']:
-            try:
-                response = requests.post(
-                    self.groq_url,
-                    headers={
-                        "Authorization": f"Bearer {self.groq_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "mixtral-8x7b-32768",
-                        "messages": [{"role": "user", "content": prompt}],
-                        "max_tokens": 1000,
-                        "temperature": 0.7
-                    },
-                    timeout=30
-                )
-                if response.status_code == 200:
-                    result = response.json()
-                    if 'choices' in result and len(result['choices']) > 0:
-                        print("✅ Generated content using Groq API")
-                        return result['choices'][0]['message']['content']
-            except Exception as e:
-                print(f"Groq request failed: {e}")
-
-        # Try OpenAI-compatible free API
-        if self.fallback_apis['openai_free']:
-            try:
-                response = requests.post(
-                    f"{self.openai_free_url}/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.openai_free_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "gpt-3.5-turbo",  # or whatever model the service provides
-                        "messages": [{"role": "user", "content": prompt}],
-                        "max_tokens": 1000,
-                        "temperature": 0.7
-                    },
-                    timeout=30
-                )
-                if response.status_code == 200:
-                    result = response.json()
-                    if 'choices' in result and len(result['choices']) > 0:
-                        print("✅ Generated content using OpenAI-compatible API")
-                        return result['choices'][0]['message']['content']
-            except Exception as e:
-                print(f"OpenAI-compatible API request failed: {e}")
+                text = await llm_client.generate(prompt, options)
+                if text:
+                    print(f"✅ Generated content using {label}")
+                    if cache_key:
+                        await self.response_cache.aset(cache_key, text)
+                    return text
+            except ProviderError as e:
+                if e.circuit_open:
+                    print(f"⏭️ Skipping {label}: circuit open")
+                else:
+                    print(f"{label} request failed: {e}")
 
         # If all AI services fail, return empty string (caller handles fallback)
         print("⚠️ All AI services failed, using static fallback")
         return ""
 
-    def generate_personalized_roadmap(self, user_skills: str, career_goal: str, experience_level: str) -> str:
+    async def generate_personalized_roadmap(self, user_skills: str, career_goal: str, experience_level: str) -> str:
         """
         Generate a personalized career roadmap using Gemini AI
         """
@@ -471,7 +399,7 @@ Make this roadmap actionable, specific, and tailored to their current skill leve
 Make the tone friendly and encouraging, like a helpful mentor guiding a friend through their career journey.
         """
 
-        ai_response = self._generate_with_fallback_ai(roadmap_prompt)
+        ai_response = await self._generate_with_fallback_ai(roadmap_prompt)
 
         if ai_response:
             return ai_response
@@ -522,7 +450,7 @@ Hey there, future rockstar! 👋 I'm so excited to help guide you on your journe
 Remember, every expert was once a beginner. You've got this, and I'm cheering you on every step of the way! 🌈✨
         """
 
-    def generate_career_analysis(self, skills: str, expertise: str) -> Dict[str, Any]:
+    async def generate_career_analysis(self, skills: str, expertise: str) -> Dict[str, Any]:
         """Generate career analysis using available AI services with fallbacks"""
 
         prompt = f"""
@@ -611,16 +539,10 @@ Remember, every expert was once a beginner. You've got this, and I'm cheering yo
         # Try Vertex AI first if available
         if self.vertex_ai_available and self.model:
             try:
-                response = self.model.generate_content(prompt)
-                response_text = response.text
-
-                # Extract JSON from response
-                start_idx = response_text.find('{')
-                end_idx = response_text.rfind('}') + 1
+                response_text = await self._generate_with_vertex(prompt)
 
-                if start_idx != -1 and end_idx != -1:
-                    json_str = response_text[start_idx:end_idx]
-                    result = json.loads(json_str)
+                result = parse_json(response_text, expect=dict)
+                if result:
                     print("✅ Generated career analysis using Vertex AI")
                     return result
 
@@ -628,36 +550,17 @@ Remember, every expert was once a beginner. You've got this, and I'm cheering yo
                 print(f"Vertex AI generation failed: {e}")
 
         # Try fallback AI services
-        ai_response = self._generate_with_fallback_ai(prompt)
+        ai_response = await self._generate_with_fallback_ai(prompt)
         if ai_response:
             print(f"🔍 AI Response received (length: {len(ai_response)})")
             print(f"🔍 First 300 chars: {ai_response[:300]}...")
             try:
-                # Try to extract JSON from AI response
-                start_idx = ai_response.find('{')
-                end_idx = ai_response.rfind('}') + 1
-
-                if start_idx != -1 and end_idx != -1:
-                    json_str = ai_response[start_idx:end_idx]
-                    print(f"🔍 Extracted JSON (length: {len(json_str)})")
-                    # Try to fix common JSON issues
-                    try:
-                        result = json.loads(json_str)
-                        print("✅ Successfully parsed AI-generated JSON!")
-                        return result
-                    except json.JSONDecodeError as e:
-                        print(f"❌ JSON parsing error: {e}")
-                        # Try to fix common JSON issues
-                        fixed_json = self._fix_json_format(json_str)
-                        if fixed_json:
-                            result = json.loads(fixed_json)
-                            print("✅ Successfully parsed fixed JSON!")
-                            return result
-                        else:
-                            print(f"❌ Could not fix JSON format")
-                            print(f"JSON string: {json_str[:200]}...")  # Print first 200 chars for debugging
-                else:
-                    print("❌ No JSON structure found in AI response")
+                # Tolerates prose, fences, trailing commas, unquoted keys and truncated output
+                result = parse_json(ai_response, expect=dict)
+                if result:
+                    print("✅ Successfully parsed AI-generated JSON!")
+                    return result
+                print("❌ No JSON structure found in AI response")
             except Exception as e:
                 print(f"❌ Error parsing AI response: {e}")
                 if 'ai_response' in locals():
@@ -669,41 +572,6 @@ Remember, every expert was once a beginner. You've got this, and I'm cheering yo
         print("📊 Using enhanced static career analysis")
         return self._create_enhanced_fallback_response(skills, expertise)
 
-    def _fix_json_format(self, json_str: str) -> str:
-        """Attempt to fix common JSON formatting issues"""
-        try:
-            # Remove any text before the first {
-            first_brace = json_str.find('{')
-            if first_brace > 0:
-                json_str = json_str[first_brace:]
-
-            # Remove any text after the last }
-            last_brace = json_str.rfind('}')
-            if last_brace > 0 and last_brace < len(json_str) - 1:
-                json_str = json_str[:last_brace + 1]
-
-            # Fix common issues
-            import re
-
-            # Fix trailing commas
-            json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
-
-            # Try to fix unquoted keys (this is a simple approach)
-            json_str = re.sub(r'([{,]\s*)([a-zA-Z_][a-zA-Z0-9_]*)\s*:', r'\1"\2":', json_str)
-
-            # Try to fix single quotes around strings
-            # This is a simplified approach - a full JSON parser would be better
-            parts = json_str.split('"')
-            for i in range(1, len(parts) - 1, 2):
-                # Skip even indices (they're outside quotes)
-                continue
-            # For odd indices, they're inside quotes, so we don't modify them
-
-            return json_str
-        except Exception as e:
-            print(f"Error fixing JSON format: {e}")
-            return ""
-
     def _create_enhanced_fallback_response(self, skills: str, expertise: str) -> Dict[str, Any]:
         """Create an enhanced fallback response that adapts to user's skills"""
 
@@ -2044,7 +1912,7 @@ Remember, every expert was once a beginner. You've got this, and I'm cheering yo
             'certifications': personalized_certifications
         }
 
-    def generate_mock_test(self, skills: str, expertise: str, topic: str = "", user_id: str = "") -> Dict[str, Any]:
+    async def generate_mock_test(self, skills: str, expertise: str, topic: str = "", user_id: str = "") -> Dict[str, Any]:
         """Generate a mock test using available AI services with fallbacks"""
 
         # Build the prompt
@@ -2069,17 +1937,10 @@ Remember, every expert was once a beginner. You've got this, and I'm cheering yo
         # Try Vertex AI first if available
         if self.vertex_ai_available and self.model and hasattr(self.model, 'generate_content'):
             try:
-                response = self.model.generate_content(prompt)
-                response_text = response.text
-
-                # Try to find JSON in the response
-                start_idx = response_text.find('[')
-                end_idx = response_text.rfind(']') + 1
-
-                if start_idx != -1 and end_idx != -1:
-                    json_str = response_text[start_idx:end_idx]
-                    questions_data = json.loads(json_str)
+                response_text = await self._generate_with_vertex(prompt)
 
+                questions_data = parse_json(response_text, expect=list)
+                if questions_data:
                     # Convert to MockTestQuestion objects
                     questions = [MockTestQuestion(**q) for q in questions_data]
                     print("✅ Generated mock test using Vertex AI")
@@ -2089,16 +1950,11 @@ Remember, every expert was once a beginner. You've got this, and I'm cheering yo
 
         # Try fallback AI services if Vertex AI failed
         if not questions:
-            ai_response = self._generate_with_fallback_ai(prompt)
+            ai_response = await self._generate_with_fallback_ai(prompt)
             if ai_response:
                 try:
-                    # Try to extract JSON from AI response
-                    start_idx = ai_response.find('[')
-                    end_idx = ai_response.rfind(']') + 1
-
-                    if start_idx != -1 and end_idx != -1:
-                        json_str = ai_response[start_idx:end_idx]
-                        questions_data = json.loads(json_str)
+                    questions_data = parse_json(ai_response, expect=list)
+                    if questions_data:
                         questions = [MockTestQuestion(**q) for q in questions_data]
                 except Exception as e:
                     print(f"Error parsing AI response: {e}")
@@ -2134,7 +1990,7 @@ Remember, every expert was once a beginner. You've got this, and I'm cheering yo
             "generated_at": datetime.now().isoformat()
         }
 
-    def extract_skills_from_message(self, message: str, current_skills: str = "") -> Dict[str, Any]:
+    async def extract_skills_from_message(self, message: str, current_skills: str = "") -> Dict[str, Any]:
         """
         Extract skills from a chat message and update the user's skill list.
 
@@ -2183,17 +2039,11 @@ Remember, every expert was once a beginner. You've got this, and I'm cheering yo
         """
 
         # Try to extract skills using AI
-        ai_response = self._generate_with_fallback_ai(prompt)
+        ai_response = await self._generate_with_fallback_ai(prompt)
         if ai_response:
             try:
-                # Try to extract JSON from AI response
-                start_idx = ai_response.find('{')
-                end_idx = ai_response.rfind('}') + 1
-
-                if start_idx != -1 and end_idx != -1:
-                    json_str = ai_response[start_idx:end_idx]
-                    result = json.loads(json_str)
-
+                result = parse_json(ai_response, expect=dict)
+                if result:
                     if "extracted_skills" in result:
                         # Update skills list
                         current_skills_list = [s.strip() for s in current_skills.split(',')] if current_skills else []
@@ -0,0 +1,82 @@
+"""
+Application-lifetime service container
+Builds each heavyweight service once (eagerly at startup or lazily on first use) and hands the same instance to every request
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class ServiceContainer:
+    """Registry of named service factories and their singleton instances"""
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        self._factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        """Return the shared instance, building it on first use."""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                factory = self._factories.get(name)
+                if factory is None:
+                    raise KeyError(f"No service registered as '{name}'")
+                started = time.monotonic()
+                instance = factory()
+                self._instances[name] = instance
+                print(f"🧩 Service '{name}' ready in {(time.monotonic() - started) * 1000:.0f}ms")
+            return instance
+
+    def startup(self, names: Optional[Iterable[str]] = None):
+        """Eagerly build services; failures are left to surface lazily on first request."""
+        for name in names or list(self._factories):
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"⚠️ Service '{name}' not started: {e}")
+
+    def override(self, name: str, instance: Any):
+        """Replace a service instance (tests, alternative backends)."""
+        with self._lock:
+            self._instances[name] = instance
+
+    def reset(self):
+        """Drop all instances so the next lookup rebuilds them."""
+        with self._lock:
+            self._instances.clear()
+
+    def is_built(self, name: str) -> bool:
+        return name in self._instances
+
+
+def _build_ai_service():
+    from services.ai_service import AIService
+    return AIService()
+
+
+def _build_funnel_service():
+    from services.multi_agent_service import MultiAgentFunnelService, ensure_logs_loaded
+    # Load/migrate the funneling log at startup rather than on the first request
+    ensure_logs_loaded()
+    return MultiAgentFunnelService()
+
+
+def _build_enhanced_multi_agent_service():
+    from services.enhanced_multi_agent_service import EnhancedMultiAgentService
+    return EnhancedMultiAgentService()
+
+
+# Global container instance
+container = ServiceContainer()
+container.register("ai_service", _build_ai_service)
+container.register("funnel_service", _build_funnel_service)
+container.register("enhanced_multi_agent_service", _build_enhanced_multi_agent_service)
@@ -0,0 +1,73 @@
+"""
+Client disconnect detection for long-running endpoints
+Races request work against the ASGI disconnect message and cancels the work when the client goes away
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class ClientDisconnected(Exception):
+    """Raised in place of a result when the client closed the connection first"""
+
+    def __init__(self, label: str):
+        super().__init__(f"client disconnected during {label}")
+        self.label = label
+
+
+async def wait_for_disconnect(request: Any):
+    """Return once the ASGI server reports http.disconnect (the request body must already be read)."""
+    while True:
+        message = await request.receive()
+        if message.get("type") == "http.disconnect":
+            return
+
+
+class DisconnectGuard:
+    """Runs endpoint work that is cancelled as soon as its client disconnects"""
+
+    def __init__(self):
+        self.started: Dict[str, int] = defaultdict(int)
+        self.completed: Dict[str, int] = defaultdict(int)
+        self.abandoned: Dict[str, int] = defaultdict(int)
+
+    async def run(self, request: Optional[Any], label: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Await `factory()`; raise ClientDisconnected (after cancelling it) if the client leaves first."""
+        if request is None:
+            return await factory()
+
+        self.started[label] += 1
+        work = asyncio.ensure_future(factory())
+        watcher = asyncio.ensure_future(wait_for_disconnect(request))
+        try:
+            await asyncio.wait({work, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            watcher.cancel()
+            if not work.done():
+                # Client gone (or this handler was cancelled): stop the provider calls behind it
+                work.cancel()
+                self.abandoned[label] += 1
+                print(f"🔌 Client disconnected - cancelled {label}")
+                await asyncio.gather(work, return_exceptions=True)
+
+        if work.cancelled():
+            raise ClientDisconnected(label)
+        self.completed[label] += 1
+        return work.result()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            label: {
+                "started": self.started[label],
+                "completed": self.completed[label],
+                "abandoned": self.abandoned[label],
+            }
+            for label in sorted(self.started)
+        }
+
+
+# Global guard shared by the generation endpoints
+disconnect_guard = DisconnectGuard()
@@ -14,6 +14,9 @@ from dataclasses import dataclass
 # import httpx  # Not needed for this implementation
 from groq import Groq
 import google.generativeai as genai
+from services.executors import provider_executor
+from services.model_cascade import enhanced_roadmap_cascade
+from services.multi_agent_service import MultiAgentFunnelService
 
 @dataclass
 class AgentResponse:
@@ -35,6 +38,7 @@ class EnhancedMultiAgentService:
         genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
         self.gemini_model = genai.GenerativeModel('gemini-2.0-flash')
         self.current_session_id = None
+        self.model_cascade = enhanced_roadmap_cascade
         
         # Specialization Intelligence Mapping
         self.specialization_mapping = {
@@ -340,7 +344,7 @@ Make every single detail actionable, specific, and directly applicable to breaki
             specialized_prompt = self.create_specialized_prompt(query, background, specialization_info, agent_name)
             
             if provider == "groq" and self.groq_client:
-                response = await self._execute_groq_agent(specialized_prompt, agent_name)
+                response = await self._execute_groq_cascade(specialized_prompt, agent_name, query, background)
             elif provider == "gemini":
                 response = await self._execute_gemini_agent(specialized_prompt, agent_name)
             else:
@@ -374,14 +378,30 @@ Make every single detail actionable, specific, and directly applicable to breaki
                 metadata={"error": str(e), "provider": provider}
             )
 
-    async def _execute_groq_agent(self, prompt: str, agent_name: str) -> str:
+    async def _execute_groq_cascade(self, prompt: str, agent_name: str, query: str, background: dict) -> str:
+        """Try the small Groq model first in cascade mode; escalate to the 70B model on low confidence"""
+        response, _ = await self.model_cascade.run(
+            "llama-3.3-70b-versatile",
+            lambda: self._execute_groq_agent(prompt, agent_name, self.model_cascade.small_model, 4000),
+            lambda: self._execute_groq_agent(prompt, agent_name),
+            lambda text: MultiAgentFunnelService._calculate_specialization_confidence(text, query, background or {})
+        )
+        return response
+
+    async def _execute_groq_agent(
+        self,
+        prompt: str,
+        agent_name: str,
+        model: str = "llama-3.3-70b-versatile",
+        max_tokens: int = 8000  # Increased for comprehensive roadmaps
+    ) -> str:
         """Execute Groq agent with specialized prompt"""
         try:
-            response = await asyncio.to_thread(
+            response = await provider_executor.run(
                 self.groq_client.chat.completions.create,
-                model="llama-3.3-70b-versatile",
+                model=model,
                 messages=[{"role": "user", "content": prompt}],
-                max_tokens=8000,  # Increased for comprehensive roadmaps
+                max_tokens=max_tokens,
                 temperature=0.7
             )
             return response.choices[0].message.content
@@ -398,7 +418,7 @@ Make every single detail actionable, specific, and directly applicable to breaki
                 "temperature": 0.7,
                 "top_p": 0.95,
             }
-            response = await asyncio.to_thread(
+            response = await provider_executor.run(
                 self.gemini_model.generate_content,
                 prompt,
                 generation_config=generation_config
@@ -2,38 +2,24 @@
 Enhanced Resource Discovery Service
 Provides real learning resources with direct links to actual content using Google/YouTube APIs
 """
-import json
 import os
 import random
-import requests
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Any, Sequence
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+from config.settings import settings
+from services.executors import provider_executor
+from services.json_stream import parse_json_values
+from services.resource_cache import resource_cache
+from services.resource_catalog import LearningResource, resource_catalog
+from services.resource_search import YouTubeSearchEngine
+from services.youtube_quota import youtube_quota
+
 # Load environment variables
 load_dotenv()
 
 
-@dataclass
-class LearningResource:
-    """Enhanced learning resource with rich metadata"""
-    title: str
-    url: str
-    description: str
-    provider: str
-    resource_type: str
-    duration: Optional[str] = None
-    rating: Optional[str] = None
-    price: Optional[str] = None
-    level: Optional[str] = None
-    thumbnail: Optional[str] = None
-    instructor: Optional[str] = None
-    students: Optional[str] = None
-    language: str = "English"
-    last_updated: Optional[str] = None
-
-
 class EnhancedResourceService:
     """Service for discovering real learning resources with direct links using Google/YouTube APIs"""
     
@@ -48,279 +34,26 @@ class EnhancedResourceService:
         else:
             self.model = None
             
-        self.real_resources_db = self._initialize_real_resources_database()
+        self.cache = resource_cache
+        self.youtube_quota = youtube_quota
+        self.youtube_search = YouTubeSearchEngine(
+            self.youtube_api_key,
+            concurrency=settings.RESOURCE_SEARCH_CONCURRENCY,
+            ledger=youtube_quota,
+        )
+        # Curated resources are read from the data file on first use, not built per instance
+        self.catalog = resource_catalog
     
-    def _initialize_real_resources_database(self) -> Dict[str, Dict[str, List[LearningResource]]]:
-        """Initialize comprehensive database of real learning resources"""
-        return {
-            # PROGRAMMING & DEVELOPMENT
-            "python": {
-                "youtube": [
-                    LearningResource(
-                        title="Python Full Course for free 🐍",
-                        url="https://www.youtube.com/watch?v=ix9cRaBkVe0",
-                        description="Complete Python tutorial for beginners. Learn Python basics, variables, functions, and more in this comprehensive course.",
-                        provider="YouTube",
-                        resource_type="youtube",
-                        duration="12 hours",
-                        rating="4.8/5",
-                        price="Free",
-                        level="Beginner",
-                        thumbnail="https://i.ytimg.com/vi/ix9cRaBkVe0/maxresdefault.jpg",
-                        instructor="Bro Code",
-                        students="2.1M views"
-                    ),
-                    LearningResource(
-                        title="Python Tutorial - Python Full Course for Beginners",
-                        url="https://www.youtube.com/watch?v=_uQrJ0TkZlc",
-                        description="Learn Python programming from scratch. This Python tutorial covers all the fundamentals of Python programming language.",
-                        provider="YouTube",
-                        resource_type="youtube",
-                        duration="6 hours",
-                        rating="4.9/5",
-                        price="Free",
-                        level="Beginner",
-                        thumbnail="https://i.ytimg.com/vi/_uQrJ0TkZlc/maxresdefault.jpg",
-                        instructor="Programming with Mosh",
-                        students="15M views"
-                    ),
-                    LearningResource(
-                        title="Intermediate Python Programming Course",
-                        url="https://www.youtube.com/watch?v=HGOBQPFzWKo",
-                        description="Take your Python skills to the next level with this intermediate Python course covering decorators, generators, and more.",
-                        provider="YouTube",
-                        resource_type="youtube",
-                        duration="6 hours",
-                        rating="4.7/5",
-                        price="Free",
-                        level="Intermediate",
-                        thumbnail="https://i.ytimg.com/vi/HGOBQPFzWKo/maxresdefault.jpg",
-                        instructor="freeCodeCamp",
-                        students="3.2M views"
-                    )
-                ],
-                "courses": [
-                    LearningResource(
-                        title="Python for Everybody Specialization",
-                        url="https://www.coursera.org/specializations/python",
-                        description="Learn to Program and Analyze Data with Python. Develop programs to gather, clean, analyze, and visualize data.",
-                        provider="Coursera",
-                        resource_type="courses",
-                        duration="8 months",
-                        rating="4.8/5",
-                        price="$49/month",
-                        level="Beginner",
-                        thumbnail="https://d3c33hcgiwev3.cloudfront.net/imageAssetProxy.v1/ShO4TdS5EeWy7ApJlLNhKQ_42b396ba8dc149b78ab54c75f59baf3e_python-for-everybody-thumbnail.png",
-                        instructor="Charles Severance",
-                        students="1.2M enrolled"
-                    ),
-                    LearningResource(
-                        title="Complete Python Bootcamp From Zero to Hero in Python 3",
-                        url="https://www.udemy.com/course/complete-python-bootcamp/",
-                        description="Learn Python like a Professional! Start from the basics and go all the way to creating your own applications and games!",
-                        provider="Udemy",
-                        resource_type="courses",
-                        duration="22 hours",
-                        rating="4.6/5",
-                        price="$19.99",
-                        level="Beginner to Advanced",
-                        thumbnail="https://img-b.udemycdn.com/course/240x135/567828_67d0.jpg",
-                        instructor="Jose Portilla",
-                        students="1.7M enrolled"
-                    ),
-                    LearningResource(
-                        title="Python Programming MasterTrack Certificate",
-                        url="https://www.coursera.org/mastertrack/python-programming-university-of-pennsylvania",
-                        description="Master Python programming with hands-on projects and expert instruction from University of Pennsylvania.",
-                        provider="Coursera",
-                        resource_type="courses",
-                        duration="4-6 months",
-                        rating="4.7/5",
-                        price="$39-79/month",
-                        level="Intermediate",
-                        thumbnail="https://d3c33hcgiwev3.cloudfront.net/imageAssetProxy.v1/penn-mastertrack-python.png",
-                        instructor="University of Pennsylvania",
-                        students="45K+ enrolled"
-                    )
-                ],
-                "books": [
-                    LearningResource(
-                        title="Automate the Boring Stuff with Python",
-                        url="https://www.amazon.com/Automate-Boring-Stuff-Python-Programming/dp/1593279922",
-                        description="Learn how to use Python to write programs that do in minutes what would take you hours to do by hand.",
-                        provider="Amazon",
-                        resource_type="books",
-                        rating="4.6/5",
-                        price="$23.99",
-                        level="Beginner",
-                        thumbnail="https://images-na.ssl-images-amazon.com/images/I/816CIXG3vOL.jpg",
-                        instructor="Al Sweigart",
-                        language="English"
-                    ),
-                    LearningResource(
-                        title="Python Crash Course",
-                        url="https://www.amazon.com/Python-Crash-Course-Hands-Project-Based/dp/1593276036",
-                        description="A fast-paced, thorough introduction to Python that will have you writing programs, solving problems, and making things that work in no time.",
-                        provider="Amazon", 
-                        resource_type="books",
-                        rating="4.5/5",
-                        price="$25.49",
-                        level="Beginner",
-                        thumbnail="https://images-na.ssl-images-amazon.com/images/I/81v4f_IhCOL.jpg",
-                        instructor="Eric Matthes",
-                        language="English"
-                    )
-                ],
-                "certifications": [
-                    LearningResource(
-                        title="PCAP – Certified Associate in Python Programming",
-                        url="https://pythoninstitute.org/pcap",
-                        description="Industry-recognized Python certification that validates fundamental programming skills and knowledge of Python language syntax.",
-                        provider="Python Institute",
-                        resource_type="certifications",
-                        duration="3-6 months prep",
-                        rating="4.5/5",
-                        price="$295",
-                        level="Associate",
-                        thumbnail="https://pythoninstitute.org/assets/63af904e3aa305.86478412.png",
-                        instructor="Python Institute"
-                    ),
-                    LearningResource(
-                        title="Microsoft Certified: Python Developer Associate",
-                        url="https://docs.microsoft.com/en-us/learn/certifications/azure-developer/",
-                        description="Demonstrate ability to design, build, test, and maintain cloud applications and services using Python on Microsoft Azure.",
-                        provider="Microsoft",
-                        resource_type="certifications", 
-                        duration="3-4 months",
-                        rating="4.4/5",
-                        price="$165",
-                        level="Associate",
-                        thumbnail="https://images.credly.com/images/be8fcaeb-c769-4858-b567-ffaaa73ce8cf/azure-developer-associate-600x600.png",
-                        instructor="Microsoft"
-                    )
-                ]
-            },
-            
-            # Add more comprehensive topics
-            "javascript": {
-                "youtube": [
-                    LearningResource(
-                        title="JavaScript Full Course for free 🌐",
-                        url="https://www.youtube.com/watch?v=8dWL3wF_OMw",
-                        description="Complete JavaScript tutorial for beginners. Learn JavaScript from scratch with hands-on examples and projects.",
-                        provider="YouTube",
-                        resource_type="youtube",
-                        duration="8 hours",
-                        rating="4.9/5",
-                        price="Free",
-                        level="Beginner",
-                        thumbnail="https://i.ytimg.com/vi/8dWL3wF_OMw/maxresdefault.jpg",
-                        instructor="Bro Code",
-                        students="1.8M views"
-                    ),
-                    LearningResource(
-                        title="JavaScript Tutorial for Beginners: Learn JavaScript in 1 Hour",
-                        url="https://www.youtube.com/watch?v=W6NZfCO5SIk",
-                        description="JavaScript tutorial for beginners. Learn the basics of JavaScript programming in just 1 hour.",
-                        provider="YouTube",
-                        resource_type="youtube",
-                        duration="1 hour",
-                        rating="4.8/5",
-                        price="Free",
-                        level="Beginner",
-                        thumbnail="https://i.ytimg.com/vi/W6NZfCO5SIk/maxresdefault.jpg",
-                        instructor="Programming with Mosh",
-                        students="8.2M views"
-                    )
-                ],
-                "courses": [
-                    LearningResource(
-                        title="The Complete JavaScript Course 2024: From Zero to Expert!",
-                        url="https://www.udemy.com/course/the-complete-javascript-course/",
-                        description="The modern JavaScript course for everyone! Master JavaScript with projects, challenges and theory. Many courses in one!",
-                        provider="Udemy",
-                        resource_type="courses",
-                        duration="69 hours",
-                        rating="4.7/5",
-                        price="$19.99",
-                        level="All Levels",
-                        thumbnail="https://img-b.udemycdn.com/course/240x135/851712_fc61_6.jpg",
-                        instructor="Jonas Schmedtmann",
-                        students="680K+ enrolled"
-                    )
-                ]
-            },
-            
-            "react": {
-                "youtube": [
-                    LearningResource(
-                        title="React Course - Beginner's Tutorial for React JavaScript Library [2022]",
-                        url="https://www.youtube.com/watch?v=bMknfKXIFA8",
-                        description="Learn React from scratch in this complete course. Build real projects and master React fundamentals.",
-                        provider="YouTube",
-                        resource_type="youtube",
-                        duration="11 hours",
-                        rating="4.9/5",
-                        price="Free",
-                        level="Beginner",
-                        thumbnail="https://i.ytimg.com/vi/bMknfKXIFA8/maxresdefault.jpg",
-                        instructor="freeCodeCamp",
-                        students="4.2M views"
-                    ),
-                    LearningResource(
-                        title="Full React Tutorial #1 - Introduction",
-                        url="https://www.youtube.com/watch?v=j942wKiXFu8&list=PL4cUxeGkcC9gZD-Tvwfod2gaISzfRiP9d",
-                        description="Complete React tutorial series covering components, hooks, routing, and state management.",
-                        provider="YouTube",
-                        resource_type="youtube",
-                        duration="5 hours series",
-                        rating="4.8/5", 
-                        price="Free",
-                        level="Beginner",
-                        thumbnail="https://i.ytimg.com/vi/j942wKiXFu8/maxresdefault.jpg",
-                        instructor="Net Ninja",
-                        students="2.1M views"
-                    )
-                ]
-            },
-            
-            "machine learning": {
-                "youtube": [
-                    LearningResource(
-                        title="Machine Learning Course for Beginners",
-                        url="https://www.youtube.com/watch?v=NWONeJKn6kc",
-                        description="Learn Machine Learning in this complete course for beginners. You will learn the fundamentals and build ML projects.",
-                        provider="YouTube",
-                        resource_type="youtube", 
-                        duration="20 hours",
-                        rating="4.9/5",
-                        price="Free",
-                        level="Beginner",
-                        thumbnail="https://i.ytimg.com/vi/NWONeJKn6kc/maxresdefault.jpg",
-                        instructor="freeCodeCamp",
-                        students="2.8M views"
-                    )
-                ],
-                "courses": [
-                    LearningResource(
-                        title="Machine Learning Specialization",
-                        url="https://www.coursera.org/specializations/machine-learning-introduction",
-                        description="Build ML models with NumPy & scikit-learn, build & train supervised models for prediction & binary classification tasks.",
-                        provider="Coursera",
-                        resource_type="courses",
-                        duration="3 months",
-                        rating="4.9/5",
-                        price="$49/month",
-                        level="Beginner",
-                        thumbnail="https://d3c33hcgiwev3.cloudfront.net/imageAssetProxy.v1/machine-learning-specialization.png",
-                        instructor="Andrew Ng",
-                        students="2.1M enrolled"
-                    )
-                ]
-            }
-        }
+    async def get_enhanced_resources(self, topic: str, resource_type: str, limit: int = 15, level: str = "intermediate", use_cache: bool = True) -> List[Dict[str, Any]]:
+        """Get real learning resources with enhanced metadata and direct links, served from the resource cache when possible"""
+        if use_cache and self.cache is not None:
+            return await self.cache.get_or_fetch(
+                topic, resource_type, level, limit,
+                lambda: self._fetch_enhanced_resources(topic, resource_type, limit, level),
+            )
+        return await self._fetch_enhanced_resources(topic, resource_type, limit, level)
     
-    def get_enhanced_resources(self, topic: str, resource_type: str, limit: int = 15, level: str = "intermediate") -> List[Dict[str, Any]]:
+    async def _fetch_enhanced_resources(self, topic: str, resource_type: str, limit: int, level: str) -> List[Dict[str, Any]]:
         """Get real learning resources with enhanced metadata and direct links using APIs"""
         topic_clean = topic.lower().strip()
         enhanced_resources = []
@@ -356,37 +89,37 @@ class EnhancedResourceService:
         
         if resource_type == "youtube":
             print(f"🎥 FORCING YouTube API search for: {topic}")
-            api_resources = self._search_youtube_videos(topic, remaining_limit, level)
-            if api_resources and len(api_resources) > 0:
+            # Alternate search terms are part of the same concurrent fan-out instead of a serial retry
+            api_resources = await self._search_youtube_videos(
+                topic, remaining_limit, level,
+                extra_queries=[f"{topic} tutorial", f"learn {topic}", f"{topic} course"],
+            )
+            if api_resources:
                 print(f"✅ SUCCESS: Found {len(api_resources)} real YouTube videos from API")
                 enhanced_resources.extend(api_resources)
             else:
-                print(f"⚠️ YouTube API returned no results, trying secondary search")
-                # Try different search terms
-                for alt_topic in [f"{topic} tutorial", f"learn {topic}", f"{topic} course"]:
-                    alt_resources = self._search_youtube_videos(alt_topic, remaining_limit, level)
-                    if alt_resources and len(alt_resources) > 0:
-                        print(f"✅ SUCCESS: Found {len(alt_resources)} videos with alternate search: {alt_topic}")
-                        enhanced_resources.extend(alt_resources)
-                        break
+                print(f"⚠️ YouTube API returned no results")
             
         elif resource_type == "courses":
             print(f"🎓 Fetching course recommendations for: {topic}")
-            api_resources = self._get_course_recommendations(topic, remaining_limit, level)
+            # Blocking Gemini SDK call
+            api_resources = await provider_executor.run(self._get_course_recommendations, topic, remaining_limit, level)
             if api_resources:
                 enhanced_resources.extend(api_resources)
                 print(f"✅ Found {len(api_resources)} course recommendations")
                 
         elif resource_type == "books":
             print(f"📚 Fetching book recommendations for: {topic}")
-            api_resources = self._get_book_recommendations(topic, remaining_limit, level)
+            # Blocking Gemini SDK call
+            api_resources = await provider_executor.run(self._get_book_recommendations, topic, remaining_limit, level)
             if api_resources:
                 enhanced_resources.extend(api_resources)
                 print(f"✅ Found {len(api_resources)} book recommendations")
                 
         elif resource_type == "certifications":
             print(f"🏆 Fetching certification recommendations for: {topic}")
-            api_resources = self._get_certification_recommendations(topic, remaining_limit, level)
+            # Blocking Gemini SDK call
+            api_resources = await provider_executor.run(self._get_certification_recommendations, topic, remaining_limit, level)
             if api_resources:
                 enhanced_resources.extend(api_resources)
                 print(f"✅ Found {len(api_resources)} certification recommendations")
@@ -401,7 +134,7 @@ class EnhancedResourceService:
         print(f"🎯 Final resource count: {len(enhanced_resources)} ({len([r for r in enhanced_resources if r.get('verified', False)])} verified)")
         return enhanced_resources[:limit]
     
-    def _search_youtube_videos(self, topic: str, limit: int, level: str) -> List[Dict[str, Any]]:
+    async def _search_youtube_videos(self, topic: str, limit: int, level: str, extra_queries: Sequence[str] = ()) -> List[Dict[str, Any]]:
         """Search YouTube using API for real video results with direct links"""
         try:
             if not self.youtube_api_key:
@@ -411,136 +144,94 @@ class EnhancedResourceService:
             print(f"🔑 Using YouTube API key: {self.youtube_api_key[:15]}...")
             print(f"🎯 Searching YouTube for SPECIFIC topic: '{topic}' at level: {level}")
             
-            # Create highly specific search queries for the exact topic
-            # Ensure each search is unique and topic-specific
-            search_queries = [
-                f"{topic} tutorial {level}",
-                f"{topic} course complete",
-                f"learn {topic} step by step",
-                f"{topic} {level} guide" if level != "beginner" else f"{topic} beginner tutorial",
-                f"{topic} masterclass training"
-            ]
-            
-            # Make queries more specific to avoid generic results
-            if any(word in topic.lower() for word in ['data science', 'machine learning', 'ai']):
-                search_queries = [
-                    f"{topic} python tutorial {level}",
-                    f"{topic} complete course 2024",
-                    f"{topic} projects tutorial"
-                ]
-            elif any(word in topic.lower() for word in ['web development', 'frontend', 'backend']):
-                search_queries = [
-                    f"{topic} javascript tutorial {level}",
-                    f"{topic} full stack course",
-                    f"{topic} project build"
-                ]
-            elif any(word in topic.lower() for word in ['mobile', 'android', 'ios']):
-                search_queries = [
-                    f"{topic} app development {level}",
-                    f"{topic} complete tutorial",
-                    f"{topic} project course"
-                ]
-            
-            print(f"📝 Topic-specific search queries: {search_queries}")
-            
-            all_videos = []
-            seen_video_ids = set()  # Prevent duplicates
-            
-            for query in search_queries[:2]:  # Use top 2 queries
-                url = "https://www.googleapis.com/youtube/v3/search"
-                params = {
-                    'part': 'snippet',
-                    'q': query,
-                    'type': 'video',
-                    'videoDuration': 'long',  # Prefer longer educational content
-                    'maxResults': limit // 2 + 2,
-                    'key': self.youtube_api_key,
-                    'order': 'relevance',
-                    'publishedAfter': '2022-01-01T00:00:00Z'  # Recent content
-                }
-                
-                print(f"🌐 Calling YouTube API with query: '{query}'")
-                response = requests.get(url, params=params, timeout=10)
-                print(f"📡 YouTube API response status: {response.status_code}")
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    print(f"📺 YouTube API returned {len(data.get('items', []))} videos")
-                    
-                    for item in data.get('items', []):
-                        video_id = item['id']['videoId']
-                        snippet = item['snippet']
-                        
-                        # Skip duplicates
-                        if video_id in seen_video_ids:
-                            continue
-                        seen_video_ids.add(video_id)
-                        
-                        # Get additional video details
-                        video_details = self._get_video_details(video_id)
-                        
-                        video_resource = {
-                            "title": snippet['title'],
-                            "url": f"https://www.youtube.com/watch?v={video_id}",
-                            "description": snippet['description'][:300] + "..." if len(snippet['description']) > 300 else snippet['description'],
-                            "provider": "YouTube",
-                            "type": "youtube",
-                            "duration": video_details.get('duration', 'N/A'),
-                            "rating": "4.5/5",  # Default rating
-                            "price": "Free",
-                            "level": level.title(),
-                            "thumbnail": snippet['thumbnails'].get('high', {}).get('url', snippet['thumbnails']['default']['url']),
-                            "instructor": snippet['channelTitle'],
-                            "students": video_details.get('viewCount', 'N/A') + " views",
-                            "language": "English",
-                            "last_updated": snippet['publishedAt'][:10],
-                            "direct_link": True,
-                            "verified": True
-                        }
-                        all_videos.append(video_resource)
-                        
-                        if len(all_videos) >= limit:
-                            break
-                
-                if len(all_videos) >= limit:
-                    break
+            # Each search.list costs 100 quota units; spend less as the daily budget runs low
+            plan = self.youtube_quota.plan()
+            if not plan.allows_api:
+                print(f"💸 YouTube quota nearly exhausted - skipping API search for '{topic}' (cache only)")
+                return []
             
-            return all_videos[:limit]
+            # Top 2 topic-specific queries first, then the broader alternates
+            search_queries = self._youtube_search_queries(topic, level)[:2] + list(extra_queries)
+            if plan.max_queries is not None:
+                search_queries = search_queries[:plan.max_queries]
+            print(f"📝 Topic-specific search queries ({plan.mode} quota plan): {search_queries}")
+            
+            # Concurrent fan-out; stops once `limit` unique videos are in relevance order
+            search_hits = await self.youtube_search.search(
+                search_queries,
+                limit,
+                per_query=limit if plan.full_page else limit // 2 + 2,
+                concurrency=plan.concurrency,
+            )
+            
+            # One videos.list call per 50 hits instead of one per video
+            video_details = await self.youtube_search.video_details([video_id for video_id, _ in search_hits])
+            return [
+                self._build_video_resource(video_id, snippet, video_details.get(video_id, {}), level)
+                for video_id, snippet in search_hits
+            ]
             
         except Exception as e:
             print(f"YouTube API error: {e}")
             return []
     
-    def _get_video_details(self, video_id: str) -> Dict[str, str]:
-        """Get additional video details like duration and view count"""
-        try:
-            url = "https://www.googleapis.com/youtube/v3/videos"
-            params = {
-                'part': 'contentDetails,statistics',
-                'id': video_id,
-                'key': self.youtube_api_key
-            }
-            
-            response = requests.get(url, params=params, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('items'):
-                    item = data['items'][0]
-                    duration = item.get('contentDetails', {}).get('duration', 'PT0M')
-                    view_count = item.get('statistics', {}).get('viewCount', '0')
-                    
-                    # Convert ISO 8601 duration to readable format
-                    duration_readable = self._parse_youtube_duration(duration)
-                    view_count_readable = self._format_view_count(view_count)
-                    
-                    return {
-                        'duration': duration_readable,
-                        'viewCount': view_count_readable
-                    }
-        except Exception as e:
-            print(f"Video details error: {e}")
+    def _youtube_search_queries(self, topic: str, level: str) -> List[str]:
+        """Topic-specific queries, most relevant first"""
+        # Create highly specific search queries for the exact topic
+        # Ensure each search is unique and topic-specific
+        search_queries = [
+            f"{topic} tutorial {level}",
+            f"{topic} course complete",
+            f"learn {topic} step by step",
+            f"{topic} {level} guide" if level != "beginner" else f"{topic} beginner tutorial",
+            f"{topic} masterclass training"
+        ]
         
-        return {'duration': 'N/A', 'viewCount': 'N/A'}
+        # Make queries more specific to avoid generic results
+        if any(word in topic.lower() for word in ['data science', 'machine learning', 'ai']):
+            search_queries = [
+                f"{topic} python tutorial {level}",
+                f"{topic} complete course 2024",
+                f"{topic} projects tutorial"
+            ]
+        elif any(word in topic.lower() for word in ['web development', 'frontend', 'backend']):
+            search_queries = [
+                f"{topic} javascript tutorial {level}",
+                f"{topic} full stack course",
+                f"{topic} project build"
+            ]
+        elif any(word in topic.lower() for word in ['mobile', 'android', 'ios']):
+            search_queries = [
+                f"{topic} app development {level}",
+                f"{topic} complete tutorial",
+                f"{topic} project course"
+            ]
+        
+        return search_queries
+    
+    def _build_video_resource(self, video_id: str, snippet: Dict[str, Any], video_details: Dict[str, str], level: str) -> Dict[str, Any]:
+        """Format a search hit and its raw details as a resource"""
+        duration = video_details.get('duration')
+        view_count = video_details.get('viewCount')
+        return {
+            "title": snippet['title'],
+            "url": f"https://www.youtube.com/watch?v={video_id}",
+            "description": snippet['description'][:300] + "..." if len(snippet['description']) > 300 else snippet['description'],
+            "provider": "YouTube",
+            "type": "youtube",
+            # Convert ISO 8601 duration to readable format
+            "duration": self._parse_youtube_duration(duration) if duration else 'N/A',
+            "rating": "4.5/5",  # Default rating
+            "price": "Free",
+            "level": level.title(),
+            "thumbnail": snippet['thumbnails'].get('high', {}).get('url', snippet['thumbnails']['default']['url']),
+            "instructor": snippet['channelTitle'],
+            "students": (self._format_view_count(view_count) if view_count else 'N/A') + " views",
+            "language": "English",
+            "last_updated": snippet['publishedAt'][:10],
+            "direct_link": True,
+            "verified": True
+        }
     
     def _parse_youtube_duration(self, duration: str) -> str:
         """Parse ISO 8601 duration to readable format"""
@@ -842,30 +533,14 @@ class EnhancedResourceService:
         try:
             print(f"📄 Parsing Gemini response for {resource_type} (length: {len(response_text)})")
             
-            # Multiple strategies to extract JSON from response
-            import re
+            # Tolerant parse: prose, fences, trailing commas and truncated arrays are all recovered,
+            # and separate bare objects are collected one after another
+            data = []
+            for value in parse_json_values(response_text):
+                items = value if isinstance(value, list) else [value]
+                data.extend(item for item in items if isinstance(item, dict))
             
-            # Strategy 1: Look for complete JSON array
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            
-            # Strategy 2: If no array found, look for individual JSON objects
-            if not json_match:
-                json_objects = re.findall(r'\{[^{}]*\}', response_text, re.DOTALL)
-                if json_objects:
-                    # Combine individual objects into an array
-                    json_str = '[' + ','.join(json_objects) + ']'
-                    json_match = type('Match', (), {'group': lambda: json_str})()
-            
-            if json_match:
-                json_str = json_match.group()
-                print(f"📊 Extracted JSON string (length: {len(json_str)})")
-                
-                # Clean up common JSON formatting issues
-                json_str = json_str.replace('\n', ' ').replace('\r', ' ')
-                json_str = re.sub(r',\s*}', '}', json_str)  # Remove trailing commas
-                json_str = re.sub(r',\s*]', ']', json_str)  # Remove trailing commas before ]
-                
-                data = json.loads(json_str)
+            if data:
                 print(f"🎯 Successfully parsed {len(data)} items from Gemini response")
                 
                 formatted_resources = []
@@ -916,10 +591,7 @@ class EnhancedResourceService:
         for key, related_topics in topic_mappings.items():
             if key in topic or any(t in topic for t in related_topics):
                 for related_topic in related_topics:
-                    if related_topic in self.real_resources_db:
-                        related_resources.extend(
-                            self.real_resources_db[related_topic].get(resource_type, [])
-                        )
+                    related_resources.extend(self.catalog.lookup(related_topic, resource_type))
         
         return related_resources[:5]  # Return top 5 related
     
@@ -0,0 +1,148 @@
+"""
+Named thread pools for blocking work
+Provider SDK calls, file I/O and CPU-bound work each get their own bounded pool with queue-wait, saturation and duration metrics
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, TypeVar
+
+from config.settings import settings
+
+T = TypeVar("T")
+
+
+class InstrumentedExecutor:
+    """
+    A bounded ThreadPoolExecutor that measures how long work waits for a thread,
+    how long it runs, and how saturated the pool is.
+    """
+
+    def __init__(self, name: str, max_workers: int, samples: int = 500):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+
+        self.active = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.detached = 0
+        self.queue_waits: Deque[float] = deque(maxlen=samples)
+        self.durations: Deque[float] = deque(maxlen=samples)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run `fn(*args, **kwargs)` on this pool from async code (like asyncio.to_thread)."""
+        loop = asyncio.get_running_loop()
+        # Carry context variables into the worker thread, as asyncio.to_thread does
+        call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        state = {"started": False, "abandoned": False}
+        self._enqueue()
+        try:
+            return await loop.run_in_executor(self._pool, self._instrumented, call, time.monotonic(), state)
+        except asyncio.CancelledError:
+            with self._lock:
+                if not state["started"]:
+                    # Never reached a worker thread
+                    state["abandoned"] = True
+                    self.queued -= 1
+                    self.cancelled += 1
+                else:
+                    # Already running: the thread finishes but nobody waits for the result
+                    self.detached += 1
+            raise
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """Fire-and-forget submission from sync code; returns the concurrent Future."""
+        self._enqueue()
+        state = {"started": False, "abandoned": False}
+        return self._pool.submit(self._instrumented, functools.partial(fn, *args, **kwargs), time.monotonic(), state)
+
+    def _enqueue(self):
+        with self._lock:
+            self.submitted += 1
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+
+    def _instrumented(self, call: Callable[[], T], submitted_at: float, state: Dict[str, bool]) -> T:
+        started = time.monotonic()
+        with self._lock:
+            if not state["abandoned"]:
+                self.queued -= 1
+            state["started"] = True
+            self.active += 1
+            self.queue_waits.append(started - submitted_at)
+        failed = False
+        try:
+            return call()
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.durations.append(time.monotonic() - started)
+                if failed:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+
+    @property
+    def saturation(self) -> float:
+        """Busy plus waiting work relative to pool size; above 1.0 means callers are queueing."""
+        return (self.active + self.queued) / self.max_workers
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self.queue_waits)
+            durations = sorted(self.durations)
+            return {
+                "max_workers": self.max_workers,
+                "active": self.active,
+                "queued": self.queued,
+                "peak_queued": self.peak_queued,
+                "saturation": round(self.saturation, 2),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "detached": self.detached,
+                "queue_wait_ms": _summarize(waits),
+                "duration_ms": _summarize(durations),
+            }
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def _summarize(ordered) -> Dict[str, Any]:
+    if not ordered:
+        return {"avg": None, "p95": None, "max": None}
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "avg": round(sum(ordered) / len(ordered) * 1000, 1),
+        "p95": round(p95 * 1000, 1),
+        "max": round(ordered[-1] * 1000, 1),
+    }
+
+
+# Global pools: provider SDK calls must never starve password hashing or log writes
+provider_executor = InstrumentedExecutor("provider-sdk", settings.PROVIDER_EXECUTOR_WORKERS)
+io_executor = InstrumentedExecutor("file-io", settings.IO_EXECUTOR_WORKERS)
+cpu_executor = InstrumentedExecutor("cpu", settings.CPU_EXECUTOR_WORKERS or (os.cpu_count() or 2))
+
+EXECUTORS = (provider_executor, io_executor, cpu_executor)
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    return {executor.name: executor.stats() for executor in EXECUTORS}
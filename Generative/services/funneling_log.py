@@ -0,0 +1,182 @@
+"""
+Append-only event log for multi-agent funneling sessions
+Persists each funneling event as a single JSON line instead of rewriting the whole history
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class FunnelingEventLog:
+    """
+    Buffered JSONL writer for funneling events.
+
+    Events are queued in memory and appended to disk in batches, so logging an
+    event costs O(1) regardless of how much history already exists. On load a
+    torn trailing line (left behind by a crash mid-write) is truncated away, and
+    the file is periodically compacted down to the most recent events. With an
+    `executor`, batch flushes (and the compaction they may trigger) run on it
+    instead of in the caller, which is usually the event loop.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        legacy_path: Optional[Path] = None,
+        flush_every: int = 20,
+        flush_interval_seconds: float = 2.0,
+        retain_events: int = 50000,
+        compact_every: int = 5000,
+        executor: Optional[Any] = None,
+    ):
+        self.path = Path(path)
+        self.legacy_path = Path(legacy_path) if legacy_path else None
+        self.flush_every = max(1, flush_every)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.retain_events = max(1, retain_events)
+        self.compact_every = max(1, compact_every)
+        self.executor = executor
+
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._lines_on_disk = 0
+        self._flush_scheduled = False
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Read every intact event from disk, migrating the legacy JSON file if needed."""
+        if not self.path.exists():
+            return self._migrate_legacy()
+
+        events: List[Dict[str, Any]] = []
+        good_offset = 0
+        torn_tail = False
+        skipped = 0
+
+        with open(self.path, "rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    # Only the final line can be partial in an append-only file
+                    torn_tail = True
+                    break
+                good_offset += len(raw)
+                line = raw.strip()
+                if not line:
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    skipped += 1
+
+        if torn_tail:
+            with open(self.path, "r+b") as f:
+                f.truncate(good_offset)
+            print(f"⚠️ Recovered funneling log: dropped partial trailing event in {self.path}")
+        if skipped:
+            print(f"⚠️ Skipped {skipped} unreadable funneling log lines in {self.path}")
+
+        self._lines_on_disk = len(events)
+        return events
+
+    def append(self, event: Dict[str, Any]):
+        """Queue an event and flush once the batch size or interval is reached."""
+        line = json.dumps(event, default=str)
+        with self._lock:
+            self._buffer.append(line)
+            due = (
+                len(self._buffer) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval_seconds
+            )
+            if due and self.executor is not None:
+                # One background flush at a time picks up everything buffered so far
+                if self._flush_scheduled:
+                    return
+                self._flush_scheduled = True
+        if not due:
+            return
+        if self.executor is None:
+            self.flush()
+            return
+        try:
+            self.executor.submit(self._background_flush)
+        except RuntimeError as e:
+            # Pool shut down (interpreter exit): write inline instead
+            print(f"Warning: funneling log executor unavailable, flushing inline: {e}")
+            self._background_flush()
+
+    def _background_flush(self):
+        with self._lock:
+            self._flush_scheduled = False
+        self.flush()
+
+    def flush(self):
+        """Write all buffered events to disk, compacting when the file has grown too long."""
+        with self._lock:
+            if not self._buffer:
+                self._last_flush = time.monotonic()
+                return
+            pending = self._buffer
+            self._buffer = []
+            try:
+                with open(self.path, "ab") as f:
+                    f.write(("\n".join(pending) + "\n").encode("utf-8"))
+                self._lines_on_disk += len(pending)
+            except Exception as e:
+                print(f"Warning: Could not append funneling logs to file: {e}")
+                self._buffer = pending + self._buffer
+                return
+            finally:
+                self._last_flush = time.monotonic()
+
+            if self._lines_on_disk >= self.retain_events + self.compact_every:
+                self._compact_locked()
+
+    def compact(self):
+        """Rewrite the log keeping only the most recent ``retain_events`` events."""
+        self.flush()
+        with self._lock:
+            self._compact_locked()
+
+    def _compact_locked(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "rb") as f:
+                lines = [line for line in f if line.endswith(b"\n") and line.strip()]
+            kept = lines[-self.retain_events:]
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "wb") as f:
+                f.writelines(kept)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._lines_on_disk = len(kept)
+            print(f"🧹 Compacted funneling log to {len(kept)} events")
+        except Exception as e:
+            print(f"Warning: Could not compact funneling log: {e}")
+
+    def _migrate_legacy(self) -> List[Dict[str, Any]]:
+        """One-time import of the old whole-file JSON array into the JSONL log."""
+        if not self.legacy_path or not self.legacy_path.exists():
+            return []
+        try:
+            with open(self.legacy_path, "r") as f:
+                events = json.load(f)
+            if not isinstance(events, list):
+                return []
+            events = events[-self.retain_events:]
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "w") as f:
+                for event in events:
+                    f.write(json.dumps(event, default=str) + "\n")
+            os.replace(tmp_path, self.path)
+            self._lines_on_disk = len(events)
+            print(f"📦 Migrated {len(events)} funneling events from {self.legacy_path} to {self.path}")
+            return events
+        except Exception as e:
+            print(f"Warning: Could not migrate legacy funneling logs: {e}")
+            return []
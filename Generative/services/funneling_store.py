@@ -0,0 +1,142 @@
+"""
+Session-indexed store for multi-agent funneling events
+Keeps events grouped by session with precomputed summaries so reports never scan the full log
+"""
+
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class FunnelingEventStore:
+    """
+    In-memory index over funneling events.
+
+    - ``session_id -> [events]`` in arrival order
+    - a time-ordered index of ``(started_at, session_id)`` for recency listings
+    - a per-session summary updated incrementally as each event arrives
+    """
+
+    def __init__(self):
+        self._events: Dict[str, List[Dict[str, Any]]] = {}
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        self._by_start: List[Tuple[float, str]] = []
+        self._event_count = 0
+
+    def add(self, event: Dict[str, Any]):
+        """Index a single event; O(1) for events arriving in time order."""
+        session_id = event.get("session_id")
+        if not session_id:
+            return
+
+        timestamp = event.get("timestamp") or 0
+        summary = self._summaries.get(session_id)
+        if summary is None:
+            summary = self._new_summary(session_id, timestamp)
+            self._summaries[session_id] = summary
+            self._events[session_id] = []
+            self._insert_start(timestamp, session_id)
+        elif timestamp and timestamp < summary["started_at"]:
+            self._remove_start(summary["started_at"], session_id)
+            summary["started_at"] = timestamp
+            self._insert_start(timestamp, session_id)
+
+        self._events[session_id].append(event)
+        self._event_count += 1
+        self._update_summary(summary, event, timestamp)
+
+    def rebuild(self, events: Iterable[Dict[str, Any]]):
+        """Replace the index with the given events."""
+        self._events.clear()
+        self._summaries.clear()
+        self._by_start = []
+        self._event_count = 0
+        for event in events:
+            self.add(event)
+
+    def forget_sessions(self, session_ids: Iterable[str]):
+        """Drop sessions whose events have aged out of the retained log."""
+        doomed = {sid for sid in session_ids if sid in self._summaries}
+        if not doomed:
+            return
+        for session_id in doomed:
+            self._event_count -= len(self._events.pop(session_id, []))
+            self._summaries.pop(session_id, None)
+        self._by_start = [entry for entry in self._by_start if entry[1] not in doomed]
+
+    def session_events(self, session_id: str) -> List[Dict[str, Any]]:
+        """All events for a session in arrival order."""
+        return self._events.get(session_id, [])
+
+    def summary(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Precomputed summary for a session, or None if unknown."""
+        return self._summaries.get(session_id)
+
+    def recent_sessions(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Summaries of the most recently started sessions, newest first."""
+        if limit <= 0:
+            return []
+        return [self._summaries[session_id] for _, session_id in reversed(self._by_start[-limit:])]
+
+    @property
+    def session_count(self) -> int:
+        return len(self._summaries)
+
+    @property
+    def event_count(self) -> int:
+        return self._event_count
+
+    def _insert_start(self, timestamp: float, session_id: str):
+        entry = (timestamp, session_id)
+        if not self._by_start or self._by_start[-1] <= entry:
+            self._by_start.append(entry)
+        else:
+            insort(self._by_start, entry)
+
+    def _remove_start(self, timestamp: float, session_id: str):
+        index = bisect_left(self._by_start, (timestamp, session_id))
+        if index < len(self._by_start) and self._by_start[index] == (timestamp, session_id):
+            del self._by_start[index]
+
+    @staticmethod
+    def _new_summary(session_id: str, timestamp: float) -> Dict[str, Any]:
+        return {
+            "session_id": session_id,
+            "started_at": timestamp,
+            "last_event_at": timestamp,
+            "event_count": 0,
+            "user_query": "",
+            "user_background": {},
+            "status": "in_progress",
+            "session_start": {},
+            "agent_starts": [],
+            "agent_responses": [],
+            "funneling": {},
+            "completion": {},
+            "cache_hit": {},
+            "quorum": {},
+        }
+
+    @staticmethod
+    def _update_summary(summary: Dict[str, Any], event: Dict[str, Any], timestamp: float):
+        summary["event_count"] += 1
+        if timestamp and timestamp > summary["last_event_at"]:
+            summary["last_event_at"] = timestamp
+
+        event_type = event.get("event_type")
+        if "user_query" in event and not summary["session_start"]:
+            summary["session_start"] = event
+            summary["user_query"] = event.get("user_query", "")
+            summary["user_background"] = event.get("user_background", {})
+        elif event_type == "AGENT_START":
+            summary["agent_starts"].append(event)
+        elif event_type == "AGENT_RESPONSE":
+            summary["agent_responses"].append(event)
+        elif event_type == "FUNNELING_PROCESS" and not summary["funneling"]:
+            summary["funneling"] = event
+        elif event_type == "CACHE_HIT" and not summary["cache_hit"]:
+            summary["cache_hit"] = event
+        elif event_type == "QUORUM" and not summary["quorum"]:
+            summary["quorum"] = event
+        elif event_type == "SESSION_COMPLETE" and not summary["completion"]:
+            summary["completion"] = event
+            summary["status"] = "completed"
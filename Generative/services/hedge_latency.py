@@ -0,0 +1,96 @@
+"""
+Latency tracking for hedged roadmap calls
+Per-(provider, model) completion times, kept apart from the circuit breakers, with cancelled calls recorded as
+censored samples so hedging does not bias the percentile it is driven by
+"""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+
+class LatencySamples:
+    """
+    Rolling window of (seconds, completed) samples. A cancelled call only tells us
+    its latency was *at least* the elapsed time; percentiles use the Kaplan-Meier
+    estimator so those censored samples pull the estimate up instead of being
+    dropped (which would make the primary look faster every time it loses a race).
+    """
+
+    def __init__(self, max_samples: int = 200):
+        self.samples: Deque[Tuple[float, bool]] = deque(maxlen=max_samples)
+        self.completed = 0
+        self.censored = 0
+
+    def record(self, seconds: float, completed: bool = True):
+        self.samples.append((max(0.0, seconds), completed))
+        if completed:
+            self.completed += 1
+        else:
+            self.censored += 1
+
+    def percentile(self, q: float, min_samples: int = 5) -> Optional[float]:
+        """Latency at quantile `q` (0-1), or None until enough samples exist."""
+        if len(self.samples) < min_samples:
+            return None
+        ordered = sorted(self.samples)
+        at_risk = len(ordered)
+        survival = 1.0
+        index = 0
+        while index < len(ordered):
+            seconds = ordered[index][0]
+            finished = ties = 0
+            while index < len(ordered) and ordered[index][0] == seconds:
+                finished += ordered[index][1]
+                ties += 1
+                index += 1
+            if finished:
+                survival *= 1.0 - finished / at_risk
+                if 1.0 - survival >= q:
+                    return seconds
+            at_risk -= ties
+        # Too many calls were cut short to see the quantile: it is at least the longest wait observed
+        return ordered[-1][0]
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50 = self.percentile(0.5)
+        p90 = self.percentile(0.9)
+        return {
+            "samples": len(self.samples),
+            "completed": self.completed,
+            "censored": self.censored,
+            "p50_seconds": round(p50, 3) if p50 is not None else None,
+            "p90_seconds": round(p90, 3) if p90 is not None else None,
+        }
+
+
+class HedgeLatencyTracker:
+    """Latency samples per provider/model key, created on first use"""
+
+    def __init__(self, max_samples: int = 200):
+        self.max_samples = max_samples
+        self._samples: Dict[str, LatencySamples] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> LatencySamples:
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = LatencySamples(self.max_samples)
+                self._samples[key] = samples
+            return samples
+
+    def record(self, key: str, seconds: float, completed: bool = True):
+        self.get(key).record(seconds, completed)
+
+    def percentile(self, key: str, q: float) -> Optional[float]:
+        return self.get(key).percentile(q)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            items = sorted(self._samples.items())
+        return {key: samples.snapshot() for key, samples in items}
+
+
+# Global tracker instance
+hedge_latency = HedgeLatencyTracker()
@@ -0,0 +1,51 @@
+"""
+Shared pooled HTTP client for outbound API calls
+Keeps one long-lived httpx.AsyncClient per event loop so TLS sessions and keep-alive connections are reused
+"""
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+# HTTP/2 needs the optional `h2` package (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+POOL_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=60.0,
+)
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it lazily for the running event loop."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    # Pooled connections are bound to the loop that opened them
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=POOL_LIMITS,
+            timeout=DEFAULT_TIMEOUT,
+        )
+        _client_loop = loop
+        print(f"🌐 Shared HTTP client created (HTTP/2: {'✅' if HTTP2_AVAILABLE else '❌'})")
+    return _client
+
+
+async def close_http_client():
+    """Close the shared client; called on application shutdown."""
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
@@ -0,0 +1,324 @@
+"""
+Tolerant incremental JSON parsing for LLM output
+A single-pass state machine that accepts text in chunks, skips surrounding prose and code fences, recovers from
+trailing commas, unquoted keys, single quotes and truncation, and reports array elements as soon as they close
+"""
+
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, List, Optional, Tuple
+
+Path = Tuple[Any, ...]
+
+_WHITESPACE = " \t\r\n"
+_BARE_TERMINATORS = _WHITESPACE + ",:}]"
+_INLINE_SPACE = " \t"
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", '"': '"', "'": "'", "\\": "\\", "/": "/"}
+_LITERALS = {"true": True, "false": False, "null": None, "none": None, "undefined": None}
+_FENCE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+
+# Container expectations
+_KEY, _COLON, _VALUE, _COMMA = "key", "colon", "value", "comma"
+
+
+class _Frame:
+    __slots__ = ("container", "path", "key", "expect")
+
+    def __init__(self, container: Any, path: Path):
+        self.container = container
+        self.path = path
+        self.key: Optional[str] = None
+        self.expect = _KEY if isinstance(container, dict) else _VALUE
+
+
+class StreamingJSONParser:
+    """
+    Feed text with `feed()`; each call returns the (path, value) of every array
+    element that closed in that chunk, e.g. (("phases", 0), {...}). `partial()`
+    exposes the value built so far and `close()` finishes it, closing anything
+    left open by a truncated response. Every character is examined once.
+    """
+
+    def __init__(self, roots: str = "{["):
+        self.roots = roots
+        self.root: Any = None
+        self.done = False
+        self.consumed = 0  # characters read up to and including the root's closing bracket
+        self._stack: List[_Frame] = []
+        self._started = False
+        # In-progress token: a quoted string or a bare word (number, literal, unquoted key)
+        self._token: Optional[str] = None  # "string" | "bare"
+        self._phrase = False  # bare dict value, which may run across spaces ("desc": it's great)
+        self._quote = ""
+        self._buffer: List[str] = []
+        self._escape = False
+        self._unicode: Optional[List[str]] = None
+        self._events: List[Tuple[Path, Any]] = []
+
+    def feed(self, chunk: str, start: int = 0) -> List[Tuple[Path, Any]]:
+        """Consume `chunk` from index `start` on (earlier characters are skipped without copying)."""
+        self._events = []
+        for index in range(start, len(chunk)):
+            if self.done:
+                self.consumed += index - start
+                return self._events
+            self._consume(chunk[index])
+        self.consumed += max(0, len(chunk) - start)
+        return self._events
+
+    def partial(self) -> Any:
+        """The value parsed so far (open containers included, unfinished tokens excluded)."""
+        return self.root
+
+    def close(self) -> Any:
+        """Finish a possibly truncated document and return the root value (None if none started)."""
+        if self._token == "string":
+            if self._unicode is not None:
+                self._unicode = None
+            self._finish_string()
+        elif self._token == "bare":
+            self._finish_bare()
+        while self._stack:
+            self._close_container()
+        self.done = True
+        return self.root
+
+    # -- character handling -------------------------------------------------
+
+    def _consume(self, char: str):
+        if self._token == "string":
+            self._consume_string(char)
+            return
+        if self._token == "bare":
+            if self._extends_bare(char):
+                self._buffer.append(char)
+                return
+            if char == ":" and self._phrase:
+                self._split_phrase()
+            else:
+                self._finish_bare()
+            if self.done:
+                return
+
+        if not self._started:
+            if char in self.roots:
+                self._open(char)
+            return
+        if char in _WHITESPACE:
+            return
+
+        frame = self._stack[-1]
+        if char in "{[":
+            self._before_value(frame)
+            self._open(char)
+        elif char in "}]":
+            if frame.expect == _VALUE and frame.key is not None:
+                frame.key = None  # "key": with no value before a close
+            self._close_container()
+        elif char == ",":
+            if frame.expect == _COMMA:
+                frame.expect = _KEY if isinstance(frame.container, dict) else _VALUE
+            # Repeated or trailing commas are ignored
+        elif char == ":":
+            if frame.expect == _COLON:
+                frame.expect = _VALUE
+        elif char in "\"'":
+            # Quotes only open a string at the start of a token; inside a bare word they are literal
+            if frame.expect != _KEY:
+                self._before_value(frame)
+            self._token, self._quote, self._buffer = "string", char, []
+        else:
+            if frame.expect != _KEY:
+                self._before_value(frame)
+            self._phrase = isinstance(frame.container, dict) and frame.expect == _VALUE
+            self._token, self._buffer = "bare", [char]
+
+    def _extends_bare(self, char: str) -> bool:
+        if char in _INLINE_SPACE:
+            # Unquoted dict values may be phrases; keys and array items end at whitespace
+            return self._phrase
+        if char in _BARE_TERMINATORS:
+            return False
+        # After a space, a quote or bracket starts the next token (a missing comma)
+        return not (self._buffer[-1] in _INLINE_SPACE and char in "\"'{[")
+
+    def _split_phrase(self):
+        # `"a": 1 b: 2` - the word before the colon is the next (unquoted) key, not part of the value
+        words = "".join(self._buffer).rsplit(None, 1)
+        if len(words) == 2:
+            self._buffer = [words[0]]
+            self._finish_bare()
+            self._before_value(self._stack[-1])
+            self._token, self._buffer = "bare", [words[1]]
+        self._finish_bare()
+
+    def _consume_string(self, char: str):
+        if self._unicode is not None:
+            self._unicode.append(char)
+            if len(self._unicode) == 4:
+                try:
+                    self._buffer.append(chr(int("".join(self._unicode), 16)))
+                except ValueError:
+                    self._buffer.append("\\u" + "".join(self._unicode))
+                self._unicode = None
+        elif self._escape:
+            self._escape = False
+            if char == "u":
+                self._unicode = []
+            else:
+                self._buffer.append(_ESCAPES.get(char, char))
+        elif char == "\\":
+            self._escape = True
+        elif char == self._quote:
+            self._finish_string()
+        else:
+            self._buffer.append(char)
+
+    # -- tokens -------------------------------------------------------------
+
+    def _finish_string(self):
+        text = "".join(self._buffer)
+        self._token, self._buffer, self._escape = None, [], False
+        frame = self._stack[-1]
+        if frame.expect == _KEY:
+            frame.key, frame.expect = text, _COLON
+        else:
+            self._add_value(text)
+
+    def _finish_bare(self):
+        text = "".join(self._buffer).strip()
+        self._token, self._buffer = None, []
+        if not text:
+            return
+        frame = self._stack[-1]
+        if frame.expect == _KEY:
+            frame.key, frame.expect = text, _COLON
+            return
+        lowered = text.lower()
+        if lowered in _LITERALS:
+            value = _LITERALS[lowered]
+        else:
+            try:
+                value = int(text)
+            except ValueError:
+                try:
+                    value = float(text)
+                except ValueError:
+                    value = text  # Unquoted string value
+        self._add_value(value)
+
+    # -- containers ---------------------------------------------------------
+
+    def _before_value(self, frame: _Frame):
+        # A value where a comma or colon was expected: treat the separator as missing
+        if frame.expect in (_COMMA, _COLON):
+            if isinstance(frame.container, dict) and frame.expect == _COMMA:
+                frame.expect = _KEY
+            else:
+                frame.expect = _VALUE
+
+    def _child_path(self) -> Path:
+        if not self._stack:
+            return ()
+        frame = self._stack[-1]
+        if isinstance(frame.container, dict):
+            return frame.path + (frame.key,)
+        return frame.path + (len(frame.container),)
+
+    def _open(self, char: str):
+        container: Any = {} if char == "{" else []
+        path = self._child_path()
+        if not self._started:
+            self._started = True
+            self.root = container
+        else:
+            self._attach(container)
+        self._stack.append(_Frame(container, path))
+
+    def _attach(self, value: Any):
+        frame = self._stack[-1]
+        if isinstance(frame.container, dict):
+            if frame.key is None:
+                return
+            frame.container[frame.key] = value
+            frame.key = None
+        else:
+            frame.container.append(value)
+        frame.expect = _COMMA
+
+    def _add_value(self, value: Any):
+        frame = self._stack[-1]
+        if isinstance(frame.container, list):
+            self._events.append((frame.path + (len(frame.container),), value))
+        self._attach(value)
+
+    def _close_container(self):
+        frame = self._stack.pop()
+        if not self._stack:
+            self.done = True
+            return
+        parent = self._stack[-1]
+        if isinstance(parent.container, list):
+            self._events.append((frame.path, frame.container))
+
+
+def parse_json(text: Optional[str], expect: Optional[type] = None) -> Any:
+    """
+    Parse JSON out of model output. Strict JSON takes the fast path; anything else
+    (prose, fences, trailing commas, unquoted keys, truncation) goes through the
+    tolerant parser. With `expect` (dict or list) the search starts at that kind
+    of container and a mismatching result is returned as None.
+    """
+    if not text:
+        return None
+    stripped = _FENCE.sub("", text.strip()).strip()
+    try:
+        value = json.loads(stripped)
+    except ValueError:
+        roots = {dict: "{", list: "["}.get(expect, "{[")
+        parser = StreamingJSONParser(roots)
+        parser.feed(stripped)
+        value = parser.close()
+    if expect is not None and not isinstance(value, expect):
+        return None
+    return value
+
+
+def parse_json_values(text: Optional[str], roots: str = "{[") -> List[Any]:
+    """
+    Every top-level container in model output, in order, e.g. several bare objects
+    written one after another instead of as an array. A single strict document is
+    returned as a one-element list.
+    """
+    if not text:
+        return []
+    stripped = _FENCE.sub("", text.strip()).strip()
+    try:
+        return [json.loads(stripped)]
+    except ValueError:
+        pass
+    values = []
+    offset = 0
+    while offset < len(stripped):
+        # Each parser picks up where the previous root closed, so the text is read once overall
+        parser = StreamingJSONParser(roots)
+        parser.feed(stripped, offset)
+        value = parser.close()
+        if value is None:
+            break
+        values.append(value)
+        offset += parser.consumed
+    return values
+
+
+async def iter_array_items(chunks: AsyncIterable[str], path: Path = (), roots: str = "{[") -> AsyncIterator[Any]:
+    """Yield the elements of the array at `path` as soon as each one closes in a token stream."""
+    parser = StreamingJSONParser(roots)
+    depth = len(path) + 1
+    async for chunk in chunks:
+        for event_path, value in parser.feed(chunk):
+            if len(event_path) == depth and event_path[:-1] == path:
+                yield value
+        if parser.done:
+            return
+    parser.close()
@@ -0,0 +1,229 @@
+"""
+Async LLM provider client
+Single `generate(prompt, options)` entry point for every REST-based model provider, built on the shared pooled HTTP client
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import httpx
+
+from services.http_client import get_http_client
+from services.provider_health import provider_health
+from services.rate_limiter import RateLimitExceeded, rate_limiter
+
+
+GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+HUGGINGFACE_URL = "https://api-inference.huggingface.co/models/{model}"
+OLLAMA_URL = "http://localhost:11434/api/generate"
+
+
+@dataclass
+class GenerationOptions:
+    """Provider, model and sampling parameters for a single generation call"""
+    provider: str  # gemini | groq | huggingface | ollama | openai
+    model: str
+    api_key: str = ""
+    base_url: str = ""
+    temperature: float = 0.7
+    max_tokens: int = 1000
+    top_p: Optional[float] = None
+    top_k: Optional[int] = None
+    system_prompt: Optional[str] = None
+    timeout: float = 30.0
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+class ProviderError(Exception):
+    """Raised when a provider call fails or returns an unusable response"""
+
+    def __init__(
+        self,
+        provider: str,
+        message: str,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        circuit_open: bool = False,
+    ):
+        super().__init__(f"{provider}: {message}")
+        self.provider = provider
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.circuit_open = circuit_open
+
+
+class LLMProviderClient:
+    """Dispatches generation requests to provider REST APIs over pooled connections"""
+
+    async def generate(self, prompt: str, options: GenerationOptions) -> str:
+        """Generate text for `prompt`; raises ProviderError on any failure."""
+        provider = options.provider
+        handler = getattr(self, f"_generate_{provider}", None)
+        if handler is None:
+            raise ProviderError(provider, "unsupported provider")
+        if not provider_health.allow(provider):
+            raise ProviderError(provider, "circuit open, skipping", circuit_open=True)
+
+        started = time.monotonic()
+        try:
+            text = await rate_limiter.call(
+                provider,
+                options.model,
+                prompt,
+                options.max_tokens,
+                lambda: handler(prompt, options),
+            )
+        except RateLimitExceeded as e:
+            # Never sent, so it says nothing about provider health
+            provider_health.release(provider)
+            raise ProviderError(provider, str(e), status_code=429, retry_after=e.wait_seconds or None) from e
+        except ProviderError as e:
+            provider_health.record_failure(provider, time.monotonic() - started, str(e))
+            raise
+        except BaseException:
+            # Cancelled calls say nothing about provider health
+            provider_health.release(provider)
+            raise
+        provider_health.record_success(provider, time.monotonic() - started)
+        return text
+
+    async def _post(self, provider: str, url: str, payload: Dict[str, Any], headers: Dict[str, str], timeout: float) -> Any:
+        client = get_http_client()
+        try:
+            response = await client.post(url, json=payload, headers=headers, timeout=timeout)
+        except httpx.HTTPError as e:
+            raise ProviderError(provider, f"{type(e).__name__}: {e}") from e
+
+        if response.status_code >= 400:
+            raise ProviderError(
+                provider,
+                f"HTTP {response.status_code} - {response.text[:300]}",
+                status_code=response.status_code,
+                retry_after=_parse_retry_after(response.headers.get("retry-after")),
+            )
+        try:
+            return response.json()
+        except ValueError as e:
+            raise ProviderError(provider, "invalid JSON response", status_code=response.status_code) from e
+
+    async def _generate_gemini(self, prompt: str, options: GenerationOptions) -> str:
+        generation_config: Dict[str, Any] = {
+            "temperature": options.temperature,
+            "maxOutputTokens": options.max_tokens,
+        }
+        if options.top_p is not None:
+            generation_config["topP"] = options.top_p
+        if options.top_k is not None:
+            generation_config["topK"] = options.top_k
+
+        payload: Dict[str, Any] = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": generation_config,
+        }
+        if options.system_prompt:
+            payload["systemInstruction"] = {"parts": [{"text": options.system_prompt}]}
+        payload.update(options.extra)
+
+        result = await self._post(
+            "gemini",
+            options.base_url or GEMINI_URL.format(model=options.model),
+            payload,
+            {"Content-Type": "application/json", "x-goog-api-key": options.api_key},
+            options.timeout,
+        )
+        try:
+            return result["candidates"][0]["content"]["parts"][0]["text"]
+        except (KeyError, IndexError, TypeError):
+            raise ProviderError("gemini", f"no candidates in response: {str(result)[:200]}")
+
+    async def _generate_groq(self, prompt: str, options: GenerationOptions) -> str:
+        return await self._chat_completion("groq", options.base_url or GROQ_URL, prompt, options)
+
+    async def _generate_openai(self, prompt: str, options: GenerationOptions) -> str:
+        if not options.base_url:
+            raise ProviderError("openai", "base_url is required for OpenAI-compatible providers")
+        return await self._chat_completion("openai", f"{options.base_url.rstrip('/')}/v1/chat/completions", prompt, options)
+
+    async def _chat_completion(self, provider: str, url: str, prompt: str, options: GenerationOptions) -> str:
+        messages = []
+        if options.system_prompt:
+            messages.append({"role": "system", "content": options.system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        payload: Dict[str, Any] = {
+            "model": options.model,
+            "messages": messages,
+            "max_tokens": options.max_tokens,
+            "temperature": options.temperature,
+        }
+        if options.top_p is not None:
+            payload["top_p"] = options.top_p
+        payload.update(options.extra)
+
+        result = await self._post(
+            provider,
+            url,
+            payload,
+            {"Authorization": f"Bearer {options.api_key}", "Content-Type": "application/json"},
+            options.timeout,
+        )
+        try:
+            return result["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            raise ProviderError(provider, f"no choices in response: {str(result)[:200]}")
+
+    async def _generate_huggingface(self, prompt: str, options: GenerationOptions) -> str:
+        parameters: Dict[str, Any] = {
+            "max_new_tokens": options.max_tokens,
+            "temperature": options.temperature,
+            "do_sample": options.temperature > 0,
+        }
+        parameters.update(options.extra.get("parameters", {}))
+
+        result = await self._post(
+            "huggingface",
+            options.base_url or HUGGINGFACE_URL.format(model=options.model),
+            {"inputs": prompt, "parameters": parameters},
+            {"Authorization": f"Bearer {options.api_key}", "Content-Type": "application/json"},
+            options.timeout,
+        )
+        if isinstance(result, list) and result:
+            return result[0].get("generated_text", "")
+        raise ProviderError("huggingface", f"unexpected response: {str(result)[:200]}")
+
+    async def _generate_ollama(self, prompt: str, options: GenerationOptions) -> str:
+        payload: Dict[str, Any] = {
+            "model": options.model,
+            "prompt": prompt,
+            "stream": False,
+            "options": {"temperature": options.temperature, "num_predict": options.max_tokens},
+        }
+        if options.system_prompt:
+            payload["system"] = options.system_prompt
+
+        result = await self._post(
+            "ollama",
+            options.base_url or OLLAMA_URL,
+            payload,
+            {"Content-Type": "application/json"},
+            options.timeout,
+        )
+        if isinstance(result, dict) and "response" in result:
+            return result["response"]
+        raise ProviderError("ollama", f"unexpected response: {str(result)[:200]}")
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds (HTTP-date values are ignored)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+# Global client instance
+llm_client = LLMProviderClient()
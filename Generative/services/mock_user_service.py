@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import Optional, Dict, Any
 from models.schemas import User, UserCreate, UserUpdate
 from services.auth_service import auth_service
+from services.executors import cpu_executor
 
 # In-memory user storage for demo purposes
 MOCK_USERS = {}
@@ -28,7 +29,7 @@ class MockUserService:
         user_doc = {
             "id": user_id,
             "email": user_data.email,
-            "password_hash": auth_service.get_password_hash(user_data.password),
+            "password_hash": await cpu_executor.run(auth_service.get_password_hash, user_data.password),
             "full_name": user_data.full_name,
             "skills": user_data.skills or "",
             "expertise": user_data.expertise or "",
@@ -98,7 +99,7 @@ class MockUserService:
         if not user_data:
             return None
 
-        if not auth_service.verify_password(password, user_data["password_hash"]):
+        if not await cpu_executor.run(auth_service.verify_password, password, user_data["password_hash"]):
             return None
 
         return User(
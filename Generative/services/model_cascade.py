@@ -0,0 +1,147 @@
+"""
+Small-model-first cascade for roadmap agents
+Try the cheap model, score its answer, and escalate to the agent's large model only when the score is too low
+"""
+
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+from config.settings import settings
+
+T = TypeVar("T")
+
+
+class _TierStats:
+    __slots__ = ("calls", "served", "total_seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.served = 0
+        self.total_seconds = 0.0
+
+    def record(self, seconds: float):
+        self.calls += 1
+        self.total_seconds += seconds
+
+    @property
+    def avg_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+class ModelCascade:
+    """
+    Two-tier cascade. Latency saved is estimated per request as the large model's
+    observed average minus what the request actually spent; escalations count the
+    wasted small-model call against the total.
+    """
+
+    def __init__(self, name: str, small_model: str, threshold: float = 0.6, enabled: bool = True):
+        self.name = name
+        self.small_model = small_model
+        self.threshold = threshold
+        self.enabled = enabled
+        self.small = _TierStats()
+        self.large = _TierStats()
+        self.large_by_model: Dict[str, _TierStats] = {}
+        self.requests = 0
+        self.escalations = 0
+        self.latency_saved_seconds = 0.0
+
+    async def run(
+        self,
+        large_model: str,
+        call_small: Callable[[], Awaitable[T]],
+        call_large: Callable[[], Awaitable[T]],
+        score: Callable[[T], float],
+    ) -> Tuple[T, Dict[str, Any]]:
+        """Return (result, cascade_info) from the small tier when it scores at or above the threshold."""
+        if not self.enabled:
+            return await call_large(), {"tier": "large", "model": large_model, "escalated": False}
+
+        self.requests += 1
+        if large_model == self.small_model:
+            # The agent already runs the small model; nothing to cascade
+            result = await self._timed_large(large_model, call_large)
+            self.large.served += 1
+            return result, {"tier": "large", "model": large_model, "escalated": False}
+
+        started = time.monotonic()
+        small_score = 0.0
+        try:
+            result = await call_small()
+            small_score = score(result)
+        except Exception as e:
+            print(f"⚠️ Cascade {self.name}: {self.small_model} failed ({e}) - escalating")
+        small_seconds = time.monotonic() - started
+        self.small.record(small_seconds)
+
+        if small_score >= self.threshold:
+            self.small.served += 1
+            large_avg = self._large_stats(large_model).avg_seconds
+            if large_avg:
+                self.latency_saved_seconds += large_avg - small_seconds
+            return result, {"tier": "small", "model": self.small_model, "score": round(small_score, 3), "escalated": False}
+
+        print(f"⬆️ Cascade {self.name}: {self.small_model} scored {small_score:.2f} < {self.threshold} - escalating to {large_model}")
+        self.escalations += 1
+        self.latency_saved_seconds -= small_seconds
+        result = await self._timed_large(large_model, call_large)
+        self.large.served += 1
+        return result, {"tier": "large", "model": large_model, "small_score": round(small_score, 3), "escalated": True}
+
+    def _large_stats(self, model: str) -> _TierStats:
+        return self.large_by_model.setdefault(model, _TierStats())
+
+    async def _timed_large(self, model: str, call_large: Callable[[], Awaitable[T]]) -> T:
+        started = time.monotonic()
+        result = await call_large()
+        seconds = time.monotonic() - started
+        self.large.record(seconds)
+        self._large_stats(model).record(seconds)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        def tier(stats: _TierStats, model: str) -> Dict[str, Any]:
+            return {
+                "model": model,
+                "calls": stats.calls,
+                "served": stats.served,
+                "hit_rate": round(stats.served / self.requests, 3) if self.requests else 0.0,
+                "avg_latency_ms": round(stats.avg_seconds * 1000, 1),
+            }
+
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "requests": self.requests,
+            "escalations": self.escalations,
+            "escalation_rate": round(self.escalations / self.small.calls, 3) if self.small.calls else 0.0,
+            "tiers": {
+                "small": tier(self.small, self.small_model),
+                "large": tier(self.large, ", ".join(sorted(self.large_by_model)) or None),
+            },
+            "latency_saved_ms": {
+                "total": round(self.latency_saved_seconds * 1000, 1),
+                "per_request": round(self.latency_saved_seconds / self.requests * 1000, 1) if self.requests else 0.0,
+            },
+        }
+
+
+def _build(name: str) -> ModelCascade:
+    return ModelCascade(
+        name,
+        small_model=settings.MODEL_CASCADE_SMALL_MODEL,
+        threshold=settings.MODEL_CASCADE_THRESHOLD,
+        enabled=settings.MODEL_CASCADE_ENABLED,
+    )
+
+
+# Global cascades, one per roadmap service so their hit rates are reported separately
+roadmap_cascade = _build("multi-agent-roadmap")
+enhanced_roadmap_cascade = _build("enhanced-roadmap")
+
+CASCADES = (roadmap_cascade, enhanced_roadmap_cascade)
+
+
+def cascade_stats() -> Dict[str, Dict[str, Any]]:
+    return {cascade.name: cascade.stats() for cascade in CASCADES}
@@ -8,9 +8,8 @@ import asyncio
 import json
 import time
 import re
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
-import httpx
 from groq import Groq
 import google.generativeai as genai
 
@@ -24,41 +23,98 @@ class AgentResponse:
     metadata: Dict[str, Any]
 
 
-import json
-import os
+import atexit
+import threading
+from contextvars import ContextVar
 from pathlib import Path
 
+from config.settings import settings
+from services.funneling_log import FunnelingEventLog
+from services.funneling_store import FunnelingEventStore
+from services.json_stream import parse_json
+from services.llm_client import llm_client, GenerationOptions
+from services.model_cascade import roadmap_cascade
+from services.hedge_latency import hedge_latency
+from services.quorum import QuorumPolicy, QuorumWait
+from services.executors import io_executor, provider_executor
+from services.rate_limiter import rate_limiter
+from services.roadmap_cache import roadmap_cache, versioned_namespace
+
 # Global storage for funneling logs
 GLOBAL_FUNNELING_LOGS = []
-LOGS_FILE_PATH = Path("funneling_logs.json")
+LOGS_FILE_PATH = Path(settings.FUNNELING_LOG_PATH)
+LEGACY_LOGS_FILE_PATH = Path("funneling_logs.json")
+
+funneling_event_log = FunnelingEventLog(
+    LOGS_FILE_PATH,
+    legacy_path=LEGACY_LOGS_FILE_PATH,
+    flush_every=settings.FUNNELING_LOG_FLUSH_EVERY,
+    retain_events=settings.FUNNELING_LOG_RETAIN_EVENTS,
+    executor=io_executor,
+)
+funneling_event_store = FunnelingEventStore()
+
+_logs_loaded = False
+_logs_load_lock = threading.Lock()
+
+def ensure_logs_loaded():
+    """
+    Load (and, the first time, migrate) the on-disk funneling log into memory once.
+    Called at container startup and lazily by anything that reads or records events,
+    so importing this module never touches the filesystem.
+    """
+    global _logs_loaded
+    if _logs_loaded:
+        return
+    with _logs_load_lock:
+        if _logs_loaded:
+            return
+        load_logs_from_file()
+        # Make sure buffered events survive shutdown
+        atexit.register(save_logs_to_file)
+        _logs_loaded = True
+
+def record_funneling_event(event: dict):
+    """Append a funneling event to memory and the on-disk event log"""
+    ensure_logs_loaded()
+    GLOBAL_FUNNELING_LOGS.append(event)
+    funneling_event_store.add(event)
+    funneling_event_log.append(event)
+    # Trim in batches so the in-memory window tracks the compacted log
+    if len(GLOBAL_FUNNELING_LOGS) > funneling_event_log.retain_events + funneling_event_log.compact_every:
+        expired = GLOBAL_FUNNELING_LOGS[:-funneling_event_log.retain_events]
+        del GLOBAL_FUNNELING_LOGS[:-funneling_event_log.retain_events]
+        funneling_event_store.forget_sessions(log.get("session_id") for log in expired)
 
 def save_logs_to_file():
-    """Save funneling logs to file"""
-    try:
-        with open(LOGS_FILE_PATH, 'w') as f:
-            json.dump(GLOBAL_FUNNELING_LOGS, f, default=str)
-    except Exception as e:
-        print(f"Warning: Could not save logs to file: {e}")
+    """Flush buffered funneling events to file"""
+    funneling_event_log.flush()
 
 def load_logs_from_file():
     """Load funneling logs from file"""
-    global GLOBAL_FUNNELING_LOGS
     try:
-        if LOGS_FILE_PATH.exists():
-            with open(LOGS_FILE_PATH, 'r') as f:
-                GLOBAL_FUNNELING_LOGS = json.load(f)
+        GLOBAL_FUNNELING_LOGS[:] = funneling_event_log.load()
     except Exception as e:
         print(f"Warning: Could not load logs from file: {e}")
-        GLOBAL_FUNNELING_LOGS = []
+        GLOBAL_FUNNELING_LOGS[:] = []
+    funneling_event_store.rebuild(GLOBAL_FUNNELING_LOGS)
 
-# Load existing logs on import
-load_logs_from_file()
+# The service is shared across requests, so the active session is tracked per asyncio context
+_current_session_id: ContextVar[Optional[str]] = ContextVar("funneling_session_id", default=None)
 
 class MultiAgentFunnelService:
     """
     Orchestrates multiple AI agents to generate roadmaps and funnels results
     """
     
+    @property
+    def current_session_id(self) -> Optional[str]:
+        return _current_session_id.get()
+    
+    @current_session_id.setter
+    def current_session_id(self, value: Optional[str]):
+        _current_session_id.set(value)
+    
     def __init__(self):
         # Initialize API clients
         # Load environment variables
@@ -79,11 +135,15 @@ class MultiAgentFunnelService:
             
         genai.configure(api_key=google_api_key)
         self.gemini_model = genai.GenerativeModel('gemini-2.0-flash-exp')
+        self._gemini_models = {self.gemini_model.model_name.split("/")[-1]: self.gemini_model}
         self.huggingface_token = os.getenv("HUGGINGFACE_API_TOKEN")
         
         # Use global funneling logs
         self.current_session_id = None
         self.agent_performance_metrics = {}
+        self.roadmap_cache = roadmap_cache if settings.ROADMAP_CACHE_ENABLED else None
+        self.model_cascade = roadmap_cascade
+        self.quorum_policy = QuorumPolicy.parse(settings.ROADMAP_QUORUM_RULES, settings.ROADMAP_QUORUM_DEADLINE_SECONDS)
         
         # Agent configurations
         self.agents = {
@@ -91,19 +151,22 @@ class MultiAgentFunnelService:
                 "name": "Strategic Planner",
                 "provider": "groq",
                 "model": "llama-3.3-70b-versatile",
-                "focus": "long-term career strategy and industry insights"
+                "focus": "long-term career strategy and industry insights",
+                "hedge": {"provider": "gemini", "model": "gemini-2.0-flash"}
             },
             "agent_practical": {
                 "name": "Practical Guide",
                 "provider": "gemini",
                 "model": "gemini-2.0-flash",
-                "focus": "actionable steps, resources, and hands-on learning"
+                "focus": "actionable steps, resources, and hands-on learning",
+                "hedge": {"provider": "groq", "model": "llama-3.3-70b-versatile"}
             },
             "agent_technical": {
                 "name": "Technical Expert",
                 "provider": "groq",
                 "model": "llama-3.1-8b-instant",
-                "focus": "technical skills, tools, and technologies"
+                "focus": "technical skills, tools, and technologies",
+                "hedge": {"provider": "gemini", "model": "gemini-2.0-flash"}
             }
         }
     
@@ -121,8 +184,7 @@ class MultiAgentFunnelService:
             "agents_involved": list(self.agents.keys()),
             "status": "INITIATED"
         }
-        GLOBAL_FUNNELING_LOGS.append(session_start)
-        save_logs_to_file()
+        record_funneling_event(session_start)
         return self.current_session_id
     
     def _log_agent_start(self, agent_id: str, agent_config: dict):
@@ -139,8 +201,7 @@ class MultiAgentFunnelService:
             "model": agent_config["model"],
             "focus": agent_config["focus"]
         }
-        GLOBAL_FUNNELING_LOGS.append(log_entry)
-        save_logs_to_file()
+        record_funneling_event(log_entry)
     
     def _log_agent_response(self, agent_id: str, response: 'AgentResponse', response_time: float):
         """Log agent response with detailed metrics."""
@@ -163,8 +224,7 @@ class MultiAgentFunnelService:
             "success": response.confidence_score > 0 and response_length > 0,
             "error": response.metadata.get("error") if response.confidence_score == 0 else None
         }
-        GLOBAL_FUNNELING_LOGS.append(log_entry)
-        save_logs_to_file()
+        record_funneling_event(log_entry)
     
     def _log_funneling_process(self, agent_responses: list, best_agent: str, final_confidence: float):
         """Log the funneling decision process."""
@@ -185,16 +245,48 @@ class MultiAgentFunnelService:
             "final_confidence": final_confidence,
             "funneling_method": "confidence_based_selection"
         }
-        GLOBAL_FUNNELING_LOGS.append(log_entry)
-        save_logs_to_file()
+        record_funneling_event(log_entry)
+    
+    def _log_cache_hit(self, cache_hit: dict):
+        """Log that this session was served from the semantic roadmap cache."""
+        import time
+        
+        log_entry = {
+            "session_id": self.current_session_id,
+            "timestamp": time.time(),
+            "event_type": "CACHE_HIT",
+            "similarity": cache_hit["similarity"],
+            "matched_query": cache_hit["matched_query"],
+            "source_session_id": cache_hit["source_session_id"]
+        }
+        record_funneling_event(log_entry)
+    
+    def _log_quorum(self, quorum: QuorumWait):
+        """Log when agent fan-out stopped waiting and which agents were cancelled."""
+        import time
+        
+        log_entry = {
+            "session_id": self.current_session_id,
+            "timestamp": time.time(),
+            "event_type": "QUORUM",
+            "reason": quorum.reason,
+            "rule": quorum.rule,
+            "elapsed_seconds": round(quorum.elapsed_seconds, 2),
+            "completed_agents": list(quorum.completed),
+            "cut_off_agents": [
+                {"agent_id": agent_id, "agent_name": self.agents[agent_id]["name"], "reason": reason}
+                for agent_id, reason in quorum.cut_off.items()
+            ]
+        }
+        record_funneling_event(log_entry)
     
     def _log_session_complete(self, final_result: dict):
         """Log session completion with final metrics."""
         import time
         
-        # Calculate session metrics - FIX: Use GLOBAL_FUNNELING_LOGS instead of self.funneling_logs
-        session_logs = [log for log in GLOBAL_FUNNELING_LOGS if log.get("session_id") == self.current_session_id]
-        session_start_time = min(log["timestamp"] for log in session_logs)
+        # Calculate session metrics from the indexed session summary
+        session_summary = funneling_event_store.summary(self.current_session_id) or {}
+        session_start_time = session_summary.get("started_at") or time.time()
         total_time = time.time() - session_start_time
         
         # Count phases and content quality
@@ -216,8 +308,9 @@ class MultiAgentFunnelService:
             "total_content_items": total_content_items,
             "success": bool(final_result.get("final_roadmap"))
         }
-        GLOBAL_FUNNELING_LOGS.append(log_entry)
-        save_logs_to_file()
+        record_funneling_event(log_entry)
+        # A finished session is the natural durability point for its buffered events
+        io_executor.submit(save_logs_to_file)
     
     def generate_funneling_report(self, session_id: str = None) -> dict:
         """Generate a comprehensive report of the funneling process."""
@@ -225,17 +318,22 @@ class MultiAgentFunnelService:
         if not target_session:
             return {"error": "No session to report on"}
         
-        # Filter logs for this session
-        session_logs = [log for log in GLOBAL_FUNNELING_LOGS if log.get("session_id") == target_session]
-        if not session_logs:
+        # Look up this session's events and precomputed summary
+        ensure_logs_loaded()
+        session_logs = funneling_event_store.session_events(target_session)
+        session_summary = funneling_event_store.summary(target_session)
+        if not session_logs or not session_summary:
             return {"error": f"No logs found for session {target_session}"}
         
         # Organize logs by type
-        session_info = next((log for log in session_logs if "user_query" in log), {})
-        agent_starts = [log for log in session_logs if log.get("event_type") == "AGENT_START"]
-        agent_responses = [log for log in session_logs if log.get("event_type") == "AGENT_RESPONSE"]
-        funneling_info = next((log for log in session_logs if log.get("event_type") == "FUNNELING_PROCESS"), {})
-        completion_info = next((log for log in session_logs if log.get("event_type") == "SESSION_COMPLETE"), {})
+        session_info = session_summary["session_start"]
+        agent_starts = session_summary["agent_starts"]
+        agent_responses = session_summary["agent_responses"]
+        funneling_info = session_summary["funneling"]
+        completion_info = session_summary["completion"]
+        cache_info = session_summary["cache_hit"]
+        quorum_info = session_summary.get("quorum", {})
+        starts_by_agent = {log.get("agent_id"): log for log in agent_starts}
         
         # Calculate performance metrics
         total_time = completion_info.get("total_time_seconds", 0)
@@ -280,12 +378,27 @@ class MultiAgentFunnelService:
                 "estimated_learning_hours": max(completion_info.get("total_phases_generated", 0) * 40, 160)  # 40 hours per phase, minimum 160
             },
             
+            "cache": {
+                "hit": bool(cache_info),
+                "similarity": cache_info.get("similarity"),
+                "matched_query": cache_info.get("matched_query"),
+                "source_session_id": cache_info.get("source_session_id")
+            },
+            
+            "quorum": {
+                "reason": quorum_info.get("reason"),
+                "rule": quorum_info.get("rule"),
+                "elapsed_seconds": quorum_info.get("elapsed_seconds"),
+                "completed_agents": quorum_info.get("completed_agents", []),
+                "cut_off_agents": quorum_info.get("cut_off_agents", [])
+            },
+            
             "detailed_timeline": []
         }
         
         # Add individual agent performance
         for response_log in agent_responses:
-            start_log = next((log for log in agent_starts if log.get("agent_id") == response_log.get("agent_id")), {})
+            start_log = starts_by_agent.get(response_log.get("agent_id"), {})
             
             agent_result = {
                 "agent_name": response_log.get("agent_name", ""),
@@ -335,6 +448,24 @@ class MultiAgentFunnelService:
                     "best_agent": log.get('best_agent'),
                     "final_confidence": log.get('final_confidence', 0)
                 }
+            elif log.get("event_type") == "CACHE_HIT":
+                timeline_entry["details"] = f"♻️ Served from roadmap cache - matched '{log.get('matched_query')}' (similarity {log.get('similarity', 0):.2f})"
+                timeline_entry["metrics"] = {
+                    "similarity": log.get('similarity', 0),
+                    "source_session_id": log.get('source_session_id')
+                }
+            elif log.get("event_type") == "QUORUM":
+                cut_off = log.get('cut_off_agents', [])
+                if cut_off:
+                    names = ", ".join(agent.get("agent_name", "") for agent in cut_off)
+                    timeline_entry["details"] = f"✂️ Stopped waiting after {log.get('elapsed_seconds', 0):.2f}s - {cut_off[0].get('reason')}; cancelled {names}"
+                else:
+                    timeline_entry["details"] = f"⏱️ All agents finished in {log.get('elapsed_seconds', 0):.2f}s"
+                timeline_entry["metrics"] = {
+                    "reason": log.get('reason'),
+                    "completed_agents": len(log.get('completed_agents', [])),
+                    "cut_off_agents": len(cut_off)
+                }
             elif log.get("event_type") == "SESSION_COMPLETE":
                 timeline_entry["details"] = f"🎉 Roadmap generation complete - {log.get('total_phases_generated', 0)} learning phases with {log.get('total_content_items', 0)} content items generated ({log.get('final_roadmap_length', 0):,} characters total)"
                 timeline_entry["metrics"] = {
@@ -372,17 +503,10 @@ class MultiAgentFunnelService:
         )
         
         try:
-            if agent_config["provider"] == "groq":
-                raw_response = await self._call_groq(agent_config["model"], prompt)
-            elif agent_config["provider"] == "gemini":
-                raw_response = await self._call_gemini(prompt)
-            elif agent_config["provider"] == "huggingface":
-                raw_response = await self._call_huggingface(agent_config["model"], prompt)
-            else:
-                raise ValueError(f"Unknown provider: {agent_config['provider']}")
+            raw_response, served_by = await self._call_with_cascade(agent_config, prompt, user_query, user_background)
             
             # Process markdown text response (not JSON)
-            if not raw_response or len(raw_response.strip()) < 50:
+            if not self._is_usable_response(raw_response):
                 print(f"⚠️ {agent_config['name']}: Response too short or empty")
                 return AgentResponse(
                     agent_name=agent_config["name"],
@@ -406,10 +530,12 @@ class MultiAgentFunnelService:
                 roadmap=raw_response,  # Store the specialization-specific markdown
                 confidence_score=confidence,
                 metadata={
-                    "provider": agent_config["provider"],
-                    "model": agent_config["model"],
+                    "provider": served_by["provider"],
+                    "model": served_by["model"],
                     "focus": agent_config["focus"],
-                    "specialization": user_query
+                    "specialization": user_query,
+                    "hedged": served_by["hedged"],
+                    "cascade_tier": served_by.get("cascade_tier")
                 }
             )
             
@@ -428,7 +554,7 @@ class MultiAgentFunnelService:
             
             # If rate limit, provide helpful message
             if "rate_limit" in error_msg.lower() or "429" in error_msg:
-                print(f"⚠️ Rate limit hit for {agent_config['name']} - this agent will be skipped")
+                print(f"⚠️ Rate limit for {agent_config['name']} persisted after queueing and retry - agent skipped")
             
             error_response = AgentResponse(
                 agent_name=agent_config["name"],
@@ -447,12 +573,118 @@ class MultiAgentFunnelService:
             
             return error_response
     
+    @staticmethod
+    def _is_usable_response(raw_response: Optional[str]) -> bool:
+        """A response is usable once it carries real content."""
+        return bool(raw_response and len(raw_response.strip()) >= 50)
+    
+    async def _call_provider(self, provider: str, model: str, prompt: str) -> str:
+        """Dispatch to a provider and record its latency for hedging decisions"""
+        latency_key = f"{provider}/{model}"
+        started = time.monotonic()
+        try:
+            if provider == "groq":
+                raw_response = await self._call_groq(model, prompt)
+            elif provider == "gemini":
+                raw_response = await self._call_gemini(prompt, model)
+            elif provider == "huggingface":
+                raw_response = await self._call_huggingface(model, prompt)
+            else:
+                raise ValueError(f"Unknown provider: {provider}")
+        except BaseException:
+            # Cancelled (lost a hedge race) or failed: the answer would have taken at least this long
+            hedge_latency.record(latency_key, time.monotonic() - started, completed=False)
+            raise
+        hedge_latency.record(latency_key, time.monotonic() - started)
+        return raw_response
+    
+    def _hedge_delay(self, provider: str, model: str) -> float:
+        """Seconds to wait on the primary before hedging, from its observed latency percentile"""
+        observed = hedge_latency.percentile(f"{provider}/{model}", settings.ROADMAP_HEDGE_PERCENTILE)
+        if observed is None:
+            return settings.ROADMAP_HEDGE_DEFAULT_DELAY_SECONDS
+        return max(settings.ROADMAP_HEDGE_MIN_DELAY_SECONDS, observed)
+    
+    async def _call_with_hedge(self, agent_config: Dict[str, Any], prompt: str):
+        """
+        Call the agent's primary provider; if it is slower than its latency percentile
+        (or fails), race a duplicate on the hedge provider and keep the first usable answer.
+        Returns (raw_response, served_by).
+        """
+        primary = {"provider": agent_config["provider"], "model": agent_config["model"]}
+        hedge = agent_config.get("hedge")
+        
+        if not settings.ROADMAP_HEDGING_ENABLED or not hedge:
+            raw_response = await self._call_provider(primary["provider"], primary["model"], prompt)
+            return raw_response, {**primary, "hedged": False}
+        
+        tasks = {asyncio.create_task(self._call_provider(primary["provider"], primary["model"], prompt)): primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self._hedge_delay(primary["provider"], primary["model"]))
+            for task in done:
+                if not task.exception() and self._is_usable_response(task.result()):
+                    return task.result(), {**primary, "hedged": False}
+            
+            print(f"🪁 {agent_config['name']}: hedging to {hedge['provider']}/{hedge['model']}")
+            tasks[asyncio.create_task(self._call_provider(hedge["provider"], hedge["model"], prompt))] = hedge
+            
+            pending = {task for task in tasks if not task.done()}
+            last_result, last_error = "", None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception():
+                        last_error = task.exception()
+                        continue
+                    if self._is_usable_response(task.result()):
+                        winner = tasks[task]
+                        print(f"🏁 {agent_config['name']}: {winner['provider']}/{winner['model']} answered first")
+                        return task.result(), {**winner, "hedged": True}
+                    last_result = task.result()
+            
+            if last_error and not last_result:
+                raise last_error
+            return last_result, {**primary, "hedged": True}
+        finally:
+            # Cancel the losing request (executor-backed SDK calls finish in their thread, but the result is dropped)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _call_with_cascade(
+        self,
+        agent_config: Dict[str, Any],
+        prompt: str,
+        user_query: str,
+        user_background: Optional[Dict[str, Any]] = None
+    ):
+        """
+        In cascade mode, answer with the small Groq model when its specialization
+        confidence clears the threshold; otherwise call the agent's own model (with hedging).
+        Returns (raw_response, served_by).
+        """
+        async def call_small():
+            model = self.model_cascade.small_model
+            raw_response = await self._call_provider("groq", model, prompt)
+            return raw_response, {"provider": "groq", "model": model, "hedged": False}
+        
+        def score(result):
+            raw_response = result[0]
+            if not self._is_usable_response(raw_response):
+                return 0.0
+            return self._calculate_specialization_confidence(raw_response, user_query, user_background or {})
+        
+        (raw_response, served_by), cascade = await self.model_cascade.run(
+            agent_config["model"],
+            call_small,
+            lambda: self._call_with_hedge(agent_config, prompt),
+            score
+        )
+        return raw_response, {**served_by, "cascade_tier": cascade["tier"]}
+    
     async def _call_groq(self, model: str, prompt: str) -> str:
         """Call Groq API"""
-        # Run the blocking Groq call in an executor to avoid blocking the event loop
-        import asyncio
-        loop = asyncio.get_event_loop()
-        
+        # Run the blocking Groq call on the provider SDK pool to avoid blocking the event loop
         def _sync_groq_call():
             chat_completion = self.groq_client.chat.completions.create(
                 messages=[
@@ -469,40 +701,45 @@ class MultiAgentFunnelService:
                 temperature=0.7,  # Balanced for creativity and focus
                 max_tokens=4000   # Increased for comprehensive, detailed responses
             )
-            return chat_completion.choices[0].message.content
+            return chat_completion
         
-        return await loop.run_in_executor(None, _sync_groq_call)
+        # Settle the TPM reservation against the tokens Groq actually billed
+        chat_completion = await rate_limiter.call(
+            "groq", model, prompt, 4000,
+            lambda: provider_executor.run(_sync_groq_call),
+            usage=lambda completion: completion.usage.total_tokens
+        )
+        return chat_completion.choices[0].message.content
+    
+    def _gemini_model_for(self, model: Optional[str]):
+        """GenerativeModel for `model` (the default model when None), created once per name"""
+        if not model:
+            return self.gemini_model
+        if model not in self._gemini_models:
+            self._gemini_models[model] = genai.GenerativeModel(model)
+        return self._gemini_models[model]
     
-    async def _call_gemini(self, prompt: str) -> str:
+    async def _call_gemini(self, prompt: str, model: Optional[str] = None) -> str:
         """Call Google Gemini API"""
-        # Run the blocking Gemini call in an executor to avoid blocking the event loop
-        import asyncio
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(None, self.gemini_model.generate_content, prompt)
+        gemini_model = self._gemini_model_for(model)
+        # Run the blocking Gemini call on the provider SDK pool to avoid blocking the event loop
+        response = await rate_limiter.call(
+            "gemini", gemini_model.model_name.split("/")[-1], prompt, 8192,
+            lambda: provider_executor.run(gemini_model.generate_content, prompt),
+            usage=lambda result: result.usage_metadata.total_token_count
+        )
         return response.text
     
     async def _call_huggingface(self, model: str, prompt: str) -> str:
-        """Call HuggingFace Inference API"""
-        API_URL = f"https://api-inference.huggingface.co/models/{model}"
-        headers = {"Authorization": f"Bearer {self.huggingface_token}"}
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_URL,
-                headers=headers,
-                json={
-                    "inputs": prompt,
-                    "parameters": {
-                        "max_new_tokens": 4000,  # Increased for comprehensive responses
-                        "temperature": 0.7       # Balanced for quality
-                    }
-                },
-                timeout=30.0
-            )
-            result = response.json()
-            if isinstance(result, list) and len(result) > 0:
-                return result[0].get("generated_text", "")
-            return str(result)
+        """Call HuggingFace Inference API over the shared pooled client"""
+        return await llm_client.generate(prompt, GenerationOptions(
+            provider="huggingface",
+            model=model,
+            api_key=self.huggingface_token or "",
+            temperature=0.7,   # Balanced for quality
+            max_tokens=4000,   # Increased for comprehensive responses
+            timeout=30.0
+        ))
     
     def _create_agent_prompt(
         self, 
@@ -872,7 +1109,8 @@ class MultiAgentFunnelService:
         
         return specializations[spec_key]
 
-    def _calculate_specialization_confidence(self, response: str, specialization: str, user_background: Dict[str, Any]) -> float:
+    @staticmethod
+    def _calculate_specialization_confidence(response: str, specialization: str, user_background: Dict[str, Any]) -> float:
         """Calculate confidence based on specialization-specific content."""
         if not response:
             return 0.0
@@ -983,58 +1221,19 @@ class MultiAgentFunnelService:
         return min(score, 1.0)
 
     def _parse_agent_json(self, raw_text: str) -> Optional[Dict[str, Any]]:
-        """Try to parse strict JSON from model output, with enhanced fallback extraction."""
+        """Parse strict JSON from model output, falling back to the tolerant parser for roadmap-shaped objects."""
         if not raw_text:
             return None
-        
-        raw_text = raw_text.strip()
-        
-        # Fast path - direct JSON parsing
         try:
             return json.loads(raw_text)
-        except Exception:
+        except ValueError:
             pass
         
-        # Remove common non-JSON prefixes/suffixes
-        prefixes_to_remove = ['```json', '```', 'Here is the JSON:', 'Here\'s the JSON:']
-        suffixes_to_remove = ['```', '\n```']
+        # Recovers fences, surrounding prose, trailing commas, unquoted keys and truncated output
+        parsed = parse_json(raw_text, expect=dict)
+        if parsed and ('phases' in parsed or 'overview' in parsed):
+            return parsed
         
-        cleaned_text = raw_text
-        for prefix in prefixes_to_remove:
-            if cleaned_text.startswith(prefix):
-                cleaned_text = cleaned_text[len(prefix):].strip()
-        
-        for suffix in suffixes_to_remove:
-            if cleaned_text.endswith(suffix):
-                cleaned_text = cleaned_text[:-len(suffix)].strip()
-        
-        # Try parsing cleaned text
-        try:
-            return json.loads(cleaned_text)
-        except Exception:
-            pass
-        
-        # Enhanced fallback: find the largest JSON object
-        import re
-        
-        # Look for JSON objects with various patterns
-        patterns = [
-            r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}',  # Simple nested objects
-            r'\{[\s\S]*\}',                      # Any content between braces
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, cleaned_text)
-            for match in matches:
-                try:
-                    parsed = json.loads(match)
-                    # Validate it has the expected structure
-                    if isinstance(parsed, dict) and ('phases' in parsed or 'overview' in parsed):
-                        return parsed
-                except Exception:
-                    continue
-        
-        # Last resort: create minimal valid structure if we can extract any info
         print(f"⚠️ Could not parse JSON from response. Raw text: {raw_text[:200]}...")
         return None
 
@@ -1272,10 +1471,9 @@ class MultiAgentFunnelService:
         for r in agent_responses:
             if r.confidence_score <= 0 or not r.roadmap:
                 continue
-            try:
-                structured_list.append(json.loads(r.roadmap))
-            except Exception:
-                continue
+            parsed = self._parse_agent_json(r.roadmap)
+            if parsed:
+                structured_list.append(parsed)
         
         if not structured_list:
             return "Unable to generate roadmap. Please try again."
@@ -1286,28 +1484,116 @@ class MultiAgentFunnelService:
         # Render final markdown
         return self._render_markdown(merged)
     
-    async def generate_roadmap(self, user_query: str, user_background: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def generate_roadmap(
+        self,
+        user_query: str,
+        user_background: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Main entry point - generates roadmap using multi-agent system with proper synthesis.
+        use_cache=False always regenerates (the fresh result still replaces the cached one).
+        """
+        final_result = None
+        async for event, payload in self.stream_roadmap(user_query, user_background, use_cache):
+            if event == "complete":
+                final_result = payload
+        return final_result
+
+    async def stream_roadmap(
+        self,
+        user_query: str,
+        user_background: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
         """
-        Main entry point - generates roadmap using multi-agent system with proper synthesis
+        Run the multi-agent pipeline, yielding (event, payload) pairs as work progresses:
+        agent_started, agent_finished, phase_preview (from the first usable agent),
+        agent_cut_off (stragglers cancelled once the quorum is met), phase (each
+        synthesized node phase) and finally complete with the full result.
         """
         print(f"🚀 Starting Multi-Agent Roadmap Generation for: {user_query}")
         
+        cached_result = self._serve_cached_roadmap(user_query, user_background, "synthesized") if use_cache else None
+        if cached_result is not None:
+            for phase_event in self._phase_events(cached_result):
+                yield "phase", phase_event
+            yield "complete", cached_result
+            return
+        
         # Start session logging
         session_id = self._start_new_session(user_query, user_background)
         
         # Generate responses from all agents concurrently
-        agent_tasks = []
+        tasks = {}
         for agent_id, agent_config in self.agents.items():
-            task = self.generate_roadmap_with_agent(
+            task = asyncio.ensure_future(self.generate_roadmap_with_agent(
                 agent_config, 
                 user_query, 
                 user_background, 
                 agent_id
-            )
-            agent_tasks.append(task)
+            ))
+            tasks[task] = agent_id
+            yield "agent_started", {
+                "session_id": session_id,
+                "agent_id": agent_id,
+                "agent_name": agent_config["name"],
+                "provider": agent_config["provider"],
+                "model": agent_config["model"],
+                "focus": agent_config["focus"]
+            }
+        
+        # Report agents as they finish; preview the first usable plan while the rest work
+        results: Dict[str, Any] = {}
+        preview_sent = False
+        quorum = QuorumWait(tasks, self.quorum_policy, lambda response: response.confidence_score)
+        try:
+            async for agent_id, response in quorum.results():
+                results[agent_id] = response
+                
+                if isinstance(response, AgentResponse):
+                    yield "agent_finished", {
+                        "agent_id": agent_id,
+                        "agent_name": response.agent_name,
+                        "confidence": response.confidence_score,
+                        "success": response.confidence_score > 0.1,
+                        "provider": response.metadata.get("provider", ""),
+                        "model": response.metadata.get("model", "")
+                    }
+                    if not preview_sent and response.confidence_score > 0.1:
+                        preview_plan = self._parse_agent_output(response, user_query)
+                        if preview_plan and preview_plan.get("phases"):
+                            preview_sent = True
+                            for i, phase in enumerate(preview_plan["phases"]):
+                                yield "phase_preview", {
+                                    "index": i,
+                                    "agent_name": response.agent_name,
+                                    "phase": self._format_node_phase(phase, i)
+                                }
+                else:
+                    yield "agent_finished", {
+                        "agent_id": agent_id,
+                        "agent_name": self.agents[agent_id]["name"],
+                        "confidence": 0.0,
+                        "success": False,
+                        "error": str(response)
+                    }
+        finally:
+            # The consumer may stop early (e.g. a disconnected stream)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        
+        self._log_quorum(quorum)
+        for agent_id, reason in quorum.cut_off.items():
+            yield "agent_cut_off", {
+                "agent_id": agent_id,
+                "agent_name": self.agents[agent_id]["name"],
+                "reason": reason
+            }
         
-        # Wait for all agents to complete
-        agent_responses = await asyncio.gather(*agent_tasks, return_exceptions=True)
+        # Keep the configured agent order for synthesis
+        agent_responses = [results[agent_id] for agent_id in self.agents if agent_id in results]
         
         # Filter out exceptions and failed responses  
         valid_responses = []
@@ -1340,20 +1626,57 @@ class MultiAgentFunnelService:
         # Parse and merge structured outputs for synthesis
         structured_outputs = []
         for response in valid_responses:
-            try:
-                structured_data = json.loads(response.roadmap)
+            structured_data = self._parse_agent_output(response, user_query)
+            if structured_data is not None:
                 structured_outputs.append(structured_data)
-            except json.JSONDecodeError:
-                # Fallback: Parse markdown format (### Goals, ### Topics, etc.)
-                print(f"⚠️ JSON parse failed for {response.agent_name}, trying markdown parsing...")
-                markdown_data = self._parse_markdown_roadmap(response.roadmap, user_query)
-                if markdown_data and markdown_data.get("phases"):
-                    print(f"✅ Successfully parsed markdown from {response.agent_name}")
-                    structured_outputs.append(markdown_data)
-                else:
-                    print(f"❌ Markdown parsing also failed for {response.agent_name}")
-                    continue
         
+        synthesized_plan, synthesis_confidence = self._synthesize_plan(
+            structured_outputs,
+            valid_responses,
+            best_response,
+            user_query
+        )
+        
+        # Create final output optimized for frontend node display
+        final_result = self._format_for_frontend_nodes(
+            synthesized_plan, 
+            valid_responses, 
+            session_id, 
+            synthesis_confidence
+        )
+        
+        # Log completion
+        self._log_session_complete(final_result)
+        self._remember_roadmap(user_query, user_background, "synthesized", final_result, session_id)
+        
+        for phase_event in self._phase_events(final_result):
+            yield "phase", phase_event
+        
+        print(f"✅ Multi-Agent Generation Complete - Session: {session_id}")
+        yield "complete", final_result
+
+    def _parse_agent_output(self, response: AgentResponse, user_query: str) -> Optional[Dict[str, Any]]:
+        """Parse an agent's JSON output, falling back to its markdown structure."""
+        parsed = self._parse_agent_json(response.roadmap)
+        if parsed is not None:
+            return parsed
+        # Fallback: Parse markdown format (### Goals, ### Topics, etc.)
+        print(f"⚠️ JSON parse failed for {response.agent_name}, trying markdown parsing...")
+        markdown_data = self._parse_markdown_roadmap(response.roadmap, user_query)
+        if markdown_data and markdown_data.get("phases"):
+            print(f"✅ Successfully parsed markdown from {response.agent_name}")
+            return markdown_data
+        print(f"❌ Markdown parsing also failed for {response.agent_name}")
+        return None
+
+    def _synthesize_plan(
+        self,
+        structured_outputs: List[Dict[str, Any]],
+        valid_responses: List[AgentResponse],
+        best_response: AgentResponse,
+        user_query: str
+    ) -> Tuple[Dict[str, Any], float]:
+        """Pick the meaningful agent outputs and synthesize them into one plan with a confidence."""
         # Check if structured outputs have meaningful content (not generic)
         meaningful_outputs = []
         for output in structured_outputs:
@@ -1416,19 +1739,54 @@ class MultiAgentFunnelService:
             }
             synthesis_confidence = 0.5
         
-        # Create final output optimized for frontend node display
-        final_result = self._format_for_frontend_nodes(
-            synthesized_plan, 
-            valid_responses, 
-            session_id, 
-            synthesis_confidence
-        )
-        
-        # Log completion
-        self._log_session_complete(final_result)
+        return synthesized_plan, synthesis_confidence
+
+    @staticmethod
+    def _phase_events(final_result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Per-phase stream payloads for a formatted roadmap result."""
+        phases = final_result.get("metadata", {}).get("structured_plan", {}).get("phases", [])
+        return [{"index": i, "total_phases": len(phases), "phase": phase} for i, phase in enumerate(phases)]
+
+    def _serve_cached_roadmap(
+        self,
+        user_query: str,
+        user_background: Optional[Dict[str, Any]],
+        namespace: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return a stored roadmap for a near-duplicate request, or None on a miss.
+        The hit is logged as its own session so the funneling report records it.
+        """
+        if self.roadmap_cache is None:
+            return None
+        cache_hit = self.roadmap_cache.lookup(user_query, user_background, versioned_namespace(namespace))
+        if cache_hit is None:
+            return None
         
-        print(f"✅ Multi-Agent Generation Complete - Session: {session_id}")
-        return final_result
+        print(f"♻️ Roadmap cache hit ({cache_hit['similarity']:.2f}) - matched '{cache_hit['matched_query']}'")
+        result = cache_hit["result"]
+        session_id = self._start_new_session(user_query, user_background)
+        self._log_cache_hit(cache_hit)
+        self._log_session_complete(result)
+        
+        result.setdefault("metadata", {})["session_id"] = session_id
+        result["metadata"]["cache_hit"] = True
+        if "session_id" in result:
+            result["session_id"] = session_id
+        result["funneling_report"] = self.generate_funneling_report(session_id)
+        return result
+
+    def _remember_roadmap(
+        self,
+        user_query: str,
+        user_background: Optional[Dict[str, Any]],
+        namespace: str,
+        result: Dict[str, Any],
+        session_id: Optional[str]
+    ):
+        """Store a freshly generated roadmap for near-duplicate reuse."""
+        if self.roadmap_cache is not None:
+            self.roadmap_cache.store(user_query, user_background, result, versioned_namespace(namespace), session_id)
 
     def _synthesize_multi_agent_outputs(self, structured_outputs: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -2022,20 +2380,10 @@ class MultiAgentFunnelService:
             return self._create_fallback_result()
         
         # Convert phases to node-optimized format
-        node_phases = []
-        for i, phase in enumerate(synthesized_plan.get("phases", [])):
-            node_phase = {
-                "phase": phase.get("name", f"Phase {i+1}"),
-                "duration": f"{phase.get('duration_weeks', 4)} weeks",
-                "topics": phase.get("topics", [])[:5],  # Perfect for node cards
-                "projects": phase.get("projects", [])[:3],
-                "tools": phase.get("tools", [])[:4],
-                "goals": phase.get("goals", [])[:4],
-                "node_summary": phase.get("node_summary", f"Learning Phase {i+1}"),
-                "expandable_content": phase.get("expandable_content", {}),
-                "resources": phase.get("resources", [])[:3]
-            }
-            node_phases.append(node_phase)
+        node_phases = [
+            self._format_node_phase(phase, i)
+            for i, phase in enumerate(synthesized_plan.get("phases", []))
+        ]
         
         # Create comprehensive metadata
         metadata = {
@@ -2078,6 +2426,21 @@ class MultiAgentFunnelService:
             "synthesis_success": True
         }
 
+    @staticmethod
+    def _format_node_phase(phase: Dict[str, Any], index: int) -> Dict[str, Any]:
+        """Convert one plan phase to the node card format the frontend renders."""
+        return {
+            "phase": phase.get("name", f"Phase {index+1}"),
+            "duration": f"{phase.get('duration_weeks', 4)} weeks",
+            "topics": phase.get("topics", [])[:5],  # Perfect for node cards
+            "projects": phase.get("projects", [])[:3],
+            "tools": phase.get("tools", [])[:4],
+            "goals": phase.get("goals", [])[:4],
+            "node_summary": phase.get("node_summary", f"Learning Phase {index+1}"),
+            "expandable_content": phase.get("expandable_content", {}),
+            "resources": phase.get("resources", [])[:3]
+        }
+
     def _generate_readable_roadmap(self, synthesized_plan: Dict[str, Any]) -> str:
         """
         Generate human-readable markdown roadmap for display compatibility
@@ -2145,9 +2508,17 @@ class MultiAgentFunnelService:
     async def generate_funneled_roadmap(
         self, 
         user_query: str,
-        user_background: Optional[Dict[str, Any]] = None
+        user_background: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
-        """QUICK FIX - Use simplified single agent approach"""
+        """
+        QUICK FIX - Use simplified single agent approach.
+        use_cache=False always regenerates (the fresh result still replaces the cached one).
+        """
+        cached_result = self._serve_cached_roadmap(user_query, user_background, "funneled") if use_cache else None
+        if cached_result is not None:
+            return cached_result
+        
         # IMMEDIATE FIX: Use working single-agent approach instead of broken multi-agent
         try:
             session_id = str(__import__('uuid').uuid4())[:8]
@@ -2194,7 +2565,7 @@ CRITICAL FORMATTING RULES:
             
             if raw_response and len(raw_response) > 200:
                 print(f"✅ FIXED: Generated {len(raw_response)} chars")
-                return {
+                result = {
                     "final_roadmap": raw_response,
                     "agent_insights": [{
                         "agent_name": "Technical Expert",
@@ -2216,6 +2587,8 @@ CRITICAL FORMATTING RULES:
                         "agent_performance": {"total_agents": 1, "successful_agents": 1}
                     }
                 }
+                self._remember_roadmap(user_query, user_background, "funneled", result, session_id)
+                return result
         except Exception as e:
             print(f"❌ FIXED version error: {e}")
         
@@ -2231,63 +2604,26 @@ CRITICAL FORMATTING RULES:
         print(f"🔍 Current funneling_logs length: {len(GLOBAL_FUNNELING_LOGS)}")
         print(f"📝 Session started with ID: {session_id}")
         
-        # OPTIMIZED: Run agents in parallel with smart early completion
-        tasks = [
-            self.generate_roadmap_with_agent(config, user_query, user_background, agent_id)
+        # Run agents in parallel; stop once the quorum policy is met and cancel the stragglers
+        tasks = {
+            asyncio.ensure_future(self.generate_roadmap_with_agent(config, user_query, user_background, agent_id)): agent_id
             for agent_id, config in self.agents.items()
-        ]
-        
-        # Smart timeout strategy: Return as soon as we have good results
+        }
+        quorum = QuorumWait(tasks, self.quorum_policy, lambda response: response.confidence_score)
         agent_responses = []
         try:
-            # Wait for all agents with reduced timeout for speed
-            done, pending = await asyncio.wait(
-                tasks, 
-                timeout=25.0,  # Reduced from 45s to 25s for speed
-                return_when=asyncio.FIRST_COMPLETED  # Return as soon as first agent completes
-            )
-            
-            # Collect completed results
-            for task in done:
-                try:
-                    result = await task
-                    if isinstance(result, AgentResponse):
-                        agent_responses.append(result)
-                except Exception as e:
-                    print(f"Task error: {e}")
-            
-            # If we have at least one good result, continue with that
-            good_results = [r for r in agent_responses if r.confidence_score > 0.3]
-            if good_results:
-                print(f"🚀 Early completion with {len(good_results)} quality results")
-                # Cancel remaining tasks to save time
-                for task in pending:
-                    task.cancel()
-            else:
-                # Wait a bit more for remaining tasks if no good results yet
-                print("⏳ No quality results yet, waiting for remaining agents...")
-                timeout_remaining = max(15.0, 25.0 - 10.0)  # Max 15s more
-                done2, pending2 = await asyncio.wait(
-                    pending, 
-                    timeout=timeout_remaining,
-                    return_when=asyncio.ALL_COMPLETED
-                )
-                
-                for task in done2:
-                    try:
-                        result = await task
-                        if isinstance(result, AgentResponse):
-                            agent_responses.append(result)
-                    except Exception as e:
-                        print(f"Task error: {e}")
-                
-                # Cancel any remaining tasks
-                for task in pending2:
+            async for agent_id, result in quorum.results():
+                if isinstance(result, AgentResponse):
+                    agent_responses.append(result)
+                else:
+                    print(f"Task error: {result}")
+        finally:
+            for task in tasks:
+                if not task.done():
                     task.cancel()
-                    
-        except Exception as e:
-            print(f"⚠️ Agent execution error: {e}")
-            agent_responses = []
+        self._log_quorum(quorum)
+        if quorum.cut_off:
+            print(f"🚀 Early completion ({quorum.reason}) - cut off {', '.join(quorum.cut_off)}")
         
         print(f"✅ Received {len(agent_responses)} agent responses")
         for response in agent_responses:
@@ -2296,11 +2632,10 @@ CRITICAL FORMATTING RULES:
         # Build structured list and merged plan
         structured_list: List[Dict[str, Any]] = []
         for r in agent_responses:
-            try:
-                if r.confidence_score > 0 and r.roadmap:
-                    structured_list.append(json.loads(r.roadmap))
-            except Exception:
-                continue
+            if r.confidence_score > 0 and r.roadmap:
+                parsed = self._parse_agent_json(r.roadmap)
+                if parsed:
+                    structured_list.append(parsed)
         merged_plan: Optional[Dict[str, Any]] = self._merge_structured_outputs(structured_list) if structured_list else None
 
         # Log funneling process
@@ -2392,6 +2727,8 @@ CRITICAL FORMATTING RULES:
         print(f"📊 Session ID: {session_id}")
         print(f"✅ Returning complete result with guaranteed funneling report")
         
+        if merged_plan:
+            self._remember_roadmap(user_query, user_background, "funneled", final_result, session_id)
         return final_result
 
 
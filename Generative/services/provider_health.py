@@ -0,0 +1,194 @@
+"""
+Provider health tracking for LLM calls
+Per-provider circuit breakers, rolling error rates and EWMA latencies used to route around degraded providers
+"""
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from config.settings import settings
+
+
+class ProviderHealth:
+    """Circuit breaker and latency statistics for a single provider"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        error_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        min_samples: int = 5,
+        cooldown_seconds: float = 30.0,
+        max_cooldown_seconds: float = 300.0,
+        ewma_alpha: float = 0.3,
+        latency_samples: int = 200,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_samples = min_samples
+        self.base_cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self.ewma_alpha = ewma_alpha
+
+        self.state = self.CLOSED
+        self.outcomes: Deque[bool] = deque(maxlen=window_size)
+        self.ewma_latency: Optional[float] = None
+        self.latencies: Deque[float] = deque(maxlen=latency_samples)
+        self.consecutive_failures = 0
+        self.total_calls = 0
+        self.total_failures = 0
+        self.opened_at = 0.0
+        self.cooldown_seconds = cooldown_seconds
+        self.probe_in_flight = False
+        self.last_error: Optional[str] = None
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def latency_percentile(self, q: float, min_samples: int = 5) -> Optional[float]:
+        """Observed latency at quantile `q` (0-1), or None until enough samples exist."""
+        if len(self.latencies) < min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+        return ordered[index]
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; an expired open circuit admits one half-open probe."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown_seconds:
+            self.state = self.HALF_OPEN
+            self.probe_in_flight = False
+        if self.state == self.HALF_OPEN and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self, latency: float):
+        self._observe_latency(latency)
+        self.outcomes.append(True)
+        self.total_calls += 1
+        self.consecutive_failures = 0
+        if self.state != self.CLOSED:
+            print(f"🟢 Circuit closed for {self.name}")
+        self.state = self.CLOSED
+        self.cooldown_seconds = self.base_cooldown_seconds
+        self.probe_in_flight = False
+
+    def record_failure(self, latency: float, error: str = ""):
+        self._observe_latency(latency)
+        self.outcomes.append(False)
+        self.total_calls += 1
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        self.last_error = error[:200] if error else None
+
+        if self.state == self.HALF_OPEN:
+            # Failed probe: stay open and back off further
+            self.cooldown_seconds = min(self.cooldown_seconds * 2, self.max_cooldown_seconds)
+            self._open()
+        elif self.state == self.CLOSED and (
+            self.consecutive_failures >= self.failure_threshold
+            or (len(self.outcomes) >= self.min_samples and self.error_rate >= self.error_rate_threshold)
+        ):
+            self._open()
+
+    def release_probe(self):
+        """Free the half-open probe slot when a call ends without an outcome (e.g. cancelled)."""
+        self.probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        retry_in = 0.0
+        if self.state == self.OPEN:
+            retry_in = max(0.0, self.cooldown_seconds - (time.monotonic() - self.opened_at))
+        p95 = self.latency_percentile(0.95)
+        return {
+            "state": self.state,
+            "error_rate": round(self.error_rate, 3),
+            "ewma_latency_ms": round(self.ewma_latency * 1000, 1) if self.ewma_latency is not None else None,
+            "p95_latency_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "consecutive_failures": self.consecutive_failures,
+            "total_calls": self.total_calls,
+            "total_failures": self.total_failures,
+            "retry_in_seconds": round(retry_in, 1),
+            "last_error": self.last_error,
+        }
+
+    def _observe_latency(self, latency: float):
+        self.latencies.append(latency)
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency = self.ewma_alpha * latency + (1 - self.ewma_alpha) * self.ewma_latency
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.probe_in_flight = False
+        print(f"🔴 Circuit opened for {self.name} (error rate {self.error_rate:.0%}, retry in {self.cooldown_seconds:.0f}s)")
+
+
+class ProviderHealthRegistry:
+    """Health state for every provider, keyed by provider name"""
+
+    def __init__(self, **breaker_options):
+        self.breaker_options = breaker_options
+        self._providers: Dict[str, ProviderHealth] = {}
+
+    def get(self, name: str) -> ProviderHealth:
+        health = self._providers.get(name)
+        if health is None:
+            health = ProviderHealth(name, **self.breaker_options)
+            self._providers[name] = health
+        return health
+
+    def allow(self, name: str) -> bool:
+        return self.get(name).allow()
+
+    def record_success(self, name: str, latency: float):
+        self.get(name).record_success(latency)
+
+    def record_failure(self, name: str, latency: float, error: str = ""):
+        self.get(name).record_failure(latency, error)
+
+    def release(self, name: str):
+        self.get(name).release_probe()
+
+    def order(self, names: Iterable[str]) -> List[str]:
+        """
+        Order providers for a fallback chain: closed circuits by EWMA latency first,
+        then half-open/open ones. Providers without data keep their given priority
+        ahead of measured ones so they get sampled.
+        """
+        names = list(names)
+
+        def sort_key(item):
+            index, name = item
+            health = self._providers.get(name)
+            if health is None:
+                return (0, 0.0, index)
+            rank = 0 if health.state == ProviderHealth.CLOSED else 1
+            return (rank, health.ewma_latency or 0.0, index)
+
+        return [name for _, name in sorted(enumerate(names), key=sort_key)]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: health.snapshot() for name, health in sorted(self._providers.items())}
+
+
+# Global registry instance
+provider_health = ProviderHealthRegistry(
+    failure_threshold=settings.PROVIDER_BREAKER_FAILURE_THRESHOLD,
+    cooldown_seconds=settings.PROVIDER_BREAKER_COOLDOWN_SECONDS,
+)
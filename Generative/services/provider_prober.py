@@ -0,0 +1,139 @@
+"""
+Background provider availability probing
+Checks reachability of optional providers on an interval and publishes the result to a shared registry, so request paths only read cached flags
+"""
+
+import asyncio
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from config.settings import settings
+from services.http_client import get_http_client
+
+OLLAMA_TAGS_URL = "http://localhost:11434/api/tags"
+
+
+class ProviderAvailabilityRegistry:
+    """
+    Last known availability per probed provider.
+
+    Services attach their `fallback_apis` dict; every published result is copied
+    into each attached dict, so lookups on the request path stay plain dict reads.
+    """
+
+    def __init__(self):
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._subscribers: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+
+    def attach(self, owner: Any, attr: str = "fallback_apis"):
+        """Keep `owner.<attr>` in sync with published availability (held weakly)."""
+        self._subscribers[owner] = attr
+        mapping = getattr(owner, attr)
+        for name, status in self._status.items():
+            mapping[name] = status["available"]
+
+    def get(self, name: str, default: bool = False) -> bool:
+        status = self._status.get(name)
+        return status["available"] if status else default
+
+    def publish(self, name: str, available: bool, latency_seconds: Optional[float] = None, error: Optional[str] = None):
+        previous = self._status.get(name)
+        if previous is None or previous["available"] != available:
+            print(f"{'✅' if available else '⚠️'} Provider '{name}' {'available' if available else 'unavailable'}")
+        self._status[name] = {
+            "available": available,
+            "checked_at": time.time(),
+            "latency_ms": round(latency_seconds * 1000, 1) if latency_seconds is not None else None,
+            "error": error,
+        }
+        for owner, attr in list(self._subscribers.items()):
+            mapping = getattr(owner, attr, None)
+            if mapping is not None:
+                mapping[name] = available
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: dict(status) for name, status in sorted(self._status.items())}
+
+
+class ProviderProber:
+    """Runs registered async probes concurrently on a fixed interval"""
+
+    def __init__(self, registry: ProviderAvailabilityRegistry, interval_seconds: float = 30.0, timeout_seconds: float = 2.0):
+        self.registry = registry
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.rounds = 0
+        self._probes: Dict[str, Callable[[], Awaitable[bool]]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, probe: Callable[[], Awaitable[bool]]):
+        self._probes[name] = probe
+
+    async def probe_once(self) -> Dict[str, bool]:
+        """Run every probe once and publish the results."""
+        names = list(self._probes)
+        results = await asyncio.gather(*(self._probe(name) for name in names))
+        self.rounds += 1
+        return dict(zip(names, results))
+
+    async def _probe(self, name: str) -> bool:
+        started = time.monotonic()
+        try:
+            available = bool(await asyncio.wait_for(self._probes[name](), self.timeout_seconds))
+            error = None
+        except asyncio.TimeoutError:
+            available, error = False, f"no response within {self.timeout_seconds:.0f}s"
+        except Exception as e:
+            available, error = False, f"{type(e).__name__}: {e}"
+        self.registry.publish(name, available, time.monotonic() - started, error)
+        return available
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start probing in the background; the first round runs immediately."""
+        if self.running or not self._probes:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.probe_once()
+            except Exception as e:
+                print(f"⚠️ Provider probe round failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+
+async def probe_ollama() -> bool:
+    """Ollama is usable when its local daemon lists models."""
+    try:
+        response = await get_http_client().get(OLLAMA_TAGS_URL, timeout=settings.PROVIDER_PROBE_TIMEOUT_SECONDS)
+    except httpx.HTTPError:
+        return False
+    return response.status_code == 200
+
+
+# Global registry and prober (started from the application lifespan)
+provider_availability = ProviderAvailabilityRegistry()
+provider_prober = ProviderProber(
+    provider_availability,
+    interval_seconds=settings.PROVIDER_PROBE_INTERVAL_SECONDS,
+    timeout_seconds=settings.PROVIDER_PROBE_TIMEOUT_SECONDS,
+)
+provider_prober.register("ollama", probe_ollama)
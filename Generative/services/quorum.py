@@ -0,0 +1,107 @@
+"""
+Quorum-based early completion for fan-out agent calls
+Stop waiting once enough agents have answered well (or a deadline passes) and cancel the stragglers
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class QuorumPolicy:
+    """
+    Rules of the form (count, min_confidence): the quorum is met as soon as any
+    rule has `count` completed agents at or above `min_confidence`.
+    """
+
+    def __init__(self, rules: Sequence[Tuple[int, float]] = ((2, 0.5), (1, 0.8)), deadline_seconds: float = 45.0):
+        self.rules = [(int(count), float(threshold)) for count, threshold in rules]
+        self.deadline_seconds = deadline_seconds
+
+    @classmethod
+    def parse(cls, spec: str, deadline_seconds: float = 45.0) -> "QuorumPolicy":
+        """Build a policy from "count:confidence" pairs, e.g. "2:0.5,1:0.8"."""
+        rules = []
+        for part in (spec or "").split(","):
+            part = part.strip()
+            if not part:
+                continue
+            count, _, threshold = part.partition(":")
+            rules.append((int(count), float(threshold or 0.0)))
+        return cls(rules, deadline_seconds)
+
+    def met_by(self, confidences: Iterable[float]) -> Optional[str]:
+        """Describe the first satisfied rule, or None."""
+        confidences = list(confidences)
+        for count, threshold in self.rules:
+            if sum(1 for c in confidences if c >= threshold) >= count:
+                return f"{count} agent{'s' if count != 1 else ''} at or above {threshold:g} confidence"
+        return None
+
+
+class QuorumWait:
+    """
+    Yields (name, result) as tasks finish until the policy is met, the deadline
+    passes or everything completes; whatever is still running is then cancelled
+    and recorded in `cut_off` with the reason.
+    """
+
+    def __init__(self, tasks: Dict["asyncio.Future[Any]", str], policy: QuorumPolicy, confidence: Callable[[Any], float]):
+        self.tasks = tasks
+        self.policy = policy
+        self.confidence = confidence
+        self.reason: Optional[str] = None  # quorum | deadline | all_completed
+        self.rule: Optional[str] = None
+        self.completed: List[str] = []
+        self.cut_off: Dict[str, str] = {}
+        self.elapsed_seconds = 0.0
+
+    async def results(self) -> AsyncIterator[Tuple[str, Any]]:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.policy.deadline_seconds
+        confidences: List[float] = []
+        pending = set(self.tasks)
+        try:
+            while pending:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    self.reason = "deadline"
+                    break
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = e
+                    name = self.tasks[task]
+                    self.completed.append(name)
+                    confidences.append(0.0 if isinstance(result, Exception) else self.confidence(result))
+                    yield name, result
+                if pending:
+                    rule = self.policy.met_by(confidences)
+                    if rule:
+                        self.reason, self.rule = "quorum", rule
+                        break
+            else:
+                self.reason = "all_completed"
+        finally:
+            self.elapsed_seconds = loop.time() - started
+            if pending:
+                why = {
+                    "quorum": f"quorum met ({self.rule})",
+                    "deadline": f"deadline of {self.policy.deadline_seconds:g}s reached",
+                }.get(self.reason, "caller stopped waiting")
+                for task in pending:
+                    task.cancel()
+                    self.cut_off[self.tasks[task]] = why
+                # Let cancelled agents unwind before synthesis starts
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "reason": self.reason,
+            "rule": self.rule,
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+            "completed_agents": list(self.completed),
+            "cut_off_agents": dict(self.cut_off),
+        }
@@ -0,0 +1,297 @@
+"""
+Client-side rate limiting for LLM providers
+Token buckets per (provider, model) for requests/min and tokens/min, a bounded FIFO wait queue and Retry-After handling
+"""
+
+import asyncio
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from config.settings import settings
+
+T = TypeVar("T")
+
+# Published free-tier limits as (requests/min, tokens/min); unknown models use the settings defaults
+MODEL_LIMITS: Dict[Tuple[str, str], Tuple[int, int]] = {
+    ("groq", "llama-3.3-70b-versatile"): (30, 12000),
+    ("groq", "llama-3.1-8b-instant"): (30, 6000),
+    ("groq", "mixtral-8x7b-32768"): (30, 5000),
+    ("gemini", "gemini-2.0-flash"): (15, 1000000),
+    ("gemini", "gemini-2.0-flash-exp"): (10, 1000000),
+    ("gemini", "gemini-1.5-flash"): (15, 1000000),
+}
+
+_TRY_AGAIN_PATTERN = re.compile(r"try again in (?:(\d+)m)?([\d.]+)s", re.IGNORECASE)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call cannot be admitted within the queue and wait bounds"""
+
+    def __init__(self, key: str, reason: str, wait_seconds: float = 0.0):
+        super().__init__(f"{key}: {reason}")
+        self.key = key
+        self.reason = reason
+        self.wait_seconds = wait_seconds
+
+
+def estimate_tokens(prompt: str, max_tokens: int = 0) -> int:
+    """Rough token count (~4 chars/token) for the prompt plus the completion budget."""
+    return max(1, len(prompt) // 4) + max(0, max_tokens)
+
+
+def reservation_tokens(prompt: str, max_tokens: int, completion_reserve: int) -> int:
+    """
+    Tokens to hold while a call is in flight: the prompt plus an expected completion.
+    Reserving the full `max_tokens` ceiling would admit a fraction of what the provider
+    serves; the difference is settled from actual usage once the call returns.
+    """
+    completion = min(max_tokens, completion_reserve) if max_tokens > 0 else completion_reserve
+    return estimate_tokens(prompt, max(0, completion))
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    if getattr(error, "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return "429" in message or "rate_limit" in message or "rate limit" in message or "resource exhausted" in message
+
+
+def retry_after_from(error: BaseException) -> Optional[float]:
+    """Seconds to back off, from a ProviderError, an SDK response's Retry-After header or the error text."""
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        return float(retry_after)
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        try:
+            return max(0.0, float(headers.get("retry-after")))
+        except (TypeError, ValueError):
+            pass
+    match = _TRY_AGAIN_PATTERN.search(str(error))
+    if match:
+        return int(match.group(1) or 0) * 60 + float(match.group(2))
+    return None
+
+
+class TokenBucket:
+    """Continuously refilling bucket holding up to `capacity` units per `period` seconds"""
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.refill_per_second = self.capacity / period
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def time_until(self, amount: float, now: float) -> float:
+        """Seconds until `amount` units are available (requests above capacity wait for a full bucket)."""
+        self._refill(now)
+        deficit = min(amount, self.capacity) - self.tokens
+        return max(0.0, deficit / self.refill_per_second)
+
+    def consume(self, amount: float, now: float):
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float):
+        """Give back (positive) or charge (negative) units once actual usage is known."""
+        self.tokens = min(self.capacity, self.tokens + delta)
+
+    def drain(self, now: float):
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+
+
+class ModelRateLimiter:
+    """Request and token buckets for one (provider, model) with a FIFO queue of waiting callers"""
+
+    def __init__(self, key: str, rpm: int, tpm: int, max_queue: int = 20, max_wait_seconds: float = 15.0):
+        self.key = key
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.blocked_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.queue_depth = 0
+        self.peak_queue_depth = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.throttled = 0
+        self.total_wait_seconds = 0.0
+        self.max_observed_wait_seconds = 0.0
+
+    async def acquire(self, tokens: int) -> float:
+        """Wait for capacity in arrival order; returns the seconds spent queued."""
+        if self.queue_depth >= self.max_queue:
+            self.rejected += 1
+            raise RateLimitExceeded(self.key, f"wait queue full ({self.queue_depth} callers)")
+
+        started = time.monotonic()
+        self.queue_depth += 1
+        self.peak_queue_depth = max(self.peak_queue_depth, self.queue_depth)
+        try:
+            # asyncio.Lock wakes waiters in FIFO order, so the queue is fair
+            async with self._queue_lock():
+                while True:
+                    now = time.monotonic()
+                    wait = max(
+                        self.blocked_until - now,
+                        self.requests.time_until(1, now),
+                        self.tokens.time_until(tokens, now),
+                    )
+                    if wait <= 0:
+                        self.requests.consume(1, now)
+                        self.tokens.consume(tokens, now)
+                        break
+                    if now - started + wait > self.max_wait_seconds:
+                        self.rejected += 1
+                        raise RateLimitExceeded(self.key, f"capacity not available within {self.max_wait_seconds:.0f}s", wait)
+                    await asyncio.sleep(wait)
+        finally:
+            self.queue_depth -= 1
+
+        waited = time.monotonic() - started
+        self.admitted += 1
+        self.total_wait_seconds += waited
+        self.max_observed_wait_seconds = max(self.max_observed_wait_seconds, waited)
+        return waited
+
+    def _queue_lock(self) -> asyncio.Lock:
+        # Locks are bound to the loop they first block on
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def settle(self, reserved: int, actual: int):
+        """Correct the token bucket once the real usage of an admitted call is known."""
+        self.tokens.adjust(reserved - actual)
+
+    def penalize(self, retry_after: Optional[float]):
+        """Back off after the provider rejected a call with 429."""
+        self.throttled += 1
+        now = time.monotonic()
+        self.requests.drain(now)
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rpm_limit": int(self.requests.capacity),
+            "tpm_limit": int(self.tokens.capacity),
+            "queue_depth": self.queue_depth,
+            "peak_queue_depth": self.peak_queue_depth,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "throttled_by_provider": self.throttled,
+            "avg_wait_ms": round(self.total_wait_seconds / self.admitted * 1000, 1) if self.admitted else 0.0,
+            "max_wait_ms": round(self.max_observed_wait_seconds * 1000, 1),
+            "blocked_for_seconds": round(max(0.0, self.blocked_until - time.monotonic()), 1),
+        }
+
+
+class ProviderRateLimiter:
+    """Per-(provider, model) limiters, created on first use"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        default_rpm: int = 30,
+        default_tpm: int = 30000,
+        max_queue: int = 20,
+        max_wait_seconds: float = 15.0,
+        default_retry_after_seconds: float = 2.0,
+        completion_reserve_tokens: int = 1024,
+    ):
+        self.enabled = enabled
+        self.default_rpm = default_rpm
+        self.default_tpm = default_tpm
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.default_retry_after_seconds = default_retry_after_seconds
+        self.completion_reserve_tokens = completion_reserve_tokens
+        self._limiters: Dict[str, ModelRateLimiter] = {}
+
+    def limiter(self, provider: str, model: str) -> ModelRateLimiter:
+        key = f"{provider}/{model}"
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            rpm, tpm = MODEL_LIMITS.get((provider, model), (self.default_rpm, self.default_tpm))
+            limiter = ModelRateLimiter(key, rpm, tpm, self.max_queue, self.max_wait_seconds)
+            self._limiters[key] = limiter
+        return limiter
+
+    async def call(
+        self,
+        provider: str,
+        model: str,
+        prompt: str,
+        max_tokens: int,
+        fn: Callable[[], Awaitable[T]],
+        retries: int = 1,
+        usage: Optional[Callable[[T], Optional[int]]] = None,
+    ) -> T:
+        """
+        Run `fn` once capacity is available. A provider 429 blocks the bucket for its
+        Retry-After and the call re-queues (up to `retries` times) instead of failing.
+        The reservation is settled against `usage(result)` (the provider-reported total
+        tokens) when given, otherwise against an estimate from the prompt and text result.
+        """
+        if not self.enabled:
+            return await fn()
+
+        limiter = self.limiter(provider, model)
+        reserved = reservation_tokens(prompt, max_tokens, self.completion_reserve_tokens)
+        for attempt in range(retries + 1):
+            waited = await limiter.acquire(reserved)
+            if waited >= 0.5:
+                print(f"⏳ {limiter.key} queued {waited:.1f}s for rate limit capacity")
+            try:
+                result = await fn()
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    limiter.settle(reserved, estimate_tokens(prompt))
+                    raise
+                # A rejected call used no tokens; hold the bucket for the provider's Retry-After
+                limiter.settle(reserved, 0)
+                limiter.penalize(retry_after_from(e) or self.default_retry_after_seconds)
+                if attempt == retries:
+                    raise
+                print(f"⚠️ {limiter.key} rate limited by provider - re-queueing (attempt {attempt + 2})")
+                continue
+            limiter.settle(reserved, self._actual_tokens(prompt, result, usage))
+            return result
+
+    @staticmethod
+    def _actual_tokens(prompt: str, result: Any, usage: Optional[Callable[[Any], Optional[int]]]) -> int:
+        if usage is not None:
+            try:
+                reported = usage(result)
+            except Exception:
+                reported = None
+            if reported:
+                return int(reported)
+        return estimate_tokens(prompt + (result if isinstance(result, str) else ""))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {key: limiter.stats() for key, limiter in sorted(self._limiters.items())}
+
+
+# Global limiter instance
+rate_limiter = ProviderRateLimiter(
+    enabled=settings.RATE_LIMIT_ENABLED,
+    default_rpm=settings.RATE_LIMIT_DEFAULT_RPM,
+    default_tpm=settings.RATE_LIMIT_DEFAULT_TPM,
+    max_queue=settings.RATE_LIMIT_MAX_QUEUE,
+    max_wait_seconds=settings.RATE_LIMIT_MAX_WAIT_SECONDS,
+    completion_reserve_tokens=settings.RATE_LIMIT_COMPLETION_RESERVE_TOKENS,
+)
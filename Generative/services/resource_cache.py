@@ -0,0 +1,155 @@
+"""
+Cache in front of resource search
+Normalized (topic, type, level, limit) keys over the memory/SQLite tiered cache, with per-type TTLs,
+stale-while-revalidate refresh and short-lived negative entries for searches that found nothing real
+"""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from config.settings import settings
+from services.response_cache import MemoryCacheTier, SQLiteCacheTier, TieredCache
+from services.single_flight import SingleFlight, canonical_key
+
+Fetch = Callable[[], Awaitable[List[Dict[str, Any]]]]
+
+
+def parse_ttls(spec: str) -> Dict[str, float]:
+    """Per-type TTLs from "type:seconds" pairs, e.g. "youtube:21600,books:2592000"."""
+    ttls = {}
+    for part in (spec or "").split(","):
+        resource_type, _, seconds = part.strip().partition(":")
+        if resource_type and seconds:
+            ttls[resource_type.strip()] = float(seconds)
+    return ttls
+
+
+def resource_cache_key(topic: str, resource_type: str, level: Optional[str], limit: int) -> str:
+    return canonical_key("resources", topic, resource_type, level or "intermediate", int(limit))
+
+
+class ResourceSearchCache:
+    """
+    Entries stay fresh for their type's TTL and are then served stale for up to
+    `stale_seconds` while one background task refreshes them. Results without a
+    single verified resource are cached for `negative_ttl_seconds` only, so a
+    failing API is not hammered but recovers quickly. Concurrent misses for the
+    same key share one fetch.
+    """
+
+    def __init__(
+        self,
+        cache: TieredCache,
+        ttls: Dict[str, float],
+        default_ttl_seconds: float = 86400.0,
+        stale_seconds: float = 86400.0,
+        negative_ttl_seconds: float = 300.0,
+    ):
+        self.cache = cache
+        self.ttls = ttls
+        self.default_ttl_seconds = default_ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._flights = SingleFlight("resource-search")
+        self._refreshing: Set[str] = set()
+        self._tasks: Set["asyncio.Task[Any]"] = set()
+
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def ttl_for(self, resource_type: str) -> float:
+        return self.ttls.get(resource_type, self.default_ttl_seconds)
+
+    async def get_or_fetch(self, topic: str, resource_type: str, level: Optional[str], limit: int, fetch: Fetch) -> List[Dict[str, Any]]:
+        key = resource_cache_key(topic, resource_type, level, limit)
+        record = await self.cache.aget(key)
+        if record is not None:
+            if time.time() < record["fresh_until"]:
+                if record["negative"]:
+                    self.negative_hits += 1
+                else:
+                    self.fresh_hits += 1
+                return record["results"]
+            # Stale: answer now, refresh once in the background
+            self.stale_hits += 1
+            self._revalidate(key, resource_type, fetch)
+            return record["results"]
+
+        self.misses += 1
+        return await self._flights.do(key, lambda: self._fetch_and_store(key, resource_type, fetch))
+
+    async def _fetch_and_store(self, key: str, resource_type: str, fetch: Fetch, replace_positive: bool = True) -> List[Dict[str, Any]]:
+        results = await fetch()
+        negative = not any(r.get("verified") for r in results)
+        if negative and not replace_positive:
+            # e.g. the API is down or out of quota: keep serving the stale real results
+            raise ValueError("refresh found no verified resources; keeping the stale entry")
+        fresh_seconds = self.negative_ttl_seconds if negative else self.ttl_for(resource_type)
+        record = {
+            "results": results,
+            "negative": negative,
+            "fresh_until": time.time() + fresh_seconds,
+        }
+        # Negative entries are never served stale
+        await self.cache.aset(key, record, ttl_seconds=fresh_seconds if negative else fresh_seconds + self.stale_seconds)
+        return results
+
+    def _revalidate(self, key: str, resource_type: str, fetch: Fetch):
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        async def refresh():
+            try:
+                await self._fetch_and_store(key, resource_type, fetch, replace_positive=False)
+                self.refreshes += 1
+            except Exception as e:
+                self.refresh_failures += 1
+                print(f"⚠️ Background resource refresh failed: {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.fresh_hits + self.stale_hits + self.negative_hits + self.misses
+        return {
+            "enabled": True,
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": round((lookups - self.misses) / lookups, 3) if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "refreshing": len(self._refreshing),
+            "tiers": self.cache.stats(),
+        }
+
+
+def create_resource_cache() -> Optional[ResourceSearchCache]:
+    """Build the resource search cache from settings (None when disabled)."""
+    if not settings.RESOURCE_CACHE_ENABLED:
+        return None
+    return ResourceSearchCache(
+        TieredCache([
+            MemoryCacheTier(settings.RESOURCE_CACHE_MEMORY_ENTRIES),
+            SQLiteCacheTier(Path(settings.RESOURCE_CACHE_PATH), settings.RESOURCE_CACHE_DISK_ENTRIES, table="resource_cache"),
+        ]),
+        parse_ttls(settings.RESOURCE_CACHE_TTLS),
+        default_ttl_seconds=settings.RESOURCE_CACHE_DEFAULT_TTL_SECONDS,
+        stale_seconds=settings.RESOURCE_CACHE_STALE_SECONDS,
+        negative_ttl_seconds=settings.RESOURCE_CACHE_NEGATIVE_TTL_SECONDS,
+    )
+
+
+# Global cache instance
+resource_cache = create_resource_cache()
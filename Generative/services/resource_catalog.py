@@ -0,0 +1,152 @@
+"""
+Curated learning resource catalog
+Hand-picked resources live in a JSON-lines data file; the file is indexed by byte offset on first use and only
+the (topic, type) groups that are asked for are parsed, so the catalog can be edited without a code deploy
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import settings
+
+_OPTIONAL_FIELDS = ("duration", "rating", "price", "level", "thumbnail", "instructor", "students", "last_updated")
+
+
+class LearningResource:
+    """Enhanced learning resource with rich metadata"""
+    __slots__ = ("title", "url", "description", "provider", "resource_type") + _OPTIONAL_FIELDS + ("language",)
+
+    def __init__(
+        self,
+        title: str,
+        url: str,
+        description: str,
+        provider: str,
+        resource_type: str,
+        duration: Optional[str] = None,
+        rating: Optional[str] = None,
+        price: Optional[str] = None,
+        level: Optional[str] = None,
+        thumbnail: Optional[str] = None,
+        instructor: Optional[str] = None,
+        students: Optional[str] = None,
+        language: str = "English",
+        last_updated: Optional[str] = None,
+    ):
+        self.title = title
+        self.url = url
+        self.description = description
+        self.provider = provider
+        self.resource_type = resource_type
+        self.duration = duration
+        self.rating = rating
+        self.price = price
+        self.level = level
+        self.thumbnail = thumbnail
+        self.instructor = instructor
+        self.students = students
+        self.language = language
+        self.last_updated = last_updated
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "LearningResource":
+        return cls(**{field: record[field] for field in cls.__slots__ if field in record})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, LearningResource) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"LearningResource(title={self.title!r}, resource_type={self.resource_type!r}, url={self.url!r})"
+
+
+class ResourceCatalog:
+    """
+    Lazily loaded catalog. The first lookup scans the file once to map each
+    (topic, resource_type) to the byte spans of its lines; a group's records are
+    parsed on its first lookup and kept. A change to the file's size or mtime
+    drops the index so edits are picked up on the next lookup.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[float, int]] = None
+        self._checked = False
+        self._index: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+        self._groups: Dict[Tuple[str, str], List[LearningResource]] = {}
+        self.index_builds = 0
+
+    def lookup(self, topic: str, resource_type: str) -> List[LearningResource]:
+        key = (topic.lower().strip(), resource_type)
+        with self._lock:
+            self._refresh_index()
+            if key not in self._groups:
+                self._groups[key] = self._read_group(self._index.get(key, []))
+            return list(self._groups[key])
+
+    def topics(self) -> List[str]:
+        with self._lock:
+            self._refresh_index()
+            return sorted({topic for topic, _ in self._index})
+
+    def __contains__(self, topic: str) -> bool:
+        return topic.lower().strip() in self.topics()
+
+    def _refresh_index(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            signature = None
+        else:
+            signature = (stat.st_mtime, stat.st_size)
+        if self._checked and signature == self._signature:
+            return
+        self._checked = True
+        self._signature = signature
+        self._index = {}
+        self._groups = {}
+        if signature is None:
+            return
+        self.index_builds += 1
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        record = json.loads(line)
+                        key = (record["topic"].lower().strip(), record["resource_type"])
+                    except (ValueError, KeyError, AttributeError) as e:
+                        print(f"Warning: skipping bad resource catalog line at byte {offset}: {e}")
+                    else:
+                        self._index.setdefault(key, []).append((offset, len(line)))
+                offset += len(line)
+
+    def _read_group(self, spans: List[Tuple[int, int]]) -> List[LearningResource]:
+        if not spans:
+            return []
+        resources = []
+        with open(self.path, "rb") as f:
+            for offset, length in spans:
+                f.seek(offset)
+                resources.append(LearningResource.from_record(json.loads(f.read(length))))
+        return resources
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "path": self.path,
+                "indexed": self._signature is not None,
+                "records": sum(len(spans) for spans in self._index.values()),
+                "groups": len(self._index),
+                "loaded_groups": len(self._groups),
+                "index_builds": self.index_builds,
+            }
+
+
+# Global catalog instance shared by every resource service
+resource_catalog = ResourceCatalog(settings.RESOURCE_CATALOG_PATH)
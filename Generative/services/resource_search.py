@@ -0,0 +1,189 @@
+"""
+Concurrent YouTube resource search
+Fans query variants out over the shared pooled HTTP client, merges hits in relevance order and stops as soon as
+enough unique videos are in hand
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from services.http_client import get_http_client
+from services.youtube_quota import QuotaLedger
+
+YOUTUBE_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
+YOUTUBE_VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
+
+# videos.list accepts at most 50 ids per call
+YOUTUBE_VIDEOS_BATCH_SIZE = 50
+
+SearchHit = Tuple[str, Dict[str, Any]]  # (video_id, snippet)
+
+
+class YouTubeSearchEngine:
+    """
+    Runs up to `concurrency` search queries at a time, in priority order.
+    Every search.list call is billed 100 units whether or not its result is used,
+    so a query is only started while the hits already in hand plus a full page
+    from each query in flight still fall short of `limit`.
+    Results are merged as query 1's hits, then query 2's new hits, and so on
+    (the order a serial search would produce); once the completed prefix of
+    queries yields `limit` unique videos, in-flight queries are cancelled and
+    no further ones are started.
+    """
+
+    def __init__(self, api_key: Optional[str], concurrency: int = 3, ledger: Optional[QuotaLedger] = None):
+        self.api_key = api_key
+        self.concurrency = max(1, concurrency)
+        self.ledger = ledger
+        self.searches = 0
+        self.searches_cancelled = 0
+        self.searches_skipped = 0
+        self.details_calls = 0
+
+    async def search(
+        self,
+        queries: Sequence[str],
+        limit: int,
+        per_query: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> List[SearchHit]:
+        per_query = min(50, per_query or limit)
+        concurrency = max(1, concurrency or self.concurrency)
+        pages: List[Optional[List[SearchHit]]] = [None] * len(queries)
+        running: Dict["asyncio.Task[List[SearchHit]]", int] = {}
+        next_query = 0
+        merged: List[SearchHit] = []
+        try:
+            while True:
+                while (
+                    next_query < len(queries)
+                    and len(running) < concurrency
+                    and self._hits_in_hand(pages) + per_query * len(running) < limit
+                ):
+                    task = asyncio.ensure_future(self._search_query(queries[next_query], per_query))
+                    running[task] = next_query
+                    next_query += 1
+                if not running:
+                    break
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pages[running.pop(task)] = task.result()
+                merged = self._merge_completed_prefix(pages)
+                if len(merged) >= limit:
+                    break
+        finally:
+            if running:
+                for task in running:
+                    task.cancel()
+                self.searches_cancelled += len(running)
+                await asyncio.gather(*running, return_exceptions=True)
+            self.searches_skipped += len(queries) - next_query
+        return merged[:limit]
+
+    @staticmethod
+    def _hits_in_hand(pages: List[Optional[List[SearchHit]]]) -> int:
+        """Unique videos from every completed query, including ones waiting on an earlier query."""
+        return len({video_id for page in pages if page for video_id, _ in page})
+
+    @staticmethod
+    def _merge_completed_prefix(pages: List[Optional[List[SearchHit]]]) -> List[SearchHit]:
+        merged: List[SearchHit] = []
+        seen = set()
+        for page in pages:
+            if page is None:
+                break  # Later queries must not jump ahead of one still running
+            for video_id, snippet in page:
+                if video_id not in seen:
+                    seen.add(video_id)
+                    merged.append((video_id, snippet))
+        return merged
+
+    async def _search_query(self, query: str, max_results: int) -> List[SearchHit]:
+        params = {
+            'part': 'snippet',
+            'q': query,
+            'type': 'video',
+            'videoDuration': 'long',  # Prefer longer educational content
+            'maxResults': max_results,
+            'key': self.api_key,
+            'order': 'relevance',
+            'publishedAfter': '2022-01-01T00:00:00Z'  # Recent content
+        }
+        self.searches += 1
+        self._charge("search")
+        print(f"🌐 Calling YouTube API with query: '{query}'")
+        try:
+            response = await get_http_client().get(YOUTUBE_SEARCH_URL, params=params, timeout=10)
+        except Exception as e:
+            print(f"YouTube API error for '{query}': {e}")
+            return []
+        print(f"📡 YouTube API response status: {response.status_code}")
+        if response.status_code != 200:
+            self._check_quota_exceeded(response)
+            return []
+        items = response.json().get('items', [])
+        print(f"📺 YouTube API returned {len(items)} videos")
+        return [(item['id']['videoId'], item['snippet']) for item in items if item.get('id', {}).get('videoId')]
+
+    async def video_details(self, video_ids: Sequence[str]) -> Dict[str, Dict[str, str]]:
+        """Raw contentDetails.duration and statistics.viewCount by id, one call per 50 ids, batches in parallel."""
+        unique_ids = list(dict.fromkeys(video_ids))
+        batches = [
+            unique_ids[start:start + YOUTUBE_VIDEOS_BATCH_SIZE]
+            for start in range(0, len(unique_ids), YOUTUBE_VIDEOS_BATCH_SIZE)
+        ]
+        details: Dict[str, Dict[str, str]] = {}
+        for batch_details in await asyncio.gather(*(self._videos_batch(batch) for batch in batches)):
+            details.update(batch_details)
+        return details
+
+    async def _videos_batch(self, batch: List[str]) -> Dict[str, Dict[str, str]]:
+        params = {
+            'part': 'contentDetails,statistics',
+            'id': ','.join(batch),
+            'maxResults': len(batch),
+            'key': self.api_key
+        }
+        self.details_calls += 1
+        self._charge("videos")
+        try:
+            response = await get_http_client().get(YOUTUBE_VIDEOS_URL, params=params, timeout=5)
+        except Exception as e:
+            print(f"Video details error: {e}")
+            return {}
+        if response.status_code != 200:
+            print(f"Video details error: HTTP {response.status_code} for {len(batch)} videos")
+            self._check_quota_exceeded(response)
+            return {}
+        return {
+            item['id']: {
+                'duration': item.get('contentDetails', {}).get('duration', 'PT0M'),
+                'viewCount': item.get('statistics', {}).get('viewCount', '0'),
+            }
+            for item in response.json().get('items', [])
+            if item.get('id') in batch
+        }
+
+    def _charge(self, endpoint: str):
+        # YouTube bills the request whether or not it succeeds
+        if self.ledger is not None:
+            self.ledger.record(endpoint)
+
+    def _check_quota_exceeded(self, response: Any):
+        if self.ledger is None or response.status_code != 403:
+            return
+        try:
+            errors = response.json().get("error", {}).get("errors", [])
+        except ValueError:
+            return
+        if any(error.get("reason") in ("quotaExceeded", "dailyLimitExceeded") for error in errors):
+            self.ledger.mark_exhausted()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "searches": self.searches,
+            "searches_cancelled": self.searches_cancelled,
+            "searches_skipped": self.searches_skipped,
+            "details_calls": self.details_calls,
+        }
@@ -0,0 +1,331 @@
+"""
+Tiered response cache for LLM calls
+In-memory LRU in front of a SQLite disk tier, with per-entry TTL, bounded size and hit/miss counters
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import settings
+from services.executors import io_executor
+
+
+@dataclass
+class CacheEntry:
+    """A cached value with its creation and expiry times (epoch seconds)"""
+    value: Any
+    created_at: float
+    expires_at: float
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+def make_cache_key(prompt: str, model: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Stable hash of a whitespace-normalized prompt, the model and its generation parameters."""
+    normalized_prompt = re.sub(r"\s+", " ", prompt).strip()
+    material = json.dumps(
+        {"prompt": normalized_prompt, "model": model, "params": params or {}},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class CacheTier(ABC):
+    """Interface for a cache tier; values must be JSON-serializable"""
+
+    name = "tier"
+    # Tiers that touch disk are driven from the file I/O pool by TieredCache's async methods
+    blocking = False
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry):
+        ...
+
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+class MemoryCacheTier(CacheTier):
+    """Size-bounded in-process LRU"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expired:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheTier(CacheTier):
+    """Persistent tier in a single SQLite file, evicting least-recently-used rows past `max_entries`"""
+
+    name = "sqlite"
+    blocking = True
+
+    def __init__(self, path: Path, max_entries: int = 10000, table: str = "response_cache", touch_batch: int = 64):
+        self.path = Path(path)
+        self.max_entries = max(1, max_entries)
+        self.table = table
+        self.touch_batch = max(1, touch_batch)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+        # key -> last read time; written in one batch instead of an UPDATE + commit per read
+        self._touches: Dict[str, float] = {}
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened lazily so importing the module never touches disk
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, "
+                "expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_access ON {self.table}(last_access)")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                f"SELECT value, created_at, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now >= row[2]:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            self._touches[key] = now
+            if len(self._touches) >= self.touch_batch:
+                self._flush_touches_locked(conn)
+                conn.commit()
+            return CacheEntry(value=json.loads(row[0]), created_at=row[1], expires_at=row[2])
+
+    def set(self, key: str, entry: CacheEntry):
+        with self._lock:
+            conn = self._connection()
+            self._touches.pop(key, None)
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(entry.value, default=str), entry.created_at, entry.expires_at, time.time()),
+            )
+            self._writes_since_evict += 1
+            if self._writes_since_evict >= 50:
+                self._flush_touches_locked(conn)
+                self._evict_locked(conn)
+            conn.commit()
+
+    def flush(self):
+        """Write pending last-access times now (they are otherwise batched)."""
+        with self._lock:
+            if self._touches:
+                conn = self._connection()
+                self._flush_touches_locked(conn)
+                conn.commit()
+
+    def _flush_touches_locked(self, conn: sqlite3.Connection):
+        if self._touches:
+            conn.executemany(
+                f"UPDATE {self.table} SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touches.items()],
+            )
+            self._touches.clear()
+
+    def _evict_locked(self, conn: sqlite3.Connection):
+        self._writes_since_evict = 0
+        conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),))
+        conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN ("
+            f"SELECT key FROM {self.table} ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def delete(self, key: str):
+        with self._lock:
+            conn = self._connection()
+            self._touches.pop(key, None)
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            conn.commit()
+
+    def clear(self):
+        with self._lock:
+            conn = self._connection()
+            self._touches.clear()
+            conn.execute(f"DELETE FROM {self.table}")
+            conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class TieredCache:
+    """Looks tiers up fastest-first, promotes lower-tier hits and counts hits/misses"""
+
+    def __init__(self, tiers: List[CacheTier], default_ttl_seconds: float = 86400.0):
+        self.tiers = tiers
+        self.default_ttl_seconds = default_ttl_seconds
+        self.hits: Dict[str, int] = {tier.name: 0 for tier in tiers}
+        self.misses = 0
+        self.errors = 0
+
+    def _lookup(self, key: str, indexes: range) -> Optional[Tuple[int, CacheEntry]]:
+        for index in indexes:
+            tier = self.tiers[index]
+            try:
+                entry = tier.get(key)
+            except Exception as e:
+                self.errors += 1
+                print(f"Warning: {tier.name} cache read failed: {e}")
+                continue
+            if entry is not None:
+                for faster in self.tiers[:index]:
+                    faster.set(key, entry)
+                return index, entry
+        return None
+
+    def _count(self, found: Optional[Tuple[int, CacheEntry]]) -> Optional[CacheEntry]:
+        if found is None:
+            self.misses += 1
+            return None
+        self.hits[self.tiers[found[0]].name] += 1
+        return found[1]
+
+    def _split(self) -> int:
+        """Index of the first blocking tier; the tiers before it are safe to use on the event loop."""
+        return next((index for index, tier in enumerate(self.tiers) if tier.blocking), len(self.tiers))
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        return self._count(self._lookup(key, range(len(self.tiers))))
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        return entry.value if entry is not None else None
+
+    async def aget_entry(self, key: str) -> Optional[CacheEntry]:
+        """get_entry for async callers: in-memory tiers inline, disk tiers on the file I/O pool."""
+        split = self._split()
+        found = self._lookup(key, range(split))
+        if found is None and split < len(self.tiers):
+            found = await io_executor.run(self._lookup, key, range(split, len(self.tiers)))
+        return self._count(found)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        entry = await self.aget_entry(key)
+        return entry.value if entry is not None else None
+
+    def _entry(self, value: Any, ttl_seconds: Optional[float]) -> CacheEntry:
+        now = time.time()
+        ttl = self.default_ttl_seconds if ttl_seconds is None else ttl_seconds
+        return CacheEntry(value=value, created_at=now, expires_at=now + ttl)
+
+    def _store(self, key: str, entry: CacheEntry, tiers: List[CacheTier]):
+        for tier in tiers:
+            try:
+                tier.set(key, entry)
+            except Exception as e:
+                self.errors += 1
+                print(f"Warning: {tier.name} cache write failed: {e}")
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        self._store(key, self._entry(value, ttl_seconds), self.tiers)
+
+    async def aset(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        """set for async callers: in-memory tiers inline, disk tiers on the file I/O pool."""
+        entry = self._entry(value, ttl_seconds)
+        split = self._split()
+        self._store(key, entry, self.tiers[:split])
+        if split < len(self.tiers):
+            await io_executor.run(self._store, key, entry, self.tiers[split:])
+
+    def delete(self, key: str):
+        for tier in self.tiers:
+            tier.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        total_hits = sum(self.hits.values())
+        lookups = total_hits + self.misses
+        return {
+            "hits": dict(self.hits),
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(total_hits / lookups, 3) if lookups else 0.0,
+            "entries": {tier.name: len(tier) for tier in self.tiers},
+        }
+
+
+def create_response_cache() -> Optional[TieredCache]:
+    """Build the LLM response cache from settings (None when disabled)."""
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return None
+    return TieredCache(
+        [
+            MemoryCacheTier(settings.RESPONSE_CACHE_MEMORY_ENTRIES),
+            SQLiteCacheTier(Path(settings.RESPONSE_CACHE_PATH), settings.RESPONSE_CACHE_DISK_ENTRIES),
+        ],
+        default_ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+    )
+
+
+# Global cache instance
+response_cache = create_response_cache()
@@ -0,0 +1,199 @@
+"""
+Retry policy engine for provider calls
+Classifies failures, backs off with decorrelated jitter, repairs schema-invalid output and gives up as soon as the
+request deadline makes another attempt pointless
+"""
+
+import asyncio
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+
+from config.settings import settings
+from services.llm_client import ProviderError
+
+T = TypeVar("T")
+
+RATE_LIMIT = "rate_limit"
+TRANSIENT = "transient"
+SCHEMA_INVALID = "schema_invalid"
+FATAL = "fatal"
+
+
+class SchemaInvalidError(ValueError):
+    """The provider answered, but the output could not be parsed or does not match the schema"""
+
+    def __init__(self, message: str, raw_text: str = "", parsed: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.raw_text = raw_text
+        self.parsed = parsed
+
+
+def classify(error: BaseException) -> str:
+    """Map a failure to the retry class that decides how (and whether) it is retried."""
+    if isinstance(error, SchemaInvalidError):
+        return SCHEMA_INVALID
+    if isinstance(error, ProviderError):
+        if error.circuit_open:
+            return FATAL  # The breaker will not let a retry through either
+        if error.status_code == 429:
+            return RATE_LIMIT
+        if error.status_code is None or error.status_code == 408 or error.status_code >= 500:
+            return TRANSIENT  # Network errors carry no status
+        return FATAL
+    if isinstance(error, (asyncio.TimeoutError, httpx.TransportError, ConnectionError)):
+        return TRANSIENT
+    return FATAL
+
+
+class Deadline:
+    """Wall-clock budget shared by every call made for one request"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+@dataclass
+class Attempt:
+    """What the next call needs to know: its number, the previous failure and the time left"""
+    number: int
+    last_error: Optional[BaseException]
+    remaining_seconds: float
+
+    @property
+    def repair(self) -> bool:
+        return isinstance(self.last_error, SchemaInvalidError)
+
+
+class RetryPolicy:
+    """
+    Per class: fatal errors are raised at once; rate limits wait at least the
+    provider's Retry-After; transient errors back off with decorrelated jitter
+    (sleep = min(max_delay, uniform(base_delay, previous_sleep * 3))); schema-
+    invalid output is retried immediately so the caller can send a repair prompt,
+    at most `max_repairs` times. No retry is attempted when its backoff would
+    outlast the deadline.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        deadline_seconds: float = 120.0,
+        max_repairs: int = 1,
+        rng: Optional[random.Random] = None,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        self.name = name
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline_seconds = deadline_seconds
+        self.max_repairs = max_repairs
+        self._rng = rng or random.Random()
+        self._sleep = sleep
+
+        self.calls = 0
+        self.attempts = 0
+        self.succeeded = 0
+        self.failures: Dict[str, int] = defaultdict(int)
+        self.give_ups: Dict[str, int] = defaultdict(int)
+        self.backoff_seconds = 0.0
+
+    def deadline(self) -> Deadline:
+        return Deadline(self.deadline_seconds)
+
+    def next_delay(self, previous: float) -> float:
+        return min(self.max_delay, self._rng.uniform(self.base_delay, max(self.base_delay, previous * 3)))
+
+    async def run(
+        self,
+        call: Callable[[Attempt], Awaitable[T]],
+        deadline: Optional[Deadline] = None,
+        max_attempts: Optional[int] = None,
+    ) -> T:
+        """Call until success, raising the last error once retrying cannot help."""
+        deadline = deadline or self.deadline()
+        max_attempts = max_attempts or self.max_attempts
+        self.calls += 1
+        delay = self.base_delay
+        repairs = 0
+        last_error: Optional[BaseException] = None
+
+        for number in range(1, max_attempts + 1):
+            if deadline.expired:
+                self._give_up("deadline", last_error)
+                raise last_error or asyncio.TimeoutError(f"{self.name}: request deadline passed")
+            self.attempts += 1
+            try:
+                result = await call(Attempt(number, last_error, deadline.remaining()))
+            except Exception as e:
+                error_class = classify(e)
+                self.failures[error_class] += 1
+                last_error = e
+            else:
+                self.succeeded += 1
+                return result
+
+            if number == max_attempts:
+                self._give_up("attempts_exhausted", last_error)
+                raise last_error
+            if error_class == FATAL:
+                self._give_up("fatal", last_error)
+                raise last_error
+            if error_class == SCHEMA_INVALID:
+                if repairs >= self.max_repairs:
+                    self._give_up("repairs_exhausted", last_error)
+                    raise last_error
+                repairs += 1
+                continue  # The provider is healthy; retry now with a repair prompt
+
+            delay = self.next_delay(delay)
+            wait = delay
+            if error_class == RATE_LIMIT and getattr(last_error, "retry_after", None):
+                wait = max(wait, last_error.retry_after)
+            if wait >= deadline.remaining():
+                self._give_up("deadline", last_error)
+                raise last_error
+            print(f"🔁 {self.name}: {error_class} failure on attempt {number}, retrying in {wait:.2f}s")
+            self.backoff_seconds += wait
+            await self._sleep(wait)
+
+    def _give_up(self, reason: str, error: Optional[BaseException]):
+        self.give_ups[reason] += 1
+        print(f"⛔ {self.name}: giving up ({reason}): {error}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "succeeded": self.succeeded,
+            "failures": dict(self.failures),
+            "give_ups": dict(self.give_ups),
+            "backoff_seconds": round(self.backoff_seconds, 2),
+        }
+
+
+# Global policy for the structured agent pipeline
+agent_retry_policy = RetryPolicy(
+    "agent-pipeline",
+    max_attempts=settings.AGENT_RETRY_MAX_ATTEMPTS,
+    base_delay=settings.AGENT_RETRY_BASE_DELAY_SECONDS,
+    max_delay=settings.AGENT_RETRY_MAX_DELAY_SECONDS,
+    deadline_seconds=settings.AGENT_REQUEST_DEADLINE_SECONDS,
+    max_repairs=settings.AGENT_SCHEMA_REPAIRS,
+)
@@ -329,7 +329,7 @@ class RevolutionaryMultiAgentService:
             # Get detailed analysis from AI service
             ai_analysis = None
             if self.ai_service:
-                ai_analysis = self.ai_service.generate_career_analysis(
+                ai_analysis = await self.ai_service.generate_career_analysis(
                     skills=user_query,
                     expertise=experience_level
                 )
@@ -394,7 +394,7 @@ class RevolutionaryMultiAgentService:
         
         try:
             # Use AI service for sophisticated roadmap generation
-            ai_roadmap = self.ai_service.generate_personalized_roadmap(
+            ai_roadmap = await self.ai_service.generate_personalized_roadmap(
                 user_skills=user_query,
                 career_goal=user_query,
                 experience_level=user_background.get("experience_level", "Beginner")
@@ -481,7 +481,7 @@ class RevolutionaryMultiAgentService:
         
         try:
             # Generate comprehensive analysis using AI service
-            ai_analysis = self.ai_service.generate_career_analysis(
+            ai_analysis = await self.ai_service.generate_career_analysis(
                 skills=user_query,
                 expertise="Enhanced with revolutionary multi-agent system"
             )
@@ -677,7 +677,7 @@ This roadmap represents the integration of multiple AI services, real career dat
     async def _invoke_market_prophet(self, user_query: str) -> Dict[str, Any]:
         """Market Prophet: Predict industry evolution and emerging opportunities"""
         if self.ai_service:
-            prophecy = self.ai_service.generate_career_analysis(
+            prophecy = await self.ai_service.generate_career_analysis(
                 skills=f"Future market trends for {user_query}",
                 expertise="Industry Evolution Analysis"
             )
@@ -733,7 +733,7 @@ This roadmap represents the integration of multiple AI services, real career dat
     async def _architect_learning_universe(self, discovery_results: Dict[str, Any], user_query: str) -> Dict[str, Any]:
         """Pathway Architect: Design multi-dimensional learning universes"""
         if self.ai_service:
-            universe = self.ai_service.generate_personalized_roadmap(
+            universe = await self.ai_service.generate_personalized_roadmap(
                 user_skills=user_query,
                 career_goal=f"Master {user_query} across multiple dimensions",
                 experience_level="Universe Explorer"
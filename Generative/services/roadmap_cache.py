@@ -0,0 +1,241 @@
+"""
+Semantic near-duplicate cache for synthesized roadmaps
+Normalized query + background token sets, MinHash signatures and an LSH index so close paraphrases reuse a stored roadmap
+"""
+
+import copy
+import hashlib
+import random
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from config.settings import settings
+
+
+# Words that carry no information about *what* the student wants to learn
+STOPWORDS = {
+    "a", "an", "the", "i", "im", "me", "my", "we", "our", "you", "your", "to", "of", "in", "on", "for",
+    "and", "or", "with", "about", "into", "from", "at", "by", "as", "is", "am", "are", "be", "become",
+    "becoming", "want", "wanna", "would", "like", "love", "need", "learn", "study", "studying",
+    "get", "getting", "start", "started", "starting", "how", "do", "can", "could", "should", "what",
+    "scratch", "zero", "beginning", "complete", "full", "roadmap", "path", "guide", "step", "steps",
+    "please", "help", "career", "master", "mastering", "good", "best", "some", "it", "this", "that",
+}
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _normalize_token(token: str) -> str:
+    # Cheap plural folding so "roadmaps"/"roadmap" and "apis"/"api" collide
+    if len(token) > 4 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def roadmap_tokens(user_query: str, user_background: Optional[Dict[str, Any]] = None) -> FrozenSet[str]:
+    """Token set describing a roadmap request: query terms plus tagged background facets."""
+    tokens: Set[str] = set()
+    for word in re.findall(r"[a-z0-9+#.]+", (user_query or "").lower()):
+        word = word.strip(".")
+        if word and word not in STOPWORDS:
+            tokens.add(_normalize_token(word))
+
+    background = user_background or {}
+    level = str(background.get("experience_level") or "").strip().lower()
+    if level:
+        tokens.add(f"level:{level}")
+    for skill in re.split(r"[,;/]", str(background.get("current_skills") or "").lower()):
+        skill = skill.strip()
+        if skill:
+            tokens.add(f"skill:{skill}")
+    return frozenset(tokens)
+
+
+def versioned_namespace(namespace: str, version: Optional[str] = None) -> str:
+    """Cache namespace tagged with the roadmap format version; bumping the version retires old entries."""
+    return f"{namespace}@v{version or settings.ROADMAP_CACHE_VERSION}"
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """MinHash signatures over string token sets"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)]
+
+    def signature(self, tokens: FrozenSet[str]) -> Tuple[int, ...]:
+        if not tokens:
+            return tuple([_MAX_HASH] * self.num_perm)
+        hashes = [int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "big") for t in tokens]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._params
+        )
+
+
+class SemanticRoadmapCache:
+    """
+    LSH-indexed store of synthesized roadmaps.
+
+    Candidates come from banded MinHash buckets; a candidate is served only if the
+    exact token-set Jaccard similarity clears `threshold` and its namespace matches.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 64,
+        bands: int = 32,
+        max_entries: int = 500,
+        ttl_seconds: float = 7 * 86400,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hasher = MinHasher(num_perm)
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._buckets: List[Dict[Tuple[int, ...], Set[str]]] = [dict() for _ in range(bands)]
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(
+        self,
+        user_query: str,
+        user_background: Optional[Dict[str, Any]] = None,
+        namespace: str = "default",
+    ) -> Optional[Dict[str, Any]]:
+        """Return {"result", "similarity", "matched_query", "source_session_id"} for the closest match, or None."""
+        tokens = roadmap_tokens(user_query, user_background)
+        if not tokens:
+            self.misses += 1
+            return None
+
+        best_id, best_similarity = None, 0.0
+        now = time.time()
+        for entry_id in self._candidates(self.hasher.signature(tokens)):
+            entry = self._entries.get(entry_id)
+            if entry is None or entry["namespace"] != namespace:
+                continue
+            if now - entry["created_at"] > self.ttl_seconds:
+                self._remove(entry_id)
+                continue
+            similarity = jaccard(tokens, entry["tokens"])
+            if similarity >= self.threshold and similarity > best_similarity:
+                best_id, best_similarity = entry_id, similarity
+
+        if best_id is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(best_id)
+        entry = self._entries[best_id]
+        return {
+            "result": copy.deepcopy(entry["result"]),
+            "similarity": round(best_similarity, 3),
+            "matched_query": entry["query"],
+            "source_session_id": entry["session_id"],
+        }
+
+    def store(
+        self,
+        user_query: str,
+        user_background: Optional[Dict[str, Any]],
+        result: Dict[str, Any],
+        namespace: str = "default",
+        session_id: Optional[str] = None,
+        created_at: Optional[float] = None,
+    ):
+        """Index a synthesized roadmap under its request's token set (`created_at` restores snapshot ages)."""
+        tokens = roadmap_tokens(user_query, user_background)
+        if not tokens:
+            return
+        entry_id = self._entry_id(tokens, namespace)
+        if entry_id in self._entries:
+            self._remove(entry_id)
+
+        signature = self.hasher.signature(tokens)
+        self._entries[entry_id] = {
+            "namespace": namespace,
+            "query": user_query,
+            "tokens": tokens,
+            "signature": signature,
+            "result": copy.deepcopy(result),
+            "session_id": session_id,
+            "created_at": created_at or time.time(),
+        }
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, set()).add(entry_id)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def age(
+        self,
+        user_query: str,
+        user_background: Optional[Dict[str, Any]] = None,
+        namespace: str = "default",
+    ) -> Optional[float]:
+        """Seconds since this exact request was stored, or None; does not count as a lookup."""
+        entry = self._entries.get(self._entry_id(roadmap_tokens(user_query, user_background), namespace))
+        if entry is None:
+            return None
+        return time.time() - entry["created_at"]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "threshold": self.threshold,
+        }
+
+    @staticmethod
+    def _entry_id(tokens: FrozenSet[str], namespace: str) -> str:
+        return hashlib.sha1(f"{namespace}|{'|'.join(sorted(tokens))}".encode("utf-8")).hexdigest()
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield signature[band * self.rows:(band + 1) * self.rows]
+
+    def _candidates(self, signature: Tuple[int, ...]) -> Set[str]:
+        found: Set[str] = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            found |= self._buckets[band].get(key, set())
+        return found
+
+    def _remove(self, entry_id: str):
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        for band, key in enumerate(self._band_keys(entry["signature"])):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[band][key]
+
+
+# Global cache instance
+roadmap_cache = SemanticRoadmapCache(
+    threshold=settings.ROADMAP_CACHE_SIMILARITY_THRESHOLD,
+    max_entries=settings.ROADMAP_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.ROADMAP_CACHE_TTL_SECONDS,
+)
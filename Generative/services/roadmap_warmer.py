@@ -0,0 +1,245 @@
+"""
+Precomputation of popular career roadmaps
+Generates funneled roadmaps (the namespace the /multi-agent-roadmap and /api/v2/roadmap routes read) for the top
+career queries ahead of traffic, keeps them in the roadmap cache and a versioned on-disk snapshot, and refreshes
+them in the background
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config.settings import settings
+from services.roadmap_cache import SemanticRoadmapCache, roadmap_cache, versioned_namespace
+
+# Landing-page quick picks first, then the domains the agents have specialization context for
+POPULAR_CAREER_QUERIES = [
+    "software engineering",
+    "data science",
+    "ui/ux design",
+    "digital marketing",
+    "web development",
+    "artificial intelligence",
+    "cybersecurity",
+    "cloud computing",
+    "devops",
+    "mobile development",
+    "game development",
+    "blockchain development",
+    "business analysis",
+    "project management",
+    "graphic design",
+]
+
+# generate_funneled_roadmap serves the main frontend routes; /api/real-multi-agent ("synthesized") still
+# caches its own results on demand
+NAMESPACE = "funneled"
+
+
+def warm_targets(top_n: int, levels: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    (query, background) pairs for the top-N careers at each experience level.
+
+    Targets carry no current_skills. A request that sends skills adds skill:* tokens,
+    so for a two-word career query the Jaccard similarity to the warm entry drops
+    below the default 0.8 threshold (e.g. 3/4) and it is generated on demand; warm
+    entries serve the level-only requests that make up the quick-pick traffic.
+    """
+    return [
+        (query, {"experience_level": level})
+        for query in POPULAR_CAREER_QUERIES[:top_n]
+        for level in levels
+    ]
+
+
+class RoadmapWarmer:
+    """
+    Keeps precomputed roadmaps for popular requests in the cache.
+
+    `service_factory` returns the funnel service lazily so constructing the warmer
+    never builds provider clients.
+    """
+
+    def __init__(
+        self,
+        service_factory: Callable[[], Any],
+        cache: SemanticRoadmapCache,
+        targets: List[Tuple[str, Dict[str, Any]]],
+        snapshot_path: Optional[str] = None,
+        refresh_seconds: float = 86400.0,
+        concurrency: int = 1,
+        version: str = "1",
+    ):
+        self.service_factory = service_factory
+        self.cache = cache
+        self.targets = targets
+        self.snapshot_path = snapshot_path
+        self.refresh_seconds = refresh_seconds
+        self.concurrency = max(1, concurrency)
+        self.version = version
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        self.loaded = 0
+        self.generated = 0
+        self.failed = 0
+        self.last_run_at: Optional[float] = None
+        self.last_run_seconds: Optional[float] = None
+
+    @property
+    def namespace(self) -> str:
+        return versioned_namespace(NAMESPACE, self.version)
+
+    def load_snapshot(self) -> int:
+        """Seed the cache from the snapshot; entries from other cache versions are ignored."""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return 0
+        loaded = 0
+        with open(self.snapshot_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                # Records from another cache version or namespace (result shapes differ) are ignored
+                if record.get("version") != self.version or record.get("namespace") != NAMESPACE:
+                    continue
+                self.cache.store(
+                    record["query"],
+                    record["background"],
+                    record["result"],
+                    self.namespace,
+                    record.get("session_id"),
+                    created_at=record.get("created_at"),
+                )
+                self._records[self._record_key(record["query"], record["background"])] = record
+                loaded += 1
+        self.loaded += loaded
+        print(f"🔥 Loaded {loaded} precomputed roadmaps from {self.snapshot_path}")
+        return loaded
+
+    def stale_targets(self, force: bool = False) -> List[Tuple[str, Dict[str, Any]]]:
+        """Targets missing from the cache or older than the refresh interval."""
+        if force:
+            return list(self.targets)
+        stale = []
+        for query, background in self.targets:
+            age = self.cache.age(query, background, self.namespace)
+            if age is None or age >= self.refresh_seconds:
+                stale.append((query, background))
+        return stale
+
+    async def warm_once(self, force: bool = False) -> Dict[str, int]:
+        """Generate every stale target (bounded concurrency) and rewrite the snapshot."""
+        started = time.monotonic()
+        stale = self.stale_targets(force)
+        if not stale:
+            return {"generated": 0, "failed": 0, "fresh": len(self.targets)}
+
+        print(f"🔥 Precomputing {len(stale)} popular roadmaps...")
+        service = self.service_factory()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        outcome = {"generated": 0, "failed": 0, "fresh": len(self.targets) - len(stale)}
+
+        async def generate(query: str, background: Dict[str, Any]):
+            async with semaphore:
+                try:
+                    # Bypass the cache so a refresh really regenerates; the service stores the result
+                    result = await service.generate_funneled_roadmap(query, background, use_cache=False)
+                except Exception as e:
+                    outcome["failed"] += 1
+                    print(f"⚠️ Precompute failed for '{query}' ({background.get('experience_level')}): {e}")
+                    return
+                outcome["generated"] += 1
+                self._records[self._record_key(query, background)] = {
+                    "version": self.version,
+                    "namespace": NAMESPACE,
+                    "query": query,
+                    "background": background,
+                    "result": result,
+                    "session_id": (result.get("metadata") or {}).get("session_id"),
+                    "created_at": time.time(),
+                }
+
+        await asyncio.gather(*(generate(query, background) for query, background in stale))
+        self.generated += outcome["generated"]
+        self.failed += outcome["failed"]
+        self.last_run_at = time.time()
+        self.last_run_seconds = time.monotonic() - started
+        if outcome["generated"]:
+            self.save_snapshot()
+        print(f"🔥 Precompute done: {outcome['generated']} generated, {outcome['failed']} failed in {self.last_run_seconds:.1f}s")
+        return outcome
+
+    def save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in self._records.values():
+                f.write(json.dumps(record, default=str) + "\n")
+        os.replace(tmp_path, self.snapshot_path)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Warm stale targets now, then refresh them every `refresh_seconds`."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.warm_once()
+            except Exception as e:
+                print(f"⚠️ Roadmap precompute round failed: {e}")
+            await asyncio.sleep(self.refresh_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        fresh = len(self.targets) - len(self.stale_targets())
+        return {
+            "running": self.running,
+            "version": self.version,
+            "targets": len(self.targets),
+            "fresh": fresh,
+            "loaded_from_snapshot": self.loaded,
+            "generated": self.generated,
+            "failed": self.failed,
+            "last_run_at": self.last_run_at,
+            "last_run_seconds": round(self.last_run_seconds, 1) if self.last_run_seconds is not None else None,
+        }
+
+    @staticmethod
+    def _record_key(query: str, background: Dict[str, Any]) -> str:
+        return json.dumps([query, background], sort_keys=True)
+
+
+def _funnel_service():
+    from services.container import container
+    return container.get("funnel_service")
+
+
+# Global warmer over the shared roadmap cache
+roadmap_warmer = RoadmapWarmer(
+    _funnel_service,
+    roadmap_cache,
+    warm_targets(settings.ROADMAP_WARMER_TOP_N, [level.strip() for level in settings.ROADMAP_WARMER_LEVELS.split(",") if level.strip()]),
+    snapshot_path=settings.ROADMAP_WARM_SNAPSHOT_PATH,
+    refresh_seconds=settings.ROADMAP_WARMER_REFRESH_SECONDS,
+    concurrency=settings.ROADMAP_WARMER_CONCURRENCY,
+    version=settings.ROADMAP_CACHE_VERSION,
+)
@@ -0,0 +1,105 @@
+"""
+Single-flight request coalescing
+Concurrent calls with the same key share one in-flight computation; every caller receives its own copy of the result
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import re
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+def _canonicalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return re.sub(r"\s+", " ", value).strip().lower()
+    if isinstance(value, dict):
+        return {str(k): _canonicalize(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_canonicalize(v) for v in value]
+    return value
+
+
+def canonical_key(*parts: Any) -> str:
+    """Stable key for request inputs; case, whitespace, dict order and None fields are ignored."""
+    material = json.dumps(_canonicalize(list(parts)), sort_keys=True, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent async work by key.
+
+    The shared task is shielded from individual callers being cancelled and is only
+    cancelled once every caller waiting on it has gone away.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[str, _Flight] = {}
+        self.calls = 0
+        self.executions = 0
+        self.collapsed = 0
+        self.abandoned = 0
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Run `factory()` unless an identical call is already in flight, then await the shared result."""
+        self.calls += 1
+        flight = self._flights.get(key)
+        if flight is None:
+            self.executions += 1
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _task, key=key, flight=flight: self._finish(key, flight))
+        else:
+            self.collapsed += 1
+            print(f"🔗 Coalesced {self.name} request ({flight.waiters} already waiting)")
+
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                self.abandoned += 1
+                flight.task.cancel()
+            raise
+        flight.waiters -= 1
+        return copy.deepcopy(result)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "collapsed": self.collapsed,
+            "abandoned": self.abandoned,
+            "in_flight": self.in_flight,
+            "collapse_rate": round(self.collapsed / self.calls, 3) if self.calls else 0.0,
+        }
+
+    def _finish(self, key: str, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Consume the exception so an unobserved failure doesn't log "never retrieved"
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+
+# Coalescing groups for the expensive public endpoints
+analysis_flights = SingleFlight("analyze")
+roadmap_flights = SingleFlight("multi-agent-roadmap")
@@ -4,6 +4,7 @@ from typing import Optional, Dict, Any
 from google.cloud import firestore
 from models.schemas import User, UserCreate, UserUpdate
 from services.auth_service import auth_service
+from services.executors import cpu_executor
 import os
 
 
@@ -35,7 +36,7 @@ class UserService:
         user_doc = {
             "id": user_id,
             "email": user_data.email,
-            "password_hash": auth_service.get_password_hash(user_data.password),
+            "password_hash": await cpu_executor.run(auth_service.get_password_hash, user_data.password),
             "full_name": user_data.full_name,
             "skills": user_data.skills or "",
             "expertise": user_data.expertise or "",
@@ -143,7 +144,7 @@ class UserService:
         if not user_data:
             return None
 
-        if not auth_service.verify_password(password, user_data["password_hash"]):
+        if not await cpu_executor.run(auth_service.verify_password, password, user_data["password_hash"]):
             return None
 
         return User(
@@ -0,0 +1,304 @@
+"""
+YouTube Data API quota accounting
+Records unit spend per endpoint and per quota day, projects when the daily budget runs out and picks a cheaper
+search plan as the remaining budget shrinks
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, Dict, Optional
+
+from config.settings import settings
+from services.executors import io_executor
+
+# Units charged per call (https://developers.google.com/youtube/v3/determine_quota_cost)
+ENDPOINT_COSTS = {"search": 100, "videos": 1}
+
+NORMAL, REDUCED, MINIMAL, CACHE_ONLY = "normal", "reduced", "minimal", "cache_only"
+_MODES = (NORMAL, REDUCED, MINIMAL, CACHE_ONLY)
+
+
+def quota_timezone(name: str) -> tzinfo:
+    """The quota resets at midnight Pacific time; fall back to a fixed offset without tz data."""
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception:
+        return timezone(timedelta(hours=-8))
+
+
+@dataclass
+class SearchPlan:
+    """How much API a search may spend: query variants, queries in flight and maxResults per query"""
+    mode: str
+    max_queries: Optional[int]
+    concurrency: Optional[int]
+    full_page: bool  # maxResults=limit so one query can satisfy the search
+
+    @property
+    def allows_api(self) -> bool:
+        return self.mode != CACHE_ONLY
+
+
+PLANS = {
+    NORMAL: SearchPlan(NORMAL, None, None, False),
+    REDUCED: SearchPlan(REDUCED, 2, 1, True),
+    MINIMAL: SearchPlan(MINIMAL, 1, 1, True),
+    CACHE_ONLY: SearchPlan(CACHE_ONLY, 0, 0, True),
+}
+
+
+class QuotaLedger:
+    """
+    Daily unit ledger. The plan steps down as the remaining fraction crosses
+    `reduced_fraction` and `minimal_fraction`, one step further when the current
+    burn rate projects exhaustion before the reset, and to cache-only once
+    less than `reserve_units` remain or the API reports the quota exceeded.
+    Spend is persisted at most once per `save_interval_seconds`, on `executor`
+    when given (the global ledger writes on the file I/O pool, never on the event loop);
+    a save skipped by that limit arms one delayed save so the spend still lands.
+    """
+
+    def __init__(
+        self,
+        daily_limit: int = 10000,
+        tz: Optional[tzinfo] = None,
+        reduced_fraction: float = 0.5,
+        minimal_fraction: float = 0.2,
+        reserve_units: int = 200,
+        path: Optional[str] = None,
+        history_days: int = 7,
+        min_projection_seconds: float = 3600.0,
+        clock=time.time,
+        save_interval_seconds: float = 5.0,
+        executor: Optional[Any] = None,
+    ):
+        self.daily_limit = daily_limit
+        self.tz = tz or timezone.utc
+        self.reduced_fraction = reduced_fraction
+        self.minimal_fraction = minimal_fraction
+        self.reserve_units = reserve_units
+        self.path = path
+        self.history_days = history_days
+        self.min_projection_seconds = min_projection_seconds
+        self.clock = clock
+        # day -> endpoint -> {"calls", "units"}
+        self._days: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._exhausted_days = set()
+        self._loaded = False
+        self.save_interval_seconds = save_interval_seconds
+        self.executor = executor
+        self._dirty = False
+        self._save_pending = False
+        self._last_save = float("-inf")
+        self._version = 0
+        self._written_version = 0
+        self._write_lock = threading.Lock()
+        # Guards ledger updates against the delayed-save timer thread snapshotting them
+        self._state_lock = threading.RLock()
+        self._save_timer: Optional[threading.Timer] = None
+
+    # -- time -----------------------------------------------------------------
+
+    def _now(self) -> datetime:
+        return datetime.fromtimestamp(self.clock(), self.tz)
+
+    def day(self) -> str:
+        return self._now().strftime("%Y-%m-%d")
+
+    def resets_at(self) -> datetime:
+        now = self._now()
+        return (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    # -- recording ------------------------------------------------------------
+
+    def record(self, endpoint: str, calls: int = 1):
+        self._load()
+        day = self.day()
+        with self._state_lock:
+            usage = self._days.setdefault(day, {}).setdefault(endpoint, {"calls": 0, "units": 0})
+            usage["calls"] += calls
+            usage["units"] += ENDPOINT_COSTS.get(endpoint, 1) * calls
+            self._prune()
+        self._save()
+
+    def mark_exhausted(self):
+        """The API answered quotaExceeded: stop spending until the reset."""
+        self._load()
+        day = self.day()
+        if day not in self._exhausted_days:
+            with self._state_lock:
+                self._exhausted_days.add(day)
+            print(f"🚫 YouTube quota exhausted for {day} - serving cached resources only until reset")
+            self._save(immediate=True)
+
+    def spent(self, day: Optional[str] = None) -> int:
+        self._load()
+        return sum(usage["units"] for usage in self._days.get(day or self.day(), {}).values())
+
+    def remaining(self) -> int:
+        self._load()
+        if self.day() in self._exhausted_days:
+            return 0
+        return max(0, self.daily_limit - self.spent())
+
+    # -- projection and degradation -------------------------------------------
+
+    def _elapsed_today(self) -> float:
+        now = self._now()
+        return (now - now.replace(hour=0, minute=0, second=0, microsecond=0)).total_seconds()
+
+    def burn_rate(self) -> float:
+        """Units per second since the start of the quota day."""
+        elapsed = self._elapsed_today()
+        return self.spent() / elapsed if elapsed > 0 else 0.0
+
+    def projected_exhaustion(self) -> Optional[datetime]:
+        """When the budget runs out at today's burn rate, or None if it lasts until the reset."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            return self._now()
+        rate = self.burn_rate()
+        if rate <= 0 or self._elapsed_today() < self.min_projection_seconds:
+            return None  # Too early in the day to extrapolate
+        at = self._now() + timedelta(seconds=remaining / rate)
+        return at if at < self.resets_at() else None
+
+    def mode(self) -> str:
+        remaining = self.remaining()
+        if remaining < max(self.reserve_units, ENDPOINT_COSTS["search"]):
+            return CACHE_ONLY
+        fraction = remaining / self.daily_limit
+        if fraction <= self.minimal_fraction:
+            level = 2
+        elif fraction <= self.reduced_fraction:
+            level = 1
+        else:
+            level = 0
+        if self.projected_exhaustion() is not None:
+            level += 1
+        return _MODES[min(level, 2)]
+
+    def plan(self) -> SearchPlan:
+        return PLANS[self.mode()]
+
+    # -- persistence ----------------------------------------------------------
+
+    def _prune(self):
+        for day in sorted(self._days)[:-self.history_days]:
+            del self._days[day]
+        self._exhausted_days &= set(self._days) | {self.day()}
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._days = data.get("days", {})
+            self._exhausted_days = set(data.get("exhausted_days", []))
+        except (OSError, ValueError) as e:
+            print(f"Warning: could not load YouTube quota ledger: {e}")
+
+    def _save(self, immediate: bool = False):
+        """Persist soon: writes are coalesced to one per save_interval_seconds."""
+        if not self.path:
+            return
+        self._dirty = True
+        if not immediate and (self._save_pending or time.monotonic() - self._last_save < self.save_interval_seconds):
+            self._arm_save_timer()
+            return
+        version, payload = self._snapshot()
+        self._save_pending = True
+        self._last_save = time.monotonic()
+        if self.executor is None:
+            self._write(version, payload)
+            return
+        try:
+            self.executor.submit(self._write, version, payload)
+        except RuntimeError:
+            # Pool shut down (interpreter exit)
+            self._write(version, payload)
+
+    def _arm_save_timer(self):
+        # One timer at a time; when it fires it saves everything recorded up to then
+        with self._state_lock:
+            if self._save_timer is not None:
+                return
+            remaining = self.save_interval_seconds - (time.monotonic() - self._last_save)
+            timer = threading.Timer(remaining if remaining > 0 else self.save_interval_seconds, self._deferred_save)
+            timer.daemon = True
+            self._save_timer = timer
+        timer.start()
+
+    def _deferred_save(self):
+        with self._state_lock:
+            self._save_timer = None
+        if self._dirty:
+            self._save()
+
+    def flush(self):
+        """Write any spend not yet persisted (registered to run at exit)."""
+        if self.path and self._dirty:
+            self._write(*self._snapshot())
+
+    def _snapshot(self):
+        # Serialized before handing off so the writer never sees the ledger mid-update
+        with self._state_lock:
+            self._dirty = False
+            self._version += 1
+            return self._version, json.dumps({"days": self._days, "exhausted_days": sorted(self._exhausted_days)})
+
+    def _write(self, version: int, payload: str):
+        try:
+            with self._write_lock:
+                if version <= self._written_version:
+                    return  # A newer snapshot is already on disk
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.path)
+                self._written_version = version
+        except OSError as e:
+            print(f"Warning: could not save YouTube quota ledger: {e}")
+        finally:
+            self._save_pending = False
+
+    def stats(self) -> Dict[str, Any]:
+        self._load()
+        day = self.day()
+        exhaustion = self.projected_exhaustion()
+        today = self._days.get(day, {})
+        return {
+            "day": day,
+            "daily_limit": self.daily_limit,
+            "spent": self.spent(),
+            "remaining": self.remaining(),
+            "by_endpoint": {endpoint: dict(today.get(endpoint, {"calls": 0, "units": 0})) for endpoint in ENDPOINT_COSTS},
+            "burn_rate_per_hour": round(self.burn_rate() * 3600, 1),
+            "projected_exhaustion_at": exhaustion.isoformat() if exhaustion else None,
+            "resets_at": self.resets_at().isoformat(),
+            "mode": self.mode(),
+            "history": {d: sum(u["units"] for u in usage.values()) for d, usage in sorted(self._days.items())},
+        }
+
+
+# Global ledger for the configured API key
+youtube_quota = QuotaLedger(
+    daily_limit=settings.YOUTUBE_QUOTA_DAILY_UNITS,
+    tz=quota_timezone(settings.YOUTUBE_QUOTA_TIMEZONE),
+    reduced_fraction=settings.YOUTUBE_QUOTA_REDUCED_FRACTION,
+    minimal_fraction=settings.YOUTUBE_QUOTA_MINIMAL_FRACTION,
+    reserve_units=settings.YOUTUBE_QUOTA_RESERVE_UNITS,
+    path=settings.YOUTUBE_QUOTA_LEDGER_PATH,
+    executor=io_executor,
+)
+atexit.register(youtube_quota.flush)
@@ -160,6 +160,22 @@ def mock_firestore():
         mock_db.collection.return_value = mock_collection
         yield mock_db
 
+@pytest.fixture
+
+
+def isolated_funneling_log(tmp_path, monkeypatch):
+    """Point the multi-agent service's funneling log and store at a temp file so tests never touch the real log."""
+    from services import multi_agent_service
+    from services.funneling_log import FunnelingEventLog
+    from services.funneling_store import FunnelingEventStore
+
+    event_log = FunnelingEventLog(tmp_path / "funneling_logs.jsonl")
+    monkeypatch.setattr(multi_agent_service, "funneling_event_log", event_log)
+    monkeypatch.setattr(multi_agent_service, "funneling_event_store", FunnelingEventStore())
+    monkeypatch.setattr(multi_agent_service, "GLOBAL_FUNNELING_LOGS", [])
+    monkeypatch.setattr(multi_agent_service, "_logs_loaded", False)
+    return event_log
+
 @pytest.fixture(autouse=True)
 
 
@@ -5,13 +5,24 @@ import pytest
 from unittest.mock import Mock, patch, AsyncMock
 from fastapi import HTTPException
 
-from routes.analyze import router, ai_service
+from dependencies import get_ai_service
+from main import app
 from models.schemas import AnalyzeRequest, AnalyzeResponse, CareerPath, RoadmapStep, Course, User
 
 
 class TestAnalyzeRoutes:
     """Test cases for analyze routes"""
 
+    def setup_method(self):
+        """Serve /analyze from a mock AI service"""
+        self.ai_service = Mock()
+        self.ai_service.generate_career_analysis = AsyncMock()
+        app.dependency_overrides[get_ai_service] = lambda: self.ai_service
+
+    def teardown_method(self):
+        """Drop dependency overrides"""
+        app.dependency_overrides.clear()
+
     @pytest.mark.unit
     @pytest.mark.asyncio
     async def test_analyze_career_paths_with_request_data(self, client, mock_ai_service):
@@ -59,8 +70,8 @@ class TestAnalyzeRoutes:
             ]
         }
 
-        with patch.object(ai_service, 'generate_career_analysis', return_value=mock_analysis):
-            response = client.post("/analyze", json=request_data)
+        self.ai_service.generate_career_analysis.return_value = mock_analysis
+        response = client.post("/analyze", json=request_data)
 
         assert response.status_code == 200
         data = response.json()
@@ -131,15 +142,16 @@ class TestAnalyzeRoutes:
             ]
         }
 
-        with patch('routes.analyze.get_current_user', return_value=mock_user), \
-             patch.object(ai_service, 'generate_career_analysis', return_value=mock_analysis) as mock_generate:
+        self.ai_service.generate_career_analysis.return_value = mock_analysis
+
+        with patch('routes.analyze.get_current_user', return_value=mock_user):
 
             response = client.post("/analyze", json=request_data)
 
         assert response.status_code == 200
 
         # Verify AI service was called with user's profile data
-        mock_generate.assert_called_once_with(
+        self.ai_service.generate_career_analysis.assert_called_once_with(
             sample_user_data["skills"],
             sample_user_data["expertise"]
         )
@@ -188,15 +200,16 @@ class TestAnalyzeRoutes:
             "courses": [{"title": "Advanced Course", "provider": "Expert Academy", "duration": "20 hours", "level": "Expert"}]
         }
 
-        with patch('routes.analyze.get_current_user', return_value=mock_user), \
-             patch.object(ai_service, 'generate_career_analysis', return_value=mock_analysis) as mock_generate:
+        self.ai_service.generate_career_analysis.return_value = mock_analysis
+
+        with patch('routes.analyze.get_current_user', return_value=mock_user):
 
             response = client.post("/analyze", json=request_data)
 
         assert response.status_code == 200
 
         # Verify AI service was called with request data, not user profile
-        mock_generate.assert_called_once_with(
+        self.ai_service.generate_career_analysis.assert_called_once_with(
             "New Skills, Advanced Techniques",
             "Expert"
         )
@@ -211,8 +224,8 @@ class TestAnalyzeRoutes:
         }
 
         # Mock AI service failure
-        with patch.object(ai_service, 'generate_career_analysis', side_effect=Exception("AI service unavailable")):
-            response = client.post("/analyze", json=request_data)
+        self.ai_service.generate_career_analysis.side_effect = Exception("AI service unavailable")
+        response = client.post("/analyze", json=request_data)
 
         assert response.status_code == 500
         assert "Error analyzing career paths" in response.json()["detail"]
@@ -244,15 +257,16 @@ class TestAnalyzeRoutes:
             "courses": [{"title": "ML Course", "provider": "ML Academy", "duration": "40 hours", "level": "Advanced"}]
         }
 
-        with patch('routes.analyze.get_current_user', return_value=mock_user), \
-             patch.object(ai_service, 'generate_career_analysis', return_value=mock_analysis) as mock_generate:
+        self.ai_service.generate_career_analysis.return_value = mock_analysis
+
+        with patch('routes.analyze.get_current_user', return_value=mock_user):
 
             response = client.post("/analyze", json=request_data)
 
         assert response.status_code == 200
 
         # Should use skills from request and expertise from user
-        mock_generate.assert_called_once_with(
+        self.ai_service.generate_career_analysis.assert_called_once_with(
             "Python, Machine Learning",
             "Advanced"
         )
@@ -297,8 +311,8 @@ class TestAnalyzeRoutes:
             "courses": []
         }
 
-        with patch.object(ai_service, 'generate_career_analysis', return_value=incomplete_analysis):
-            response = client.post("/analyze", json=request_data)
+        self.ai_service.generate_career_analysis.return_value = incomplete_analysis
+        response = client.post("/analyze", json=request_data)
 
         # Should return 500 due to validation error when creating Pydantic models
         assert response.status_code == 500
@@ -0,0 +1,35 @@
+"""
+Unit tests for health routes
+"""
+import pytest
+from unittest.mock import patch
+
+from services.provider_health import ProviderHealthRegistry
+
+
+class TestHealthRoutes:
+    """Test cases for health routes"""
+
+    @pytest.mark.unit
+    def test_health_check(self, client):
+        """Basic health endpoint stays available"""
+        response = client.get("/api/health")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "healthy"
+
+    @pytest.mark.unit
+    def test_provider_health_reports_open_circuits(self, client):
+        """Provider endpoint exposes live breaker state"""
+        registry = ProviderHealthRegistry(failure_threshold=1)
+        registry.record_success("groq", 0.3)
+        registry.record_failure("gemini", 45.0, "ReadTimeout")
+
+        with patch('routes.health.provider_health', registry):
+            response = client.get("/api/health/providers")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "degraded"
+        assert data["providers"]["gemini"]["state"] == "open"
+        assert data["providers"]["groq"]["ewma_latency_ms"] == 300.0
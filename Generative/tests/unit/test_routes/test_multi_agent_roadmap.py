@@ -0,0 +1,75 @@
+"""
+Unit tests for multi-agent roadmap routes
+"""
+import json
+import pytest
+
+from dependencies import get_funnel_service
+from main import app
+
+
+def parse_sse(body: str):
+    """Split an SSE body into (event, data) pairs"""
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class FakeFunnelService:
+    """Stands in for the shared MultiAgentFunnelService"""
+
+    def __init__(self, stream):
+        self.stream_roadmap = stream
+
+
+class TestMultiAgentRoadmapStream:
+    """Test cases for the SSE roadmap endpoint"""
+
+    def teardown_method(self):
+        """Drop dependency overrides"""
+        app.dependency_overrides.clear()
+
+    @pytest.mark.unit
+    def test_stream_relays_service_events(self, client):
+        """Each service event becomes one SSE frame in order"""
+        async def fake_stream(user_query, user_background=None):
+            yield "agent_started", {"agent_name": "Strategic Planner"}
+            yield "phase", {"index": 0, "phase": {"phase": "Foundations"}}
+            yield "complete", {"final_roadmap": "## Foundations", "metadata": {"session_id": "abc"}}
+
+        app.dependency_overrides[get_funnel_service] = lambda: FakeFunnelService(fake_stream)
+        response = client.post("/multi-agent-roadmap/stream", json={"query": "I want to learn data science"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = parse_sse(response.text)
+        assert [name for name, _ in events] == ["agent_started", "phase", "complete"]
+        assert events[-1][1]["metadata"]["session_id"] == "abc"
+
+    @pytest.mark.unit
+    def test_stream_reports_errors_as_events(self, client):
+        """A pipeline failure ends the stream with an error event"""
+        async def failing_stream(user_query, user_background=None):
+            yield "agent_started", {"agent_name": "Strategic Planner"}
+            raise Exception("All agents failed to generate valid responses")
+
+        app.dependency_overrides[get_funnel_service] = lambda: FakeFunnelService(failing_stream)
+        response = client.post("/multi-agent-roadmap/stream", json={"query": "I want to learn data science"})
+
+        events = parse_sse(response.text)
+        assert events[-1] == ("error", {"detail": "All agents failed to generate valid responses"})
+
+    @pytest.mark.unit
+    def test_funneling_report_uses_shared_service(self, client):
+        """The report endpoint reads through the injected service instead of building one"""
+        class ReportService:
+            def generate_funneling_report(self, session_id):
+                return {"session_id": session_id, "agent_performance": {}}
+
+        app.dependency_overrides[get_funnel_service] = ReportService
+        response = client.get("/funneling-report/abc123")
+
+        assert response.status_code == 200
+        assert response.json()["report"]["session_id"] == "abc123"
@@ -2,11 +2,14 @@
 Unit tests for AIService
 """
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 import json
 import os
 
 from services.ai_service import AIService, convert_usd_to_inr
+from services.llm_client import ProviderError
+from services.provider_prober import ProviderAvailabilityRegistry
+from services.response_cache import TieredCache, MemoryCacheTier
 
 
 class TestAIService:
@@ -24,6 +27,8 @@ class TestAIService:
         }):
             with patch('services.ai_service.VERTEX_AI_AVAILABLE', False):
                 self.ai_service = AIService()
+        # Keep each test's cache isolated and off disk
+        self.ai_service.response_cache = TieredCache([MemoryCacheTier(16)])
 
     @pytest.mark.unit
     def test_convert_usd_to_inr_basic(self):
@@ -75,50 +80,101 @@ class TestAIService:
 
     @pytest.mark.unit
     @pytest.mark.ai_service
-    @patch('requests.post')
-    def test_generate_with_fallback_ai_ollama_success(self, mock_post):
+    @pytest.mark.asyncio
+    async def test_generate_with_fallback_ai_ollama_success(self):
         """Test successful generation with Ollama"""
         # Setup
+        self.ai_service.fallback_apis['google_genai'] = False
         self.ai_service.fallback_apis['ollama'] = True
         self.ai_service.ollama_url = "http://localhost:11434/api/generate"
 
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "response": "Generated content from Ollama"
-        }
-        mock_post.return_value = mock_response
+        with patch('services.ai_service.llm_client.generate', new_callable=AsyncMock) as mock_generate:
+            mock_generate.return_value = "Generated content from Ollama"
 
-        # Execute
-        result = self.ai_service._generate_with_fallback_ai("Test prompt")
+            # Execute
+            result = await self.ai_service._generate_with_fallback_ai("Test prompt")
 
         # Verify
         assert result == "Generated content from Ollama"
-        mock_post.assert_called_once()
+        mock_generate.assert_called_once()
+        options = mock_generate.call_args.args[1]
+        assert options.provider == "ollama"
+        assert options.base_url == "http://localhost:11434/api/generate"
 
     @pytest.mark.unit
     @pytest.mark.ai_service
-    @patch('requests.post')
-    def test_generate_with_fallback_ai_huggingface_success(self, mock_post):
-        """Test successful generation with Hugging Face"""
+    @pytest.mark.asyncio
+    async def test_generate_with_fallback_ai_huggingface_success(self):
+        """Test fallthrough to Hugging Face when earlier providers fail"""
         # Setup
-        self.ai_service.fallback_apis['ollama'] = False
-        self.ai_service.fallback_apis['huggingface'] = True
-
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = [
-            {"generated_text": "Generated content from HuggingFace"}
-        ]
-        mock_post.return_value = mock_response
-
-        # Execute
-        with patch.object(self.ai_service, '_generate_with_fallback_ai') as mock_generate:
-            mock_generate.return_value = "Generated content from HuggingFace"
-            result = self.ai_service._generate_with_fallback_ai("Test prompt")
+        self.ai_service.fallback_apis.update({
+            'google_genai': False,
+            'ollama': True,
+            'huggingface': True,
+            'groq': False,
+            'openai_free': False
+        })
+
+        async def fake_generate(prompt, options):
+            if options.provider == "ollama":
+                raise ProviderError("ollama", "connection refused")
+            return "Generated content from HuggingFace"
+
+        with patch('services.ai_service.llm_client.generate', side_effect=fake_generate) as mock_generate:
+            result = await self.ai_service._generate_with_fallback_ai("Test prompt")
 
         # Verify
         assert result == "Generated content from HuggingFace"
+        assert [call.args[1].provider for call in mock_generate.call_args_list] == ["ollama", "huggingface"]
+
+    @pytest.mark.unit
+    @pytest.mark.ai_service
+    @pytest.mark.asyncio
+    async def test_generate_with_fallback_ai_uses_response_cache(self):
+        """Repeat prompts are served from the cache without calling a provider"""
+        self.ai_service.fallback_apis.update({'google_genai': False, 'ollama': False, 'huggingface': True})
+
+        with patch('services.ai_service.llm_client.generate', new_callable=AsyncMock) as mock_generate:
+            mock_generate.return_value = "Cached answer"
+            first = await self.ai_service._generate_with_fallback_ai("Explain   recursion")
+            second = await self.ai_service._generate_with_fallback_ai("Explain recursion")
+
+        assert first == second == "Cached answer"
+        mock_generate.assert_called_once()
+        assert self.ai_service.response_cache.stats()["hits"]["memory"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.ai_service
+    @pytest.mark.asyncio
+    async def test_response_cache_survives_provider_availability_changes(self):
+        """A provider coming back up does not invalidate answers cached while it was down"""
+        self.ai_service.fallback_apis.update({'google_genai': False, 'ollama': False, 'huggingface': True})
+
+        with patch('services.ai_service.llm_client.generate', new_callable=AsyncMock) as mock_generate:
+            mock_generate.return_value = "Cached answer"
+            await self.ai_service._generate_with_fallback_ai("Explain recursion")
+            self.ai_service.fallback_apis['ollama'] = True
+            self.ai_service.ollama_url = "http://localhost:11434"
+            second = await self.ai_service._generate_with_fallback_ai("Explain recursion")
+
+        assert second == "Cached answer"
+        mock_generate.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.ai_service
+    @pytest.mark.asyncio
+    async def test_vertex_career_analysis_is_cached(self):
+        """Repeat career analyses reuse the cached Vertex AI response"""
+        self.ai_service.vertex_ai_available = True
+        self.ai_service.model = Mock()
+        self.ai_service.model.generate_content.return_value = Mock(text='{"career_paths": [], "skill_gaps": []}')
+
+        first = await self.ai_service.generate_career_analysis("Python", "Beginner")
+        second = await self.ai_service.generate_career_analysis("Python", "Beginner")
+
+        assert first == second == {"career_paths": [], "skill_gaps": []}
+        self.ai_service.model.generate_content.assert_called_once()
+        assert self.ai_service.response_cache.stats()["hits"]["memory"] == 1
 
     @pytest.mark.unit
     @pytest.mark.ai_service
@@ -163,9 +219,6 @@ class TestAIService:
         hf_result = ai_service._init_huggingface()
         assert isinstance(hf_result, bool)
 
-        ollama_result = ai_service._init_ollama()
-        assert isinstance(ollama_result, bool)
-
         groq_result = ai_service._init_groq()
         assert isinstance(groq_result, bool)
 
@@ -174,30 +227,17 @@ class TestAIService:
 
     @pytest.mark.unit
     @pytest.mark.ai_service
-    @patch('requests.get')
-    def test_init_ollama_success(self, mock_get):
-        """Test successful Ollama initialization"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_get.return_value = mock_response
-
-        ai_service = AIService()
-        result = ai_service._init_ollama()
+    def test_ollama_availability_comes_from_prober_registry(self):
+        """Ollama starts from the last published probe result and follows later probes"""
+        registry = ProviderAvailabilityRegistry()
+        registry.publish("ollama", True)
 
-        # Should return True when Ollama is available
-        mock_get.assert_called_with("http://localhost:11434/api/tags", timeout=2)
-
-    @pytest.mark.unit
-    @pytest.mark.ai_service
-    @patch('requests.get')
-    def test_init_ollama_failure(self, mock_get):
-        """Test failed Ollama initialization"""
-        mock_get.side_effect = Exception("Connection failed")
-
-        ai_service = AIService()
-        result = ai_service._init_ollama()
+        with patch('services.ai_service.provider_availability', registry):
+            ai_service = AIService()
+        assert ai_service.fallback_apis['ollama'] is True
 
-        assert result is False
+        registry.publish("ollama", False, error="Connection failed")
+        assert ai_service.fallback_apis['ollama'] is False
 
     @pytest.mark.unit
     @pytest.mark.ai_service
@@ -0,0 +1,54 @@
+"""
+Unit tests for the service container
+"""
+import pytest
+
+from services.container import ServiceContainer
+
+
+class TestServiceContainer:
+    """Test cases for ServiceContainer"""
+
+    def setup_method(self):
+        """Setup test instance"""
+        self.builds = []
+        self.container = ServiceContainer()
+        self.container.register("svc", lambda: self.builds.append(1) or object())
+
+    @pytest.mark.unit
+    def test_service_is_built_once(self):
+        """Every lookup returns the same lazily built instance"""
+        first = self.container.get("svc")
+
+        assert self.container.get("svc") is first
+        assert len(self.builds) == 1
+
+    @pytest.mark.unit
+    def test_startup_tolerates_failing_factories(self):
+        """A service that cannot start is skipped and retried lazily"""
+        def broken():
+            raise ValueError("GOOGLE_GENAI_API_KEY not found")
+
+        self.container.register("broken", broken)
+        self.container.startup()
+
+        assert self.container.is_built("svc")
+        assert not self.container.is_built("broken")
+        with pytest.raises(ValueError):
+            self.container.get("broken")
+
+    @pytest.mark.unit
+    def test_override_and_reset(self):
+        """Overrides replace an instance until the container is reset"""
+        replacement = object()
+        self.container.override("svc", replacement)
+        assert self.container.get("svc") is replacement
+
+        self.container.reset()
+        assert self.container.get("svc") is not replacement
+
+    @pytest.mark.unit
+    def test_unknown_service(self):
+        """Unregistered names fail loudly"""
+        with pytest.raises(KeyError):
+            self.container.get("missing")
@@ -0,0 +1,67 @@
+"""
+Unit tests for client disconnect cancellation
+"""
+import asyncio
+import pytest
+
+from services.disconnect import ClientDisconnected, DisconnectGuard
+
+
+class FakeRequest:
+    """ASGI receive channel that reports a disconnect once `gone` is set"""
+
+    def __init__(self):
+        self.gone = asyncio.Event()
+
+    async def receive(self):
+        await self.gone.wait()
+        return {"type": "http.disconnect"}
+
+
+class TestDisconnectGuard:
+    """Test cases for DisconnectGuard"""
+
+    def setup_method(self):
+        """Setup test instance"""
+        self.guard = DisconnectGuard()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_work(self):
+        """Work still running when the client leaves is cancelled and counted"""
+        request = FakeRequest()
+        cancelled = []
+
+        async def generate():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        asyncio.get_running_loop().call_later(0.01, request.gone.set)
+        with pytest.raises(ClientDisconnected):
+            await self.guard.run(request, "roadmap", generate)
+
+        assert cancelled == [True]
+        assert self.guard.stats()["roadmap"] == {"started": 1, "completed": 0, "abandoned": 1}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_connected_client_gets_result(self):
+        """Work that finishes first returns normally"""
+        async def generate():
+            return {"ok": True}
+
+        assert await self.guard.run(FakeRequest(), "analyze", generate) == {"ok": True}
+        assert self.guard.stats()["analyze"]["completed"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_without_request_runs_unguarded(self):
+        """Internal callers without an HTTP request just await the work"""
+        async def generate():
+            return 42
+
+        assert await self.guard.run(None, "internal", generate) == 42
+        assert self.guard.stats() == {}
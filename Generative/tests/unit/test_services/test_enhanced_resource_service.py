@@ -0,0 +1,222 @@
+"""
+Unit tests for EnhancedResourceService YouTube lookups and the concurrent search engine
+"""
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from services.enhanced_resource_service import EnhancedResourceService
+from services.resource_search import YouTubeSearchEngine
+from services.youtube_quota import QuotaLedger
+
+
+class FakeYouTubeAPI:
+    """Stands in for the YouTube Data API and counts calls per endpoint"""
+
+    def __init__(self, delays=None, status_code=200):
+        self.delays = delays or {}
+        self.status_code = status_code
+        self.calls = {"search": 0, "videos": 0}
+        self.queries = []
+        self.requested_ids = []
+
+    async def handle(self, request):
+        endpoint = request.url.path.rsplit("/", 1)[-1]
+        params = request.url.params
+        self.calls[endpoint] += 1
+        if self.status_code != 200:
+            return httpx.Response(self.status_code, json={})
+        if endpoint == "search":
+            query = params["q"]
+            self.queries.append(query)
+            await asyncio.sleep(self.delays.get(query, 0))
+            return httpx.Response(200, json={"items": [self._search_item(query, i) for i in range(int(params["maxResults"]))]})
+        ids = params["id"].split(",")
+        assert len(ids) <= 50
+        self.requested_ids.append(ids)
+        return httpx.Response(200, json={"items": [
+            {"id": video_id, "contentDetails": {"duration": "PT1H5M"}, "statistics": {"viewCount": "25000"}}
+            for video_id in ids
+        ]})
+
+    def _search_item(self, query, index):
+        video_id = f"{query.replace(' ', '-')}-{index}"
+        return {
+            "id": {"videoId": video_id},
+            "snippet": {
+                "title": f"Video {video_id}",
+                "description": "A tutorial",
+                "thumbnails": {"default": {"url": "https://img/default.jpg"}},
+                "channelTitle": "Channel",
+                "publishedAt": "2024-03-01T00:00:00Z",
+            },
+        }
+
+
+@pytest.fixture
+def youtube_api():
+    api = FakeYouTubeAPI()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(api.handle))
+    with patch("services.resource_search.get_http_client", return_value=client):
+        yield api
+
+
+@pytest.fixture
+def resource_service(monkeypatch):
+    monkeypatch.setenv("YOUTUBE_API_KEY", "test-key")
+    monkeypatch.delenv("GOOGLE_GENAI_API_KEY", raising=False)
+    service = EnhancedResourceService()
+    service.cache = None
+    service.youtube_quota = service.youtube_search.ledger = QuotaLedger()
+    return service
+
+
+class TestYouTubeDetails:
+    """Test cases for batched videos.list lookups"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_search_fetches_details_in_one_batch(self, resource_service, youtube_api):
+        """A 20-result search makes one videos.list call instead of one per video"""
+        videos = await resource_service._search_youtube_videos("python", 20, "beginner")
+
+        assert len(videos) == 20
+        assert youtube_api.calls["videos"] == 1
+        assert videos[0]["duration"] == "1h 5m"
+        assert videos[0]["students"] == "25K views"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_details_are_chunked_by_fifty(self, resource_service, youtube_api):
+        """More than 50 ids are split across calls and merged back by id"""
+        video_ids = [f"v{i}" for i in range(120)] + ["v0"]
+        details = await resource_service.youtube_search.video_details(video_ids)
+
+        assert youtube_api.calls["videos"] == 3
+        assert sorted(len(ids) for ids in youtube_api.requested_ids) == [20, 50, 50]
+        assert set(details) == {f"v{i}" for i in range(120)}
+        assert details["v119"] == {"duration": "PT1H5M", "viewCount": "25000"}
+
+    @pytest.mark.unit
+    def test_missing_details_fall_back_to_na(self, resource_service):
+        """Hits without details keep N/A placeholders"""
+        snippet = FakeYouTubeAPI()._search_item("gone", 0)["snippet"]
+        video = resource_service._build_video_resource("gone-0", snippet, {}, "beginner")
+
+        assert video["duration"] == "N/A"
+        assert video["students"] == "N/A views"
+
+
+class TestYouTubeSearchEngine:
+    """Test cases for the concurrent multi-query search"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_preserves_query_order_when_later_query_finishes_first(self):
+        """Hits from the first query lead even if the second query answers sooner"""
+        api = FakeYouTubeAPI(delays={"slow first": 0.05})
+        client = httpx.AsyncClient(transport=httpx.MockTransport(api.handle))
+        engine = YouTubeSearchEngine("key", concurrency=3)
+
+        with patch("services.resource_search.get_http_client", return_value=client):
+            hits = await engine.search(["slow first", "fast second"], limit=4, per_query=2)
+
+        assert [video_id for video_id, _ in hits] == ["slow-first-0", "slow-first-1", "fast-second-0", "fast-second-1"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stops_fetching_once_limit_is_reached(self, youtube_api):
+        """Queries beyond the ones needed for `limit` are never sent (and never billed)"""
+        youtube_api.delays = {"q3": 1.0}
+        engine = YouTubeSearchEngine("key", concurrency=3)
+
+        hits = await engine.search(["q1", "q2", "q3", "q4", "q5"], limit=10, per_query=5)
+
+        assert len(hits) == 10
+        assert youtube_api.queries == ["q1", "q2"]
+        assert engine.stats()["searches_cancelled"] == 0
+        assert engine.stats()["searches_skipped"] == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_extra_variants_start_only_when_pages_fall_short(self, youtube_api):
+        """A third query joins the fan-out only when two full pages cannot reach `limit`"""
+        engine = YouTubeSearchEngine("key", concurrency=3)
+
+        hits = await engine.search(["q1", "q2", "q3", "q4"], limit=10, per_query=4)
+
+        assert len(hits) == 10
+        assert youtube_api.calls["search"] == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_queries_are_skipped(self):
+        """HTTP errors yield no hits instead of failing the search"""
+        api = FakeYouTubeAPI(status_code=403)
+        client = httpx.AsyncClient(transport=httpx.MockTransport(api.handle))
+        engine = YouTubeSearchEngine("key")
+
+        with patch("services.resource_search.get_http_client", return_value=client):
+            assert await engine.search(["a", "b"], limit=5) == []
+
+
+class TestGetEnhancedResources:
+    """Test cases for get_enhanced_resources"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_youtube_fans_out_alternates_concurrently(self, resource_service, youtube_api):
+        """Alternate search terms join the fan-out; the first queries satisfy the limit"""
+        results = await resource_service.get_enhanced_resources("python", "youtube", limit=10, level="beginner")
+
+        assert len(results) == 10
+        assert all(r["url"].startswith("https://www.youtube.com/watch?v=") for r in results)
+        assert youtube_api.calls["search"] == 2  # two half pages cover the limit; no third billed query
+        assert youtube_api.calls["videos"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_searches_are_charged_to_the_quota_ledger(self, resource_service, youtube_api):
+        """search.list costs 100 units and videos.list 1"""
+        await resource_service.get_enhanced_resources("python", "youtube", limit=10, level="beginner")
+
+        usage = resource_service.youtube_quota.stats()["by_endpoint"]
+        assert usage["search"] == {"calls": youtube_api.calls["search"], "units": 100 * youtube_api.calls["search"]}
+        assert usage["videos"] == {"calls": 1, "units": 1}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_low_budget_uses_one_full_page_query(self, resource_service, youtube_api):
+        """In minimal mode a single query with maxResults=limit is sent"""
+        resource_service.youtube_quota.record("search", calls=85)
+
+        results = await resource_service.get_enhanced_resources("python", "youtube", limit=10, level="beginner")
+
+        assert len(results) == 10
+        assert youtube_api.calls["search"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_skips_the_api(self, resource_service, youtube_api):
+        """Below the reserve no YouTube call is made and only fallbacks are returned"""
+        resource_service.youtube_quota.mark_exhausted()
+
+        results = await resource_service.get_enhanced_resources("python", "youtube", limit=10, level="beginner")
+
+        assert youtube_api.calls == {"search": 0, "videos": 0}
+        assert not any(r.get("verified") for r in results)
+
+
+class TestGeminiRecommendations:
+    """Test cases for parsing Gemini resource recommendations"""
+
+    @pytest.mark.unit
+    def test_gemini_response_with_separate_objects_keeps_every_item(self, resource_service):
+        """Gemini output written as bare objects instead of an array yields all of them"""
+        text = '{"title": "Course A", "url": "https://a"}\n{"title": "Course B", "url": "https://b"}'
+
+        resources = resource_service._parse_gemini_response(text, "courses", "python", "beginner")
+
+        assert [r["title"] for r in resources] == ["Course A", "Course B"]
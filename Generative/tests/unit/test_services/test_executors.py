@@ -0,0 +1,101 @@
+"""
+Unit tests for the instrumented executors
+"""
+import asyncio
+import threading
+import time
+import pytest
+
+from services.executors import InstrumentedExecutor
+
+
+class TestInstrumentedExecutor:
+    """Test cases for InstrumentedExecutor"""
+
+    def setup_method(self):
+        """Setup test instance"""
+        self.executor = InstrumentedExecutor("test-pool", max_workers=2)
+
+    def teardown_method(self):
+        """Release worker threads"""
+        self.executor.shutdown(wait=True)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_runs_on_named_pool_threads(self):
+        """Work runs on this pool's threads and returns its result"""
+        name = await self.executor.run(lambda: threading.current_thread().name)
+
+        assert name.startswith("test-pool")
+        assert self.executor.stats()["completed"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_queue_wait_and_saturation_are_measured(self):
+        """Calls beyond the pool size wait for a thread and the wait is recorded"""
+        release = threading.Event()
+        blockers = [asyncio.ensure_future(self.executor.run(release.wait)) for _ in range(2)]
+        queued = asyncio.ensure_future(self.executor.run(time.sleep, 0))
+        await asyncio.sleep(0.05)
+
+        stats = self.executor.stats()
+        assert stats["active"] == 2
+        assert stats["queued"] == 1
+        assert stats["saturation"] == 1.5
+
+        release.set()
+        await asyncio.gather(*blockers, queued)
+        stats = self.executor.stats()
+        assert stats["queue_wait_ms"]["max"] >= 40
+        assert stats["duration_ms"]["max"] >= 40
+        assert stats["active"] == 0
+        assert stats["queued"] == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failures_propagate_and_are_counted(self):
+        """Exceptions from the worker reach the caller"""
+        def boom():
+            raise ValueError("sdk error")
+
+        with pytest.raises(ValueError):
+            await self.executor.run(boom)
+        assert self.executor.stats()["failed"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancelled_queued_call_never_runs(self):
+        """Cancelling a call still waiting for a thread releases its queue slot"""
+        release = threading.Event()
+        blockers = [asyncio.ensure_future(self.executor.run(release.wait)) for _ in range(2)]
+        ran = []
+        queued = asyncio.ensure_future(self.executor.run(ran.append, True))
+        await asyncio.sleep(0.05)
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        release.set()
+        await asyncio.gather(*blockers)
+
+        assert ran == []
+        stats = self.executor.stats()
+        assert stats["cancelled"] == 1
+        assert stats["queued"] == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancelled_running_call_is_detached(self):
+        """Cancelling a call already on a thread is counted as detached, not cancelled"""
+        release = threading.Event()
+        running = asyncio.ensure_future(self.executor.run(release.wait))
+        await asyncio.sleep(0.05)
+
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+        release.set()
+
+        stats = self.executor.stats()
+        assert stats["detached"] == 1
+        assert stats["cancelled"] == 0
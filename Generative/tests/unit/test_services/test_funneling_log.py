@@ -0,0 +1,90 @@
+"""
+Unit tests for the append-only funneling event log
+"""
+import json
+import pytest
+
+from services.funneling_log import FunnelingEventLog
+
+
+class TestFunnelingEventLog:
+    """Test cases for FunnelingEventLog"""
+
+    @pytest.mark.unit
+    def test_append_is_buffered_until_batch_size(self, tmp_path):
+        """Events stay in memory until the flush threshold is reached"""
+        log = FunnelingEventLog(tmp_path / "events.jsonl", flush_every=3, flush_interval_seconds=3600)
+
+        log.append({"session_id": "a", "n": 1})
+        log.append({"session_id": "a", "n": 2})
+        assert not (tmp_path / "events.jsonl").exists()
+
+        log.append({"session_id": "a", "n": 3})
+        lines = (tmp_path / "events.jsonl").read_text().splitlines()
+        assert [json.loads(line)["n"] for line in lines] == [1, 2, 3]
+
+    @pytest.mark.unit
+    def test_load_truncates_torn_trailing_line(self, tmp_path):
+        """A partially written last event is dropped and removed from disk"""
+        path = tmp_path / "events.jsonl"
+        path.write_text('{"session_id": "a", "n": 1}\n{"session_id": "a", "n": 2}\n{"session_id": "a", "n"')
+
+        events = FunnelingEventLog(path).load()
+
+        assert [e["n"] for e in events] == [1, 2]
+        assert path.read_text().endswith("}\n")
+
+        # Appending after recovery produces a clean file
+        log = FunnelingEventLog(path, flush_every=1)
+        log.load()
+        log.append({"session_id": "a", "n": 3})
+        assert [e["n"] for e in FunnelingEventLog(path).load()] == [1, 2, 3]
+
+    @pytest.mark.unit
+    def test_compaction_keeps_most_recent_events(self, tmp_path):
+        """Compaction rewrites the file down to the retention window"""
+        path = tmp_path / "events.jsonl"
+        log = FunnelingEventLog(path, flush_every=1, retain_events=5, compact_every=3)
+
+        for n in range(8):
+            log.append({"n": n})
+
+        assert [e["n"] for e in FunnelingEventLog(path).load()] == [3, 4, 5, 6, 7]
+
+    @pytest.mark.unit
+    def test_migrates_legacy_json_array(self, tmp_path):
+        """The old whole-file JSON log is imported once into JSONL"""
+        legacy = tmp_path / "funneling_logs.json"
+        legacy.write_text(json.dumps([{"session_id": "old", "n": 1}, {"session_id": "old", "n": 2}]))
+        path = tmp_path / "funneling_logs.jsonl"
+
+        events = FunnelingEventLog(path, legacy_path=legacy).load()
+
+        assert [e["n"] for e in events] == [1, 2]
+        assert len(path.read_text().splitlines()) == 2
+
+    @pytest.mark.unit
+    def test_flushes_are_handed_to_the_executor(self, tmp_path):
+        """With an executor, append never writes inline and schedules one flush per batch"""
+        class DeferredExecutor:
+            def __init__(self):
+                self.jobs = []
+
+            def submit(self, fn):
+                self.jobs.append(fn)
+
+        executor = DeferredExecutor()
+        path = tmp_path / "events.jsonl"
+        log = FunnelingEventLog(path, flush_every=2, flush_interval_seconds=3600, executor=executor)
+
+        for n in range(5):
+            log.append({"n": n})
+        assert not path.exists()
+        assert len(executor.jobs) == 1
+
+        executor.jobs.pop()()
+        assert [e["n"] for e in FunnelingEventLog(path).load()] == [0, 1, 2, 3, 4]
+        log.append({"n": 5})
+        log.append({"n": 6})
+        assert len(executor.jobs) == 1
+
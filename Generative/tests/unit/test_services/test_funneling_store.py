@@ -0,0 +1,65 @@
+"""
+Unit tests for the session-indexed funneling event store
+"""
+import pytest
+
+from services.funneling_store import FunnelingEventStore
+
+
+def _session_events(session_id, start):
+    return [
+        {"session_id": session_id, "timestamp": start, "user_query": f"query {session_id}",
+         "user_background": {}, "status": "INITIATED"},
+        {"session_id": session_id, "timestamp": start + 1, "event_type": "AGENT_START", "agent_id": "agent_strategic"},
+        {"session_id": session_id, "timestamp": start + 2, "event_type": "AGENT_RESPONSE", "agent_id": "agent_strategic"},
+        {"session_id": session_id, "timestamp": start + 3, "event_type": "FUNNELING_PROCESS", "best_agent": "Strategic Planner"},
+        {"session_id": session_id, "timestamp": start + 4, "event_type": "SESSION_COMPLETE", "total_time_seconds": 4},
+    ]
+
+
+class TestFunnelingEventStore:
+    """Test cases for FunnelingEventStore"""
+
+    def setup_method(self):
+        """Setup test instance"""
+        self.store = FunnelingEventStore()
+
+    @pytest.mark.unit
+    def test_groups_events_and_builds_summary(self):
+        """Events are grouped per session and summarised incrementally"""
+        for event in _session_events("abc", 100):
+            self.store.add(event)
+
+        summary = self.store.summary("abc")
+        assert len(self.store.session_events("abc")) == 5
+        assert summary["started_at"] == 100
+        assert summary["user_query"] == "query abc"
+        assert summary["status"] == "completed"
+        assert len(summary["agent_starts"]) == 1
+        assert summary["funneling"]["best_agent"] == "Strategic Planner"
+
+    @pytest.mark.unit
+    def test_recent_sessions_newest_first(self):
+        """The time index returns the most recently started sessions first"""
+        interleaved = []
+        for n, session_id in enumerate(["s1", "s2", "s3"]):
+            interleaved.extend(_session_events(session_id, n * 10))
+        # An out-of-order session still lands in the right place
+        interleaved.extend(_session_events("s0", -10))
+        self.store.rebuild(interleaved)
+
+        assert [s["session_id"] for s in self.store.recent_sessions(3)] == ["s3", "s2", "s1"]
+        assert self.store.recent_sessions(10)[-1]["session_id"] == "s0"
+
+    @pytest.mark.unit
+    def test_forget_sessions(self):
+        """Expired sessions are removed from every index"""
+        self.store.rebuild(_session_events("old", 0) + _session_events("new", 50))
+
+        self.store.forget_sessions(["old"])
+
+        assert self.store.summary("old") is None
+        assert self.store.session_events("old") == []
+        assert self.store.session_count == 1
+        assert self.store.event_count == 5
+        assert [s["session_id"] for s in self.store.recent_sessions()] == ["new"]
@@ -0,0 +1,52 @@
+"""
+Unit tests for hedge latency tracking
+"""
+import pytest
+
+from services.hedge_latency import HedgeLatencyTracker, LatencySamples
+
+
+class TestLatencySamples:
+    """Test cases for LatencySamples"""
+
+    @pytest.mark.unit
+    def test_completed_samples_give_plain_percentiles(self):
+        """Without censoring the estimate is the empirical quantile"""
+        samples = LatencySamples()
+        for seconds in range(1, 11):
+            samples.record(float(seconds))
+
+        assert samples.percentile(0.5) == 5.0
+        assert samples.percentile(0.9) == 9.0
+        assert LatencySamples().percentile(0.9) is None
+
+    @pytest.mark.unit
+    def test_censored_samples_raise_the_estimate(self):
+        """Cancelled slow calls push the percentile up rather than being ignored"""
+        only_fast = LatencySamples()
+        with_cancelled = LatencySamples()
+        for seconds in (1.0, 1.0, 1.0, 2.0, 2.0):
+            only_fast.record(seconds)
+            with_cancelled.record(seconds)
+        for _ in range(5):
+            with_cancelled.record(3.0, completed=False)
+
+        assert only_fast.percentile(0.9) == 2.0
+        assert with_cancelled.percentile(0.9) == 3.0
+        assert with_cancelled.snapshot()["censored"] == 5
+
+
+class TestHedgeLatencyTracker:
+    """Test cases for HedgeLatencyTracker"""
+
+    @pytest.mark.unit
+    def test_keys_are_tracked_separately(self):
+        """Each provider/model keeps its own samples"""
+        tracker = HedgeLatencyTracker()
+        for _ in range(5):
+            tracker.record("groq/a", 1.0)
+            tracker.record("gemini/b", 4.0)
+
+        assert tracker.percentile("groq/a", 0.9) == 1.0
+        assert tracker.percentile("gemini/b", 0.9) == 4.0
+        assert set(tracker.snapshot()) == {"gemini/b", "groq/a"}
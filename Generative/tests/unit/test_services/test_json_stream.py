@@ -0,0 +1,139 @@
+"""
+Unit tests for the tolerant incremental JSON parser
+"""
+import json
+import time
+
+import pytest
+
+from services.json_stream import StreamingJSONParser, iter_array_items, parse_json, parse_json_values
+
+
+async def chunked(text, size):
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
+
+
+class TestParseJson:
+    """Test cases for parse_json"""
+
+    @pytest.mark.unit
+    def test_recovers_common_llm_mistakes(self):
+        """Prose, fences, unquoted keys, single quotes and trailing commas are tolerated"""
+        text = "Here is the JSON:\n```json\n{overview: 'Intro', \"phases\": [{\"title\": \"P1\",},],}\n```\nHope it helps!"
+
+        assert parse_json(text) == {"overview": "Intro", "phases": [{"title": "P1"}]}
+
+    @pytest.mark.unit
+    def test_closes_truncated_output(self):
+        """A response cut off mid-string keeps everything parsed so far"""
+        text = '{"overview": "x", "score": 0.5, "phases": [{"title": "P1", "skills": ["a", "b'
+
+        assert parse_json(text) == {"overview": "x", "score": 0.5, "phases": [{"title": "P1", "skills": ["a", "b"]}]}
+
+    @pytest.mark.unit
+    def test_expect_selects_container_kind(self):
+        """expect=list skips a leading object and mismatches return None"""
+        text = 'Note {"ignored": true} then [{"question": "Q", "answer": "A"}]'
+
+        assert parse_json(text, expect=list) == [{"question": "Q", "answer": "A"}]
+        assert parse_json("[1, 2]", expect=dict) is None
+        assert parse_json("no json here") is None
+
+    @pytest.mark.unit
+    def test_values_collects_separate_top_level_objects(self):
+        """Bare objects one after another are all returned, not just the first"""
+        text = 'Here you go:\n{"title": "A"}\n{"title": "B",}\n\n{"title": "C"'
+
+        assert parse_json_values(text) == [{"title": "A"}, {"title": "B"}, {"title": "C"}]
+        assert parse_json_values('[{"title": "A"}]') == [[{"title": "A"}]]
+        assert parse_json_values("no json here") == []
+
+    @pytest.mark.unit
+    def test_quote_inside_bare_value_is_literal(self):
+        """An apostrophe in an unquoted value does not open a string that swallows the rest"""
+        text = '{"desc": it\'s great, "level": beginner "weeks": 4, next: 1 done: true}'
+
+        assert parse_json(text) == {"desc": "it's great", "level": "beginner", "weeks": 4, "next": 1, "done": True}
+
+    @pytest.mark.unit
+    def test_values_reads_many_roots_in_linear_time(self):
+        """Collecting many top-level objects scales linearly with input size"""
+        def parse_seconds(count):
+            text = "\n".join('{"k": "v", "n": [1, 2],}' for _ in range(count))
+            started = time.perf_counter()
+            assert len(parse_json_values(text)) == count
+            return time.perf_counter() - started
+
+        parse_seconds(200)  # warm up
+        small, large = parse_seconds(1000), parse_seconds(8000)
+
+        assert large < small * 8 * 3
+
+    @pytest.mark.unit
+    def test_escapes_and_literals(self):
+        """String escapes, unicode escapes and Python-style literals decode correctly"""
+        text = '{"a": "line\\nbreak \\"q\\" caf\\u00e9", b: True, c: None, d: -1.5e2,}'
+
+        assert parse_json(text) == {"a": 'line\nbreak "q" café', "b": True, "c": None, "d": -150.0}
+
+
+class TestStreamingJSONParser:
+    """Test cases for StreamingJSONParser"""
+
+    @pytest.mark.unit
+    def test_emits_array_elements_as_they_close(self):
+        """Each element is reported in the chunk that closes it, with its path"""
+        parser = StreamingJSONParser()
+
+        assert parser.feed('{"phases": [{"n": 1') == []
+        assert parser.feed('}, {"n"') == [(("phases", 0), {"n": 1})]
+        assert parser.feed(': 2}]}') == [(("phases", 1), {"n": 2})]
+        assert parser.done
+        assert parser.close() == {"phases": [{"n": 1}, {"n": 2}]}
+
+    @pytest.mark.unit
+    def test_partial_exposes_value_before_close(self):
+        """Downstream code can read the partially built document"""
+        parser = StreamingJSONParser()
+        parser.feed('{"overview": "Intro", "phases": [')
+
+        assert parser.partial() == {"overview": "Intro", "phases": []}
+
+    @pytest.mark.unit
+    def test_chunk_boundaries_do_not_matter(self):
+        """Feeding one character at a time gives the same result as one chunk"""
+        document = {"overview": "x", "phases": [{"title": "P", "topics": ["a", "b"], "weeks": 4}], "ok": False}
+        text = json.dumps(document)
+        parser = StreamingJSONParser()
+        for char in text:
+            parser.feed(char)
+
+        assert parser.close() == document
+
+    @pytest.mark.unit
+    def test_linear_time(self):
+        """Parsing time grows linearly with input size"""
+        def parse_seconds(count):
+            text = "[" + ",".join('{"k": "v", "n": [1, 2, 3],}' for _ in range(count))
+            started = time.perf_counter()
+            parse_json(text)
+            return time.perf_counter() - started
+
+        parse_seconds(200)  # warm up
+        small, large = parse_seconds(2000), parse_seconds(16000)
+
+        assert large < small * 8 * 3
+
+
+class TestIterArrayItems:
+    """Test cases for iter_array_items"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_yields_items_at_path_from_token_stream(self):
+        """Only elements of the requested array are yielded, as they complete"""
+        text = '{"overview": {"tags": ["x"]}, "phases": [{"title": "A"}, {"title": "B"}, {"title": "C"'
+        items = [item async for item in iter_array_items(chunked(text, 7), path=("phases",))]
+
+        assert items == [{"title": "A"}, {"title": "B"}]
@@ -0,0 +1,103 @@
+"""
+Unit tests for the async LLM provider client
+"""
+import json
+import pytest
+import httpx
+from unittest.mock import patch
+
+from services.llm_client import LLMProviderClient, GenerationOptions, ProviderError
+from services.rate_limiter import ProviderRateLimiter
+
+
+def _client_for(handler):
+    """Build a pooled client whose requests are answered by `handler`"""
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestLLMProviderClient:
+    """Test cases for LLMProviderClient"""
+
+    def setup_method(self):
+        """Setup test instance"""
+        self.client = LLMProviderClient()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_gemini_request_and_response(self):
+        """Gemini calls send the key as a header and read the first candidate"""
+        seen = {}
+
+        def handler(request):
+            seen["url"] = str(request.url)
+            seen["key"] = request.headers.get("x-goog-api-key")
+            seen["body"] = json.loads(request.content)
+            return httpx.Response(200, json={"candidates": [{"content": {"parts": [{"text": "hello"}]}}]})
+
+        with patch('services.llm_client.get_http_client', return_value=_client_for(handler)):
+            text = await self.client.generate("Hi", GenerationOptions(provider="gemini", model="gemini-test", api_key="k", top_k=40))
+
+        assert text == "hello"
+        assert "models/gemini-test:generateContent" in seen["url"]
+        assert "key=" not in seen["url"]
+        assert seen["key"] == "k"
+        assert seen["body"]["generationConfig"]["topK"] == 40
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_groq_chat_completion(self):
+        """OpenAI-style providers include the system prompt and parse choices"""
+        def handler(request):
+            body = json.loads(request.content)
+            assert body["messages"][0] == {"role": "system", "content": "be brief"}
+            return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+        with patch('services.llm_client.get_http_client', return_value=_client_for(handler)):
+            text = await self.client.generate("Hi", GenerationOptions(provider="groq", model="m", system_prompt="be brief"))
+
+        assert text == "ok"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_rate_limit_raises_with_retry_after(self):
+        """HTTP errors surface as ProviderError with status and Retry-After"""
+        def handler(request):
+            return httpx.Response(429, headers={"retry-after": "7"}, json={"error": "slow down"})
+
+        with patch('services.llm_client.get_http_client', return_value=_client_for(handler)), \
+             patch('services.llm_client.rate_limiter', ProviderRateLimiter(enabled=False)):
+            with pytest.raises(ProviderError) as exc_info:
+                await self.client.generate("Hi", GenerationOptions(provider="groq", model="m"))
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.retry_after == 7.0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_rate_limited_call_waits_and_retries(self):
+        """A 429 blocks the model's bucket for Retry-After and the call is re-queued"""
+        statuses = [429, 200]
+
+        def handler(request):
+            status = statuses.pop(0)
+            if status == 429:
+                return httpx.Response(429, headers={"retry-after": "0.05"}, json={"error": "slow down"})
+            return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+        limiter = ProviderRateLimiter(default_rpm=6000)
+        with patch('services.llm_client.get_http_client', return_value=_client_for(handler)), \
+             patch('services.llm_client.rate_limiter', limiter):
+            text = await self.client.generate("Hi", GenerationOptions(provider="groq", model="m"))
+
+        assert text == "ok"
+        stats = limiter.stats()["groq/m"]
+        assert stats["throttled_by_provider"] == 1
+        assert stats["admitted"] == 2
+        assert stats["max_wait_ms"] >= 50
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_unknown_provider(self):
+        """Unsupported providers fail fast"""
+        with pytest.raises(ProviderError):
+            await self.client.generate("Hi", GenerationOptions(provider="nope", model="m"))
@@ -0,0 +1,95 @@
+"""
+Unit tests for the small-model-first cascade
+"""
+import asyncio
+import pytest
+
+from services.model_cascade import ModelCascade
+
+
+def answer(text, delay=0.0):
+    async def call():
+        await asyncio.sleep(delay)
+        return text
+    return call
+
+
+class TestModelCascade:
+    """Test cases for ModelCascade"""
+
+    def setup_method(self):
+        """Setup test instance"""
+        self.cascade = ModelCascade("test", small_model="small-8b", threshold=0.6)
+        self.score = {"good": 0.9, "weak": 0.2, "large": 0.95}.get
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_confident_small_answer_is_served(self):
+        """A small-model answer above the threshold never reaches the large model"""
+        large_calls = []
+
+        async def large():
+            large_calls.append(1)
+            return "large"
+
+        result, info = await self.cascade.run("large-70b", answer("good"), large, self.score)
+
+        assert result == "good"
+        assert info["tier"] == "small"
+        assert large_calls == []
+        assert self.cascade.stats()["tiers"]["small"]["hit_rate"] == 1.0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_low_confidence_escalates(self):
+        """Below the threshold the large model answers and the escalation is counted"""
+        result, info = await self.cascade.run("large-70b", answer("weak"), answer("large"), self.score)
+
+        assert result == "large"
+        assert info == {"tier": "large", "model": "large-70b", "small_score": 0.2, "escalated": True}
+        stats = self.cascade.stats()
+        assert stats["escalations"] == 1
+        assert stats["tiers"]["large"]["served"] == 1
+        assert stats["latency_saved_ms"]["total"] <= 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_small_failure_escalates(self):
+        """An exception from the small model falls through to the large model"""
+        async def broken():
+            raise RuntimeError("503")
+
+        result, info = await self.cascade.run("large-70b", broken, answer("large"), self.score)
+
+        assert result == "large"
+        assert info["escalated"] is True
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_latency_saved_uses_observed_large_latency(self):
+        """Once the large model's latency is known, small-tier hits report time saved"""
+        await self.cascade.run("large-70b", answer("weak"), answer("large", delay=0.05), self.score)
+        await self.cascade.run("large-70b", answer("good"), answer("large", delay=0.05), self.score)
+
+        stats = self.cascade.stats()
+        assert stats["requests"] == 2
+        assert stats["tiers"]["small"]["hit_rate"] == 0.5
+        assert stats["tiers"]["large"]["avg_latency_ms"] >= 40
+        assert stats["latency_saved_ms"]["total"] > 30
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_disabled_cascade_calls_large_only(self):
+        """With cascade mode off the small model is never tried"""
+        cascade = ModelCascade("off", small_model="small-8b", enabled=False)
+        small_calls = []
+
+        async def small():
+            small_calls.append(1)
+            return "good"
+
+        result, _ = await cascade.run("large-70b", small, answer("large"), self.score)
+
+        assert result == "large"
+        assert small_calls == []
+        assert cascade.stats()["requests"] == 0
@@ -0,0 +1,253 @@
+"""
+Unit tests for MultiAgentFunnelService
+"""
+import asyncio
+import json
+import os
+import pytest
+from unittest.mock import patch
+
+from services import multi_agent_service
+from services.multi_agent_service import AgentResponse, MultiAgentFunnelService
+from services.hedge_latency import HedgeLatencyTracker
+from services.model_cascade import ModelCascade
+from services.roadmap_cache import SemanticRoadmapCache
+
+
+LONG_ROADMAP = "## Phase 1: Foundations\n" + "Learn the core concepts step by step. " * 5
+JSON_ROADMAP = json.dumps({
+    "overview": "Data science roadmap",
+    "phases": [
+        {
+            "name": "Python for Data Analysis",
+            "duration_weeks": 4,
+            "goals": ["Write idiomatic pandas data pipelines"],
+            "topics": ["Pandas DataFrame indexing and joins"],
+            "projects": ["Exploratory analysis of NYC taxi trips"],
+            "tools": ["Jupyter"]
+        }
+    ]
+})
+
+
+class TestMultiAgentFunnelService:
+    """Test cases for MultiAgentFunnelService"""
+
+    @pytest.fixture(autouse=True)
+    def _isolate_funneling_log(self, isolated_funneling_log):
+        """Every test records funneling events into a temp log"""
+        self.event_log = isolated_funneling_log
+
+    def setup_method(self):
+        """Setup test instance"""
+        with patch.dict(os.environ, {
+            'GROQ_API_KEY': 'test-groq-key',
+            'GOOGLE_GENAI_API_KEY': 'test-genai-key'
+        }):
+            self.service = MultiAgentFunnelService()
+        self.service.roadmap_cache = SemanticRoadmapCache()
+        self.agent = self.service.agents["agent_strategic"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_hedge_wins_when_primary_is_slow(self):
+        """A slow primary is hedged and the losing request is cancelled"""
+        cancelled = []
+
+        async def fake_call(provider, model, prompt):
+            if provider == self.agent["provider"]:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(provider)
+                    raise
+            return LONG_ROADMAP
+
+        with patch('services.multi_agent_service.settings.ROADMAP_HEDGING_ENABLED', True), \
+             patch.object(self.service, '_hedge_delay', return_value=0.01), \
+             patch.object(self.service, '_call_provider', side_effect=fake_call):
+            raw, served_by = await self.service._call_with_hedge(self.agent, "prompt")
+            await asyncio.sleep(0)
+
+        assert raw == LONG_ROADMAP
+        assert served_by["provider"] == self.agent["hedge"]["provider"]
+        assert served_by["hedged"] is True
+        assert cancelled == [self.agent["provider"]]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancelled_primary_is_recorded_as_censored(self):
+        """A primary that loses the race still counts toward its latency, not toward provider health"""
+        tracker = HedgeLatencyTracker()
+
+        async def slow_groq(model, prompt):
+            await asyncio.sleep(1.0)
+            return LONG_ROADMAP
+
+        async def fast_gemini(prompt, model=None):
+            assert model == self.agent["hedge"]["model"]
+            return LONG_ROADMAP
+
+        with patch('services.multi_agent_service.hedge_latency', tracker), \
+             patch('services.multi_agent_service.settings.ROADMAP_HEDGING_ENABLED', True), \
+             patch.object(self.service, '_hedge_delay', return_value=0.01), \
+             patch.object(self.service, '_call_groq', side_effect=slow_groq), \
+             patch.object(self.service, '_call_gemini', side_effect=fast_gemini), \
+             patch('services.provider_health.provider_health.record_success') as health_success:
+            raw, served_by = await self.service._call_with_hedge(self.agent, "prompt")
+            await asyncio.sleep(0)
+
+        assert served_by["hedged"] is True
+        primary = tracker.snapshot()[f"{self.agent['provider']}/{self.agent['model']}"]
+        assert primary["censored"] == 1 and primary["completed"] == 0
+        health_success.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        """A primary answering inside its latency budget never triggers a hedge"""
+        calls = []
+
+        async def fake_call(provider, model, prompt):
+            calls.append(provider)
+            return LONG_ROADMAP
+
+        with patch('services.multi_agent_service.settings.ROADMAP_HEDGING_ENABLED', True), \
+             patch.object(self.service, '_hedge_delay', return_value=1.0), \
+             patch.object(self.service, '_call_provider', side_effect=fake_call):
+            raw, served_by = await self.service._call_with_hedge(self.agent, "prompt")
+
+        assert calls == [self.agent["provider"]]
+        assert served_by == {"provider": self.agent["provider"], "model": self.agent["model"], "hedged": False}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_primary_falls_through_to_hedge(self):
+        """A primary error before the delay goes straight to the hedge provider"""
+        async def fake_call(provider, model, prompt):
+            if provider == self.agent["provider"]:
+                raise RuntimeError("429 rate_limit")
+            return LONG_ROADMAP
+
+        with patch('services.multi_agent_service.settings.ROADMAP_HEDGING_ENABLED', True), \
+             patch.object(self.service, '_hedge_delay', return_value=1.0), \
+             patch.object(self.service, '_call_provider', side_effect=fake_call):
+            raw, served_by = await self.service._call_with_hedge(self.agent, "prompt")
+
+        assert served_by["provider"] == self.agent["hedge"]["provider"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cascade_escalates_low_confidence_small_model(self):
+        """The 8B model answers first; a low specialization score escalates to the agent's model"""
+        self.service.model_cascade = ModelCascade("test", small_model="llama-3.1-8b-instant", threshold=0.6)
+        calls = []
+
+        async def fake_provider(provider, model, prompt):
+            calls.append(model)
+            return LONG_ROADMAP if model == "llama-3.1-8b-instant" else LONG_ROADMAP * 10
+
+        with patch.object(self.service, '_call_provider', side_effect=fake_provider):
+            response = await self.service.generate_roadmap_with_agent(self.agent, "data science")
+
+        assert calls == ["llama-3.1-8b-instant", self.agent["model"]]
+        assert response.metadata["cascade_tier"] == "large"
+        assert self.service.model_cascade.stats()["escalations"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_near_duplicate_query_served_from_roadmap_cache(self):
+        """A paraphrased query reuses the stored roadmap and the report records the hit"""
+        background = {"experience_level": "beginner", "current_skills": "python"}
+
+        with patch.object(self.service, '_call_groq', return_value=LONG_ROADMAP * 3) as mock_groq:
+            first = await self.service.generate_funneled_roadmap("I want to learn data science", background)
+            second = await self.service.generate_funneled_roadmap("learn data science from scratch", background)
+
+        assert mock_groq.call_count == 1
+        assert second["final_roadmap"] == first["final_roadmap"]
+        assert second["session_id"] != first["session_id"]
+        assert second["metadata"]["cache_hit"] is True
+        assert second["funneling_report"]["cache"]["hit"] is True
+        assert second["funneling_report"]["cache"]["matched_query"] == "I want to learn data science"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stream_roadmap_emits_progress_before_completion(self):
+        """Agents, a provisional preview and synthesized phases stream before the final result"""
+        delays = {"agent_strategic": 0.01, "agent_practical": 0.05, "agent_technical": 0.05}
+
+        async def fake_agent(agent_config, user_query, user_background=None, agent_id=None):
+            await asyncio.sleep(delays[agent_id])
+            # Below every quorum rule, so all three agents report
+            return AgentResponse(agent_config["name"], JSON_ROADMAP, 0.45, {"provider": agent_config["provider"]})
+
+        with patch.object(self.service, 'generate_roadmap_with_agent', side_effect=fake_agent):
+            events = [event async for event in self.service.stream_roadmap("data science", None)]
+
+        names = [name for name, _ in events]
+        assert names[:3] == ["agent_started"] * 3
+        assert names.index("phase_preview") < names.index("agent_finished", names.index("agent_finished") + 1)
+        assert names.count("agent_finished") == 3
+        assert "phase" in names
+        assert names[-1] == "complete"
+        final = events[-1][1]
+        phases = [payload["phase"] for name, payload in events if name == "phase"]
+        assert phases == final["metadata"]["structured_plan"]["phases"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_quorum_cancels_straggler_and_reports_it(self):
+        """Two confident agents meet the quorum; the slow agent is cancelled and reported"""
+        cancelled = []
+
+        async def fake_agent(agent_config, user_query, user_background=None, agent_id=None):
+            if agent_id == "agent_technical":
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(agent_id)
+                    raise
+            return AgentResponse(agent_config["name"], JSON_ROADMAP, 0.6, {"provider": agent_config["provider"]})
+
+        with patch.object(self.service, 'generate_roadmap_with_agent', side_effect=fake_agent):
+            events = [event async for event in self.service.stream_roadmap("data science", None)]
+
+        names = [name for name, _ in events]
+        assert cancelled == ["agent_technical"]
+        assert names.count("agent_finished") == 2
+        cut_off = [payload for name, payload in events if name == "agent_cut_off"]
+        assert cut_off[0]["agent_id"] == "agent_technical"
+        assert "quorum met" in cut_off[0]["reason"]
+
+        report = self.service.generate_funneling_report(events[-1][1]["metadata"]["session_id"])
+        assert report["quorum"]["reason"] == "quorum"
+        assert report["quorum"]["cut_off_agents"][0]["agent_name"] == "Technical Expert"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_shared_service_keeps_sessions_per_request(self):
+        """Concurrent requests on one instance each log to their own session"""
+        async def request(query):
+            session_id = self.service._start_new_session(query)
+            await asyncio.sleep(0.01)
+            return session_id, self.service.current_session_id
+
+        results = await asyncio.gather(request("data science"), request("web development"))
+
+        assert all(started == current for started, current in results)
+        assert results[0][0] != results[1][0]
+
+    @pytest.mark.unit
+    def test_existing_log_is_loaded_on_first_use(self):
+        """Persisted events are read when the first event is recorded, not at import"""
+        self.event_log.path.write_text(
+            json.dumps({"session_id": "old", "timestamp": 1.0, "event_type": "SESSION_START"}) + "\n"
+        )
+
+        session_id = self.service._start_new_session("data science")
+
+        assert [summary["session_id"] for summary in multi_agent_service.funneling_event_store.recent_sessions(5)] == [
+            session_id, "old"
+        ]
+        assert len(multi_agent_service.GLOBAL_FUNNELING_LOGS) == 2
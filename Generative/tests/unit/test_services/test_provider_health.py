@@ -0,0 +1,79 @@
+"""
+Unit tests for provider circuit breakers and health-scored ordering
+"""
+import pytest
+from unittest.mock import patch
+
+from services.provider_health import ProviderHealth, ProviderHealthRegistry
+
+
+class TestProviderHealth:
+    """Test cases for ProviderHealth circuit breaker"""
+
+    def setup_method(self):
+        """Setup test instance"""
+        self.registry = ProviderHealthRegistry(failure_threshold=3, cooldown_seconds=10)
+
+    @pytest.mark.unit
+    def test_opens_after_consecutive_failures(self):
+        """Three failures in a row open the circuit"""
+        for _ in range(3):
+            assert self.registry.allow("groq")
+            self.registry.record_failure("groq", 0.5, "HTTP 503")
+
+        assert self.registry.get("groq").state == ProviderHealth.OPEN
+        assert not self.registry.allow("groq")
+
+    @pytest.mark.unit
+    def test_half_open_probe_closes_on_success(self):
+        """After the cooldown one probe is admitted; success closes the circuit"""
+        with patch('services.provider_health.time.monotonic', return_value=100.0):
+            for _ in range(3):
+                self.registry.record_failure("gemini", 1.0)
+
+        with patch('services.provider_health.time.monotonic', return_value=111.0):
+            assert self.registry.allow("gemini")
+            # Only a single probe while half-open
+            assert not self.registry.allow("gemini")
+            self.registry.record_success("gemini", 0.4)
+
+        assert self.registry.get("gemini").state == ProviderHealth.CLOSED
+        assert self.registry.allow("gemini")
+
+    @pytest.mark.unit
+    def test_failed_probe_doubles_cooldown(self):
+        """A failed half-open probe reopens the circuit with a longer cooldown"""
+        with patch('services.provider_health.time.monotonic', return_value=100.0):
+            for _ in range(3):
+                self.registry.record_failure("ollama", 1.0)
+        with patch('services.provider_health.time.monotonic', return_value=111.0):
+            assert self.registry.allow("ollama")
+            self.registry.record_failure("ollama", 1.0)
+
+        health = self.registry.get("ollama")
+        assert health.state == ProviderHealth.OPEN
+        assert health.cooldown_seconds == 20
+
+    @pytest.mark.unit
+    def test_order_by_latency_with_open_circuits_last(self):
+        """Healthy providers are ordered by EWMA latency, unmeasured ones first, open ones last"""
+        self.registry.record_success("gemini", 4.0)
+        self.registry.record_success("groq", 0.8)
+        for _ in range(3):
+            self.registry.record_failure("huggingface", 30.0)
+
+        order = self.registry.order(["gemini", "ollama", "huggingface", "groq"])
+
+        assert order == ["ollama", "groq", "gemini", "huggingface"]
+
+    @pytest.mark.unit
+    def test_snapshot_reports_state(self):
+        """Snapshot exposes state, error rate and latency"""
+        self.registry.record_success("groq", 0.25)
+        self.registry.record_failure("groq", 0.75, "timeout")
+
+        snapshot = self.registry.snapshot()["groq"]
+        assert snapshot["state"] == ProviderHealth.CLOSED
+        assert snapshot["error_rate"] == 0.5
+        assert snapshot["total_calls"] == 2
+        assert snapshot["last_error"] == "timeout"
@@ -0,0 +1,122 @@
+"""
+Unit tests for background provider probing
+"""
+import asyncio
+import httpx
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from config.settings import settings
+from services.provider_prober import OLLAMA_TAGS_URL, ProviderAvailabilityRegistry, ProviderProber, probe_ollama
+
+
+class Owner:
+    """Stand-in for a service holding a fallback_apis dict"""
+
+    def __init__(self):
+        self.fallback_apis = {"ollama": False, "groq": True}
+
+
+class TestProviderAvailabilityRegistry:
+    """Test cases for ProviderAvailabilityRegistry"""
+
+    def setup_method(self):
+        """Setup test instance"""
+        self.registry = ProviderAvailabilityRegistry()
+
+    @pytest.mark.unit
+    def test_publish_updates_attached_dicts(self):
+        """Published availability is copied into every attached fallback_apis dict"""
+        owner = Owner()
+        self.registry.attach(owner)
+
+        self.registry.publish("ollama", True, latency_seconds=0.01)
+
+        assert owner.fallback_apis == {"ollama": True, "groq": True}
+        assert self.registry.get("ollama") is True
+        assert self.registry.stats()["ollama"]["latency_ms"] == 10.0
+
+    @pytest.mark.unit
+    def test_attach_applies_last_known_state(self):
+        """A service built after a probe round starts from the published value"""
+        self.registry.publish("ollama", True)
+        owner = Owner()
+
+        self.registry.attach(owner)
+
+        assert owner.fallback_apis["ollama"] is True
+
+    @pytest.mark.unit
+    def test_unknown_provider_defaults_unavailable(self):
+        """Providers that were never probed read as unavailable"""
+        assert self.registry.get("ollama") is False
+
+
+class TestProviderProber:
+    """Test cases for ProviderProber"""
+
+    def setup_method(self):
+        """Setup test instance"""
+        self.registry = ProviderAvailabilityRegistry()
+        self.prober = ProviderProber(self.registry, interval_seconds=0.01, timeout_seconds=0.05)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_probe_failures_and_timeouts_mark_unavailable(self):
+        """Probes that raise or hang publish unavailable with the reason"""
+        async def up():
+            return True
+
+        async def broken():
+            raise ConnectionError("refused")
+
+        async def hangs():
+            await asyncio.sleep(1)
+
+        self.prober.register("up", up)
+        self.prober.register("broken", broken)
+        self.prober.register("hangs", hangs)
+
+        results = await self.prober.probe_once()
+
+        assert results == {"up": True, "broken": False, "hangs": False}
+        assert "refused" in self.registry.stats()["broken"]["error"]
+        assert "no response" in self.registry.stats()["hangs"]["error"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_background_loop_refreshes_until_stopped(self):
+        """The prober keeps refreshing on its interval and stops cleanly"""
+        states = iter([False, True, True, True, True, True])
+
+        async def flaky():
+            return next(states)
+
+        owner = Owner()
+        self.registry.attach(owner)
+        self.prober.register("ollama", flaky)
+
+        self.prober.start()
+        for _ in range(50):
+            if self.prober.rounds >= 2:
+                break
+            await asyncio.sleep(0.01)
+        await self.prober.stop()
+
+        assert self.prober.rounds >= 2
+        assert owner.fallback_apis["ollama"] is True
+        assert not self.prober.running
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_ollama_probe_checks_local_daemon(self):
+        """Ollama is available when /api/tags answers 200 and unavailable when unreachable"""
+        client = AsyncMock()
+        client.get.return_value = Mock(status_code=200)
+        with patch('services.provider_prober.get_http_client', return_value=client):
+            assert await probe_ollama() is True
+        client.get.assert_called_once_with(OLLAMA_TAGS_URL, timeout=settings.PROVIDER_PROBE_TIMEOUT_SECONDS)
+
+        client.get.side_effect = httpx.ConnectError("Connection failed")
+        with patch('services.provider_prober.get_http_client', return_value=client):
+            assert await probe_ollama() is False
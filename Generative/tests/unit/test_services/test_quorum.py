@@ -0,0 +1,76 @@
+"""
+Unit tests for quorum-based early completion
+"""
+import asyncio
+import pytest
+
+from services.quorum import QuorumPolicy, QuorumWait
+
+
+async def answer(confidence, delay):
+    await asyncio.sleep(delay)
+    return confidence
+
+
+class TestQuorumPolicy:
+    """Test cases for QuorumPolicy"""
+
+    @pytest.mark.unit
+    def test_parse_and_match_rules(self):
+        """Either rule satisfies the quorum"""
+        policy = QuorumPolicy.parse("2:0.5, 1:0.8", deadline_seconds=10)
+
+        assert policy.rules == [(2, 0.5), (1, 0.8)]
+        assert policy.met_by([0.6]) is None
+        assert policy.met_by([0.6, 0.55]) == "2 agents at or above 0.5 confidence"
+        assert policy.met_by([0.9]) == "1 agent at or above 0.8 confidence"
+
+
+class TestQuorumWait:
+    """Test cases for QuorumWait"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stops_at_quorum_and_cancels_pending(self):
+        """A single high-confidence result ends the wait and cancels the rest"""
+        slow = asyncio.ensure_future(answer(0.9, 5))
+        fast = asyncio.ensure_future(answer(0.9, 0.01))
+        waiter = QuorumWait({fast: "fast", slow: "slow"}, QuorumPolicy(), lambda c: c)
+
+        results = [item async for item in waiter.results()]
+
+        assert results == [("fast", 0.9)]
+        assert slow.cancelled()
+        assert waiter.reason == "quorum"
+        assert "quorum met" in waiter.cut_off["slow"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_deadline_cuts_off_slow_agents(self):
+        """Agents still running at the deadline are cancelled with that reason"""
+        weak = asyncio.ensure_future(answer(0.3, 0.01))
+        slow = asyncio.ensure_future(answer(0.9, 5))
+        waiter = QuorumWait({weak: "weak", slow: "slow"}, QuorumPolicy(deadline_seconds=0.05), lambda c: c)
+
+        results = [item async for item in waiter.results()]
+
+        assert results == [("weak", 0.3)]
+        assert waiter.reason == "deadline"
+        assert waiter.summary()["cut_off_agents"] == {"slow": "deadline of 0.05s reached"}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failures_count_as_zero_confidence(self):
+        """Exceptions are yielded, never satisfy the quorum, and nothing is cut off once all finish"""
+        async def boom():
+            raise RuntimeError("provider down")
+
+        failed = asyncio.ensure_future(boom())
+        weak = asyncio.ensure_future(answer(0.4, 0.01))
+        waiter = QuorumWait({failed: "failed", weak: "weak"}, QuorumPolicy(), lambda c: c)
+
+        results = dict([item async for item in waiter.results()])
+
+        assert isinstance(results["failed"], RuntimeError)
+        assert waiter.reason == "all_completed"
+        assert waiter.cut_off == {}
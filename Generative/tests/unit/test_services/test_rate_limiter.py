@@ -0,0 +1,149 @@
+"""
+Unit tests for the provider rate limiter
+"""
+import asyncio
+import time
+import pytest
+
+from services.rate_limiter import (
+    ModelRateLimiter,
+    ProviderRateLimiter,
+    RateLimitExceeded,
+    TokenBucket,
+    reservation_tokens,
+    retry_after_from,
+)
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket"""
+
+    @pytest.mark.unit
+    def test_refills_over_time(self):
+        """Consumed capacity comes back at capacity/period per second"""
+        bucket = TokenBucket(60, period=60.0)
+        now = time.monotonic()
+        bucket.consume(60, now)
+
+        assert bucket.time_until(1, now) == pytest.approx(1.0)
+        assert bucket.time_until(1, now + 1.0) == pytest.approx(0.0)
+
+
+class TestModelRateLimiter:
+    """Test cases for ModelRateLimiter"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_callers_queue_instead_of_failing(self):
+        """Requests past the RPM budget wait in order for the bucket to refill"""
+        limiter = ModelRateLimiter("groq/m", rpm=600, tpm=10 ** 6)  # one request per 0.1s once drained
+        limiter.requests.tokens = 1
+
+        waits = await asyncio.gather(*(limiter.acquire(10) for _ in range(3)))
+
+        assert waits[0] < 0.05
+        assert waits[1] == pytest.approx(0.1, abs=0.05)
+        assert waits[2] == pytest.approx(0.2, abs=0.05)
+        stats = limiter.stats()
+        assert stats["peak_queue_depth"] == 2
+        assert stats["queue_depth"] == 0
+        assert stats["admitted"] == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_token_budget_limits_large_prompts(self):
+        """A prompt larger than the remaining TPM waits for tokens to refill"""
+        limiter = ModelRateLimiter("groq/m", rpm=1000, tpm=600, max_wait_seconds=0.5)  # 10 tokens/s
+        await limiter.acquire(600)
+
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire(100)
+        assert limiter.stats()["rejected"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_immediately(self):
+        """Callers beyond the queue bound are rejected rather than piling up"""
+        limiter = ModelRateLimiter("groq/m", rpm=60, tpm=10 ** 6, max_queue=1)
+        limiter.requests.tokens = 0
+        waiter = asyncio.ensure_future(limiter.acquire(1))
+        await asyncio.sleep(0)
+
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire(1)
+        waiter.cancel()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_retry_after_blocks_the_bucket(self):
+        """A provider Retry-After holds every caller until it expires"""
+        limiter = ModelRateLimiter("groq/m", rpm=1000, tpm=10 ** 6)
+        limiter.penalize(0.1)
+
+        waited = await limiter.acquire(1)
+
+        assert waited >= 0.09
+        assert limiter.stats()["throttled_by_provider"] == 1
+
+
+class TestProviderRateLimiter:
+    """Test cases for ProviderRateLimiter"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_non_rate_limit_errors_are_not_retried(self):
+        """Only 429-style failures are re-queued"""
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            raise ValueError("bad request")
+
+        with pytest.raises(ValueError):
+            await ProviderRateLimiter().call("groq", "m", "prompt", 100, failing)
+        assert len(calls) == 1
+
+    @pytest.mark.unit
+    def test_retry_after_parsed_from_error_text(self):
+        """Groq's 'try again in' hint is used when no header is available"""
+        error = Exception("Error code: 429 - Rate limit reached. Please try again in 1m2.5s.")
+        assert retry_after_from(error) == pytest.approx(62.5)
+
+    @pytest.mark.unit
+    def test_reservation_uses_expected_completion_not_max_tokens(self):
+        """A call holds its prompt plus the completion reserve, capped at max_tokens"""
+        prompt = "x" * 6000  # ~1500 tokens
+
+        assert reservation_tokens(prompt, 4000, 1024) == 1500 + 1024
+        assert reservation_tokens(prompt, 500, 1024) == 1500 + 500
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrent_agents_fit_the_tpm_budget(self):
+        """Several 4000-max_tokens calls are admitted at once on a 6000 TPM model"""
+        limiter = ProviderRateLimiter(completion_reserve_tokens=200, max_wait_seconds=0.1)
+
+        async def answer():
+            return "ok"
+
+        results = await asyncio.gather(*(
+            limiter.call("groq", "llama-3.1-8b-instant", "x" * 6000, 4000, answer) for _ in range(3)
+        ))
+
+        assert results == ["ok"] * 3
+        assert limiter.stats()["groq/llama-3.1-8b-instant"]["rejected"] == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_reported_usage_settles_the_reservation(self):
+        """Provider-reported tokens replace the estimate, including usage above the reservation"""
+        limiter = ProviderRateLimiter(completion_reserve_tokens=100)
+
+        async def completion():
+            return {"text": "ok", "total_tokens": 900}
+
+        await limiter.call("groq", "m", "x" * 400, 4000, completion, usage=lambda r: r["total_tokens"])
+
+        bucket = limiter.limiter("groq", "m").tokens
+        assert bucket.capacity - bucket.tokens == pytest.approx(900, abs=5)
+
@@ -0,0 +1,130 @@
+"""
+Unit tests for the resource search cache
+"""
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+
+from services.resource_cache import ResourceSearchCache, parse_ttls, resource_cache_key
+from services.response_cache import MemoryCacheTier, SQLiteCacheTier, TieredCache
+
+VIDEO = {"title": "Python course", "url": "https://www.youtube.com/watch?v=1", "verified": True}
+FALLBACK = {"title": "Search YouTube", "url": "https://www.youtube.com/results?q=x", "verified": False}
+
+
+class Fetcher:
+    """Counts fetches and returns the queued results"""
+
+    def __init__(self, *results, delay=0.0):
+        self.results = list(results)
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.results[min(self.calls, len(self.results)) - 1]
+
+
+def make_cache(tmp_path=None, **kwargs):
+    tiers = [MemoryCacheTier(16)]
+    if tmp_path is not None:
+        tiers.append(SQLiteCacheTier(tmp_path / "resources.sqlite3", table="resource_cache"))
+    return ResourceSearchCache(TieredCache(tiers), parse_ttls("youtube:60,books:3600"), **kwargs)
+
+
+class TestResourceSearchCache:
+    """Test cases for ResourceSearchCache"""
+
+    @pytest.mark.unit
+    def test_key_and_ttls(self):
+        """Keys ignore case and whitespace; TTLs come from the per-type spec"""
+        cache = make_cache()
+
+        assert resource_cache_key(" Python  Basics", "youtube", "Beginner", 10) == resource_cache_key("python basics", "youtube", "beginner", 10)
+        assert resource_cache_key("python", "youtube", None, 10) == resource_cache_key("python", "youtube", "intermediate", 10)
+        assert resource_cache_key("python", "youtube", None, 10) != resource_cache_key("python", "youtube", None, 20)
+        assert cache.ttl_for("books") == 3600
+        assert cache.ttl_for("courses") == cache.default_ttl_seconds
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fresh_hit_skips_fetch_and_survives_restart(self, tmp_path):
+        """A repeat search is served from cache, including from the SQLite tier of a new process"""
+        fetch = Fetcher([VIDEO])
+        cache = make_cache(tmp_path)
+
+        assert await cache.get_or_fetch("Python", "youtube", "beginner", 10, fetch) == [VIDEO]
+        assert await cache.get_or_fetch("python ", "youtube", "Beginner", 10, fetch) == [VIDEO]
+        assert fetch.calls == 1
+
+        restarted = make_cache(tmp_path)
+        assert await restarted.get_or_fetch("python", "youtube", "beginner", 10, fetch) == [VIDEO]
+        assert fetch.calls == 1
+        assert restarted.stats()["tiers"]["hits"]["sqlite"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_while_refreshing(self):
+        """Past its TTL an entry is returned immediately and refreshed once in the background"""
+        fresh_video = dict(VIDEO, title="Updated course")
+        fetch = Fetcher([VIDEO], [fresh_video])
+        cache = make_cache(stale_seconds=600)
+        await cache.get_or_fetch("python", "youtube", None, 10, fetch)
+
+        with patch("services.resource_cache.time.time", return_value=time.time() + 120):
+            first = await cache.get_or_fetch("python", "youtube", None, 10, fetch)
+            second = await cache.get_or_fetch("python", "youtube", None, 10, fetch)
+            assert first == second == [VIDEO]
+            await asyncio.sleep(0)
+            await asyncio.gather(*cache._tasks)
+
+        assert fetch.calls == 2
+        assert cache.stats()["refreshes"] == 1
+        assert await cache.get_or_fetch("python", "youtube", None, 10, fetch) == [fresh_video]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_negative_results_cached_briefly(self):
+        """Searches with no verified results are cached for the negative TTL only"""
+        fetch = Fetcher([FALLBACK], [VIDEO])
+        cache = make_cache(negative_ttl_seconds=30)
+
+        await cache.get_or_fetch("obscure", "youtube", None, 5, fetch)
+        assert await cache.get_or_fetch("obscure", "youtube", None, 5, fetch) == [FALLBACK]
+        assert fetch.calls == 1
+        assert cache.stats()["negative_hits"] == 1
+
+        with patch("services.resource_cache.time.time", return_value=time.time() + 45), \
+             patch("services.response_cache.time.time", return_value=time.time() + 45):
+            assert await cache.get_or_fetch("obscure", "youtube", None, 5, fetch) == [VIDEO]
+        assert fetch.calls == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fetch(self):
+        """Identical searches arriving together trigger a single API fetch"""
+        fetch = Fetcher([VIDEO], delay=0.05)
+        cache = make_cache()
+
+        results = await asyncio.gather(*(cache.get_or_fetch("go", "youtube", None, 10, fetch) for _ in range(3)))
+
+        assert all(r == [VIDEO] for r in results)
+        assert fetch.calls == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_results(self):
+        """A background refresh that finds only fallbacks (e.g. quota exhausted) does not evict real results"""
+        fetch = Fetcher([VIDEO], [FALLBACK])
+        cache = make_cache(stale_seconds=600)
+        await cache.get_or_fetch("python", "youtube", None, 10, fetch)
+
+        with patch("services.resource_cache.time.time", return_value=time.time() + 120):
+            assert await cache.get_or_fetch("python", "youtube", None, 10, fetch) == [VIDEO]
+            await asyncio.sleep(0)
+            await asyncio.gather(*cache._tasks)
+            assert await cache.get_or_fetch("python", "youtube", None, 10, fetch) == [VIDEO]
+
+        assert cache.stats()["refresh_failures"] == 1
@@ -0,0 +1,80 @@
+"""
+Unit tests for the curated resource catalog
+"""
+import json
+import os
+
+import pytest
+
+from services.resource_catalog import LearningResource, ResourceCatalog
+from config.settings import settings
+
+
+def write_catalog(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+
+
+def record(topic, resource_type, title):
+    return {"topic": topic, "title": title, "url": f"https://example.com/{title}", "description": "d",
+            "provider": "Example", "resource_type": resource_type}
+
+
+class TestResourceCatalog:
+    """Test cases for ResourceCatalog"""
+
+    @pytest.mark.unit
+    def test_shipped_catalog_loads(self):
+        """The bundled data file covers the curated topics"""
+        catalog = ResourceCatalog(settings.RESOURCE_CATALOG_PATH)
+
+        assert catalog.topics() == ["javascript", "machine learning", "python", "react"]
+        python_videos = catalog.lookup("Python", "youtube")
+        assert python_videos and all(isinstance(r, LearningResource) for r in python_videos)
+        assert python_videos[0].language == "English"
+
+    @pytest.mark.unit
+    def test_default_path_does_not_depend_on_working_directory(self, tmp_path, monkeypatch):
+        """The bundled catalog is found when the app starts outside Generative/"""
+        monkeypatch.chdir(tmp_path)
+
+        assert ResourceCatalog(settings.RESOURCE_CATALOG_PATH).lookup("python", "books")
+
+    @pytest.mark.unit
+    def test_groups_are_parsed_on_demand(self, tmp_path):
+        """Nothing is read until a lookup, and only the requested group is parsed"""
+        path = tmp_path / "catalog.jsonl"
+        write_catalog(path, [record("python", "youtube", "a"), record("python", "books", "b"), record("go", "youtube", "c")])
+        catalog = ResourceCatalog(str(path))
+        assert catalog.stats()["indexed"] is False
+
+        assert [r.title for r in catalog.lookup("python", "books")] == ["b"]
+        assert catalog.lookup("rust", "books") == []
+
+        stats = catalog.stats()
+        assert stats["records"] == 3
+        assert stats["loaded_groups"] == 2
+
+    @pytest.mark.unit
+    def test_edits_are_picked_up_without_restart(self, tmp_path):
+        """Rewriting the file drops the index; bad lines are skipped"""
+        path = tmp_path / "catalog.jsonl"
+        write_catalog(path, [record("python", "youtube", "old")])
+        catalog = ResourceCatalog(str(path))
+        assert [r.title for r in catalog.lookup("python", "youtube")] == ["old"]
+
+        write_catalog(path, [record("python", "youtube", "new"), record("python", "youtube", "newer")])
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("{not json\n")
+        os.utime(path, (1, 1))
+
+        assert [r.title for r in catalog.lookup("python", "youtube")] == ["new", "newer"]
+        assert catalog.stats()["index_builds"] == 2
+
+    @pytest.mark.unit
+    def test_records_use_slots(self):
+        """Records carry no per-instance __dict__"""
+        resource = LearningResource.from_record(record("python", "youtube", "a"))
+
+        assert not hasattr(resource, "__dict__")
+        assert resource.to_dict()["url"] == "https://example.com/a"
+        assert resource.price is None
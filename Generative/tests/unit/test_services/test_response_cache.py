@@ -0,0 +1,110 @@
+"""
+Unit tests for the tiered LLM response cache
+"""
+import time
+import pytest
+from unittest.mock import patch
+
+from services.executors import io_executor
+from services.response_cache import (
+    CacheEntry, CacheTier, MemoryCacheTier, SQLiteCacheTier, TieredCache, make_cache_key
+)
+
+
+class TestResponseCache:
+    """Test cases for the response cache tiers"""
+
+    @pytest.mark.unit
+    def test_cache_key_normalizes_whitespace_and_params(self):
+        """Keys ignore whitespace differences but not model or parameter changes"""
+        base = make_cache_key("Hello\n   world ", "gemini", {"temperature": 0.7, "max_tokens": 10})
+
+        assert base == make_cache_key("Hello world", "gemini", {"max_tokens": 10, "temperature": 0.7})
+        assert base != make_cache_key("Hello world", "groq", {"temperature": 0.7, "max_tokens": 10})
+        assert base != make_cache_key("Hello world", "gemini", {"temperature": 0.2, "max_tokens": 10})
+
+    @pytest.mark.unit
+    def test_memory_tier_evicts_least_recently_used(self):
+        """The LRU drops the entry that was touched least recently"""
+        tier = MemoryCacheTier(max_entries=2)
+        entry = lambda v: CacheEntry(v, time.time(), time.time() + 60)
+        tier.set("a", entry(1))
+        tier.set("b", entry(2))
+        tier.get("a")
+        tier.set("c", entry(3))
+
+        assert tier.get("b") is None
+        assert tier.get("a").value == 1
+        assert tier.get("c").value == 3
+
+    @pytest.mark.unit
+    def test_entries_expire_after_ttl(self):
+        """Expired entries are treated as misses"""
+        cache = TieredCache([MemoryCacheTier()], default_ttl_seconds=10)
+        cache.set("k", "v")
+
+        with patch('services.response_cache.time.time', return_value=time.time() + 11):
+            assert cache.get("k") is None
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.unit
+    def test_sqlite_tier_persists_and_promotes(self, tmp_path):
+        """Disk entries survive a restart and are promoted into memory on hit"""
+        path = tmp_path / "cache.sqlite3"
+        TieredCache([MemoryCacheTier(), SQLiteCacheTier(path)]).set("k", {"text": "answer"})
+
+        memory = MemoryCacheTier()
+        cache = TieredCache([memory, SQLiteCacheTier(path)])
+
+        assert cache.get("k") == {"text": "answer"}
+        assert memory.get("k").value == {"text": "answer"}
+        assert cache.get("k") == {"text": "answer"}
+        assert cache.stats()["hits"] == {"memory": 1, "sqlite": 1}
+
+    @pytest.mark.unit
+    def test_sqlite_tier_is_size_bounded(self, tmp_path):
+        """Eviction keeps the disk tier within its entry budget"""
+        tier = SQLiteCacheTier(tmp_path / "cache.sqlite3", max_entries=10)
+        for n in range(60):
+            tier.set(f"k{n}", CacheEntry(n, time.time(), time.time() + 60))
+
+        assert len(tier) <= 20
+        assert tier.get("k59").value == 59
+
+    @pytest.mark.unit
+    def test_sqlite_reads_batch_last_access_updates(self, tmp_path):
+        """Reads queue their last-access time instead of committing per read"""
+        tier = SQLiteCacheTier(tmp_path / "cache.sqlite3", touch_batch=3)
+        tier.set("k", CacheEntry("v", time.time(), time.time() + 60))
+
+        tier.get("k")
+        tier.get("k")
+        assert len(tier._touches) == 1
+        tier.flush()
+        assert tier._touches == {}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_async_access_runs_disk_tier_off_the_event_loop(self, tmp_path):
+        """aget/aset use memory inline and hand the SQLite tier to the file I/O pool"""
+        memory = MemoryCacheTier()
+        cache = TieredCache([memory, SQLiteCacheTier(tmp_path / "cache.sqlite3")])
+
+        with patch("services.response_cache.io_executor.run", wraps=io_executor.run) as run:
+            await cache.aset("k", {"text": "answer"})
+            memory.clear()
+            assert await cache.aget("k") == {"text": "answer"}
+            assert await cache.aget("k") == {"text": "answer"}
+
+        assert run.call_count == 2  # the write and the first (disk) read
+        assert cache.stats()["hits"] == {"memory": 1, "sqlite": 1}
+
+    @pytest.mark.unit
+    def test_tier_interface_is_abstract(self):
+        """A tier missing part of the interface cannot be instantiated"""
+        class PartialTier(CacheTier):
+            def get(self, key):
+                return None
+
+        with pytest.raises(TypeError):
+            PartialTier()
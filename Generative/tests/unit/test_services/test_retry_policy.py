@@ -0,0 +1,122 @@
+"""
+Unit tests for the retry policy engine
+"""
+import random
+import pytest
+
+from services.llm_client import ProviderError
+from services.retry_policy import (
+    FATAL,
+    RATE_LIMIT,
+    SCHEMA_INVALID,
+    TRANSIENT,
+    Deadline,
+    RetryPolicy,
+    SchemaInvalidError,
+    classify,
+)
+
+
+class Recorder:
+    """Fails with the queued errors in order, then succeeds"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.attempts = []
+
+    async def __call__(self, attempt):
+        self.attempts.append(attempt)
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def make_policy(**kwargs):
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    policy = RetryPolicy("test", rng=random.Random(7), sleep=fake_sleep, **kwargs)
+    return policy, sleeps
+
+
+class TestClassify:
+    """Test cases for classify"""
+
+    @pytest.mark.unit
+    def test_error_classes(self):
+        """Provider status codes and parse failures map to their retry classes"""
+        assert classify(ProviderError("groq", "slow down", status_code=429)) == RATE_LIMIT
+        assert classify(ProviderError("groq", "HTTP 503", status_code=503)) == TRANSIENT
+        assert classify(ProviderError("groq", "ConnectError")) == TRANSIENT
+        assert classify(ProviderError("groq", "HTTP 401", status_code=401)) == FATAL
+        assert classify(ProviderError("groq", "circuit open", circuit_open=True)) == FATAL
+        assert classify(SchemaInvalidError("bad json")) == SCHEMA_INVALID
+        assert classify(KeyError("x")) == FATAL
+
+
+class TestRetryPolicy:
+    """Test cases for RetryPolicy"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_transient_errors_back_off_with_jitter(self):
+        """Transient failures sleep between base and max delay, then succeed"""
+        policy, sleeps = make_policy(base_delay=0.5, max_delay=8.0)
+        call = Recorder(ProviderError("gemini", "HTTP 500", status_code=500), ProviderError("gemini", "HTTP 502", status_code=502))
+
+        assert await policy.run(call) == "ok"
+        assert len(call.attempts) == 3
+        assert len(sleeps) == 2
+        assert all(0.5 <= s <= 8.0 for s in sleeps)
+        assert policy.stats()["failures"] == {TRANSIENT: 2}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fatal_errors_are_not_retried(self):
+        """A 4xx other than 429 is raised after a single attempt"""
+        policy, sleeps = make_policy()
+        call = Recorder(ProviderError("gemini", "HTTP 400", status_code=400))
+
+        with pytest.raises(ProviderError):
+            await policy.run(call)
+        assert len(call.attempts) == 1
+        assert sleeps == []
+        assert policy.stats()["give_ups"] == {"fatal": 1}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_rate_limit_honours_retry_after(self):
+        """The backoff is never shorter than the provider's Retry-After"""
+        policy, sleeps = make_policy(base_delay=0.1, max_delay=0.2)
+        call = Recorder(ProviderError("gemini", "429", status_code=429, retry_after=3.0))
+
+        assert await policy.run(call) == "ok"
+        assert sleeps == [3.0]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_gives_up_when_backoff_outlasts_deadline(self):
+        """No sleep is spent on a retry that cannot finish before the deadline"""
+        policy, sleeps = make_policy()
+        call = Recorder(ProviderError("gemini", "429", status_code=429, retry_after=30.0))
+
+        with pytest.raises(ProviderError):
+            await policy.run(call, deadline=Deadline(5.0))
+        assert sleeps == []
+        assert policy.stats()["give_ups"] == {"deadline": 1}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_schema_invalid_retries_immediately_as_repair(self):
+        """Schema failures retry without backoff and flag the attempt as a repair, within budget"""
+        policy, sleeps = make_policy(max_attempts=4, max_repairs=1)
+        call = Recorder(SchemaInvalidError("bad", raw_text="{oops"), SchemaInvalidError("still bad"))
+
+        with pytest.raises(SchemaInvalidError, match="still bad"):
+            await policy.run(call)
+        assert [a.repair for a in call.attempts] == [False, True]
+        assert call.attempts[1].last_error.raw_text == "{oops"
+        assert sleeps == []
+        assert policy.stats()["give_ups"] == {"repairs_exhausted": 1}
@@ -0,0 +1,83 @@
+"""
+Unit tests for the semantic roadmap cache
+"""
+import pytest
+
+from services.roadmap_cache import SemanticRoadmapCache, roadmap_tokens, jaccard
+
+
+ROADMAP = {"final_roadmap": "## Phase 1: Foundations", "metadata": {"session_id": "abc"}}
+
+
+class TestRoadmapTokens:
+    """Test cases for query normalization"""
+
+    @pytest.mark.unit
+    def test_filler_words_are_dropped(self):
+        """Phrasing differences around the topic normalize to the same tokens"""
+        assert roadmap_tokens("I want to learn Data Science") == roadmap_tokens("data science from scratch")
+
+    @pytest.mark.unit
+    def test_background_facets_are_tagged(self):
+        """Experience level and skills become distinct tagged tokens"""
+        tokens = roadmap_tokens("machine learning", {"experience_level": "Beginner", "current_skills": "Python, SQL"})
+        assert {"machine", "learning", "level:beginner", "skill:python", "skill:sql"} <= tokens
+
+
+class TestSemanticRoadmapCache:
+    """Test cases for SemanticRoadmapCache"""
+
+    def setup_method(self):
+        """Setup test instance"""
+        self.cache = SemanticRoadmapCache(threshold=0.8, max_entries=3)
+
+    @pytest.mark.unit
+    def test_near_duplicate_hits(self):
+        """A paraphrase above the threshold returns a copy of the stored roadmap"""
+        self.cache.store("I want to become a data scientist", None, ROADMAP, session_id="abc")
+
+        hit = self.cache.lookup("how do I become a data scientist?")
+
+        assert hit is not None
+        assert hit["result"] == ROADMAP
+        assert hit["result"] is not ROADMAP
+        assert hit["similarity"] == 1.0
+        assert hit["source_session_id"] == "abc"
+
+    @pytest.mark.unit
+    def test_different_topic_misses(self):
+        """Queries that only share a word stay below the threshold"""
+        self.cache.store("data science", None, ROADMAP)
+
+        assert self.cache.lookup("data engineering") is None
+        assert self.cache.stats()["misses"] == 1
+
+    @pytest.mark.unit
+    def test_threshold_is_tunable(self):
+        """Lowering the threshold admits looser matches"""
+        loose = SemanticRoadmapCache(threshold=0.5)
+        query_a, query_b = "python web development django", "python web development flask"
+        loose.store(query_a, None, ROADMAP)
+
+        assert jaccard(roadmap_tokens(query_a), roadmap_tokens(query_b)) == pytest.approx(0.6)
+        assert loose.lookup(query_b) is not None
+        assert self.cache.lookup(query_b) is None
+
+    @pytest.mark.unit
+    def test_background_and_namespace_must_match(self):
+        """Different experience levels and namespaces never share entries"""
+        self.cache.store("data science", {"experience_level": "beginner"}, ROADMAP, namespace="funneled")
+
+        assert self.cache.lookup("data science", {"experience_level": "advanced"}, "funneled") is None
+        assert self.cache.lookup("data science", {"experience_level": "beginner"}, "synthesized") is None
+        assert self.cache.lookup("data science", {"experience_level": "beginner"}, "funneled") is not None
+
+    @pytest.mark.unit
+    def test_least_recently_used_entry_is_evicted(self):
+        """Storage is bounded and evicts the least recently used roadmap"""
+        for topic in ("rust systems", "golang backend", "kotlin android", "swift ios"):
+            self.cache.store(topic, None, ROADMAP)
+
+        assert self.cache.stats()["entries"] == 3
+        assert self.cache.lookup("rust systems") is None
+        assert self.cache.lookup("swift ios") is not None
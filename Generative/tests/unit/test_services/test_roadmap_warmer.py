@@ -0,0 +1,129 @@
+"""
+Unit tests for popular roadmap precomputation
+"""
+import os
+import pytest
+from unittest.mock import patch
+
+from config.settings import settings
+from services.multi_agent_service import MultiAgentFunnelService
+from services.roadmap_cache import SemanticRoadmapCache
+from services.roadmap_warmer import RoadmapWarmer, warm_targets
+
+
+class FakeFunnelService:
+    """Stores generated roadmaps in the cache the way MultiAgentFunnelService does"""
+
+    def __init__(self, cache, namespace):
+        self.cache = cache
+        self.namespace = namespace
+        self.calls = []
+
+    async def generate_funneled_roadmap(self, user_query, user_background=None, use_cache=True):
+        self.calls.append((user_query, user_background, use_cache))
+        if user_query == "devops":
+            raise RuntimeError("all agents failed")
+        result = {"final_roadmap": f"# {user_query}", "metadata": {"session_id": f"s-{len(self.calls)}"}}
+        self.cache.store(user_query, user_background, result, self.namespace)
+        return result
+
+
+class TestRoadmapWarmer:
+    """Test cases for RoadmapWarmer"""
+
+    def setup_method(self):
+        """Setup test instance"""
+        self.cache = SemanticRoadmapCache()
+        self.targets = warm_targets(2, ["Beginner", "Intermediate"])
+
+    def make_warmer(self, cache, snapshot_path, version="1", targets=None):
+        warmer = RoadmapWarmer(
+            lambda: self.service,
+            cache,
+            targets or self.targets,
+            snapshot_path=str(snapshot_path),
+            refresh_seconds=3600,
+            version=version,
+        )
+        return warmer
+
+    @pytest.mark.unit
+    def test_targets_cover_top_careers_and_levels(self):
+        """Top-N queries are crossed with every experience level"""
+        assert self.targets == [
+            ("software engineering", {"experience_level": "Beginner"}),
+            ("software engineering", {"experience_level": "Intermediate"}),
+            ("data science", {"experience_level": "Beginner"}),
+            ("data science", {"experience_level": "Intermediate"}),
+        ]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_warm_generates_stale_targets_only(self, tmp_path):
+        """A second run finds everything fresh and makes no LLM calls"""
+        warmer = self.make_warmer(self.cache, tmp_path / "warm.jsonl")
+        self.service = FakeFunnelService(self.cache, warmer.namespace)
+
+        first = await warmer.warm_once()
+        second = await warmer.warm_once()
+
+        assert first == {"generated": 4, "failed": 0, "fresh": 0}
+        assert second == {"generated": 0, "failed": 0, "fresh": 4}
+        assert all(use_cache is False for _, _, use_cache in self.service.calls)
+        assert self.cache.lookup("learn software engineering", {"experience_level": "beginner"}, warmer.namespace)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_snapshot_seeds_cache_for_matching_version(self, tmp_path):
+        """A new process loads the snapshot; a bumped version ignores it"""
+        snapshot = tmp_path / "warm.jsonl"
+        warmer = self.make_warmer(self.cache, snapshot)
+        self.service = FakeFunnelService(self.cache, warmer.namespace)
+        await warmer.warm_once()
+
+        fresh_cache = SemanticRoadmapCache()
+        restarted = self.make_warmer(fresh_cache, snapshot)
+        assert restarted.load_snapshot() == 4
+        assert restarted.stale_targets() == []
+
+        bumped = self.make_warmer(SemanticRoadmapCache(), snapshot, version="2")
+        assert bumped.load_snapshot() == 0
+        assert len(bumped.stale_targets()) == 4
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failures_are_counted_and_retried(self, tmp_path):
+        """A failed target stays stale for the next refresh"""
+        targets = [("devops", {"experience_level": "Beginner"})]
+        warmer = self.make_warmer(self.cache, tmp_path / "warm.jsonl", targets=targets)
+        self.service = FakeFunnelService(self.cache, warmer.namespace)
+
+        outcome = await warmer.warm_once()
+
+        assert outcome["failed"] == 1
+        assert warmer.stale_targets() == targets
+        assert warmer.stats()["failed"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_warm_entry_is_served_by_the_funneled_route(self, tmp_path, isolated_funneling_log):
+        """A roadmap warmed ahead of traffic answers generate_funneled_roadmap without an LLM call"""
+        with patch.dict(os.environ, {'GROQ_API_KEY': 'test-groq-key', 'GOOGLE_GENAI_API_KEY': 'test-genai-key'}):
+            self.service = MultiAgentFunnelService()
+        self.service.roadmap_cache = self.cache
+        targets = [("software engineering", {"experience_level": "Beginner"})]
+        warmer = self.make_warmer(
+            self.cache, tmp_path / "warm.jsonl", version=settings.ROADMAP_CACHE_VERSION, targets=targets
+        )
+        roadmap = "## Phase 1: Foundations\n" + "Learn the core concepts step by step. " * 5
+
+        with patch.object(self.service, "_call_groq", return_value=roadmap):
+            assert (await warmer.warm_once())["generated"] == 1
+        with patch.object(self.service, "_call_groq", return_value=roadmap * 2) as groq:
+            result = await self.service.generate_funneled_roadmap(
+                "I want to learn software engineering", {"experience_level": "Beginner"}
+            )
+
+        groq.assert_not_called()
+        assert result["metadata"]["cache_hit"] is True
+        assert result["final_roadmap"] == roadmap
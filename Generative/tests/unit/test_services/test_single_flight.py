@@ -0,0 +1,119 @@
+"""
+Unit tests for single-flight request coalescing
+"""
+import asyncio
+import pytest
+
+from services.single_flight import SingleFlight, canonical_key
+
+
+class TestCanonicalKey:
+    """Test cases for canonical_key"""
+
+    @pytest.mark.unit
+    def test_equivalent_inputs_share_a_key(self):
+        """Case, whitespace, dict order and None fields do not change the key"""
+        a = canonical_key("Learn  Data Science", {"level": "Beginner", "goals": None, "skills": "python"})
+        b = canonical_key("learn data science ", {"skills": "Python", "level": "beginner"})
+        assert a == b
+
+    @pytest.mark.unit
+    def test_different_inputs_differ(self):
+        """Different inputs produce different keys"""
+        assert canonical_key("data science") != canonical_key("data engineering")
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight"""
+
+    def setup_method(self):
+        """Setup test instance"""
+        self.group = SingleFlight("test")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """Identical concurrent calls run once and each get their own copy"""
+        runs = []
+
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.05)
+            return {"phases": ["foundations"]}
+
+        results = await asyncio.gather(*(self.group.do("k", work) for _ in range(5)))
+
+        assert len(runs) == 1
+        assert all(r == {"phases": ["foundations"]} for r in results)
+        results[0]["phases"].append("mutated")
+        assert results[1] == {"phases": ["foundations"]}
+        stats = self.group.stats()
+        assert stats["calls"] == 5
+        assert stats["executions"] == 1
+        assert stats["collapsed"] == 4
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_sequential_calls_run_again(self):
+        """Only in-flight work is shared; a later call recomputes"""
+        runs = []
+
+        async def work():
+            runs.append(1)
+            return len(runs)
+
+        assert await self.group.do("k", work) == 1
+        assert await self.group.do("k", work) == 2
+        assert self.group.stats()["collapsed"] == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_every_waiter(self):
+        """A failed shared computation raises in every coalesced caller"""
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("provider down")
+
+        results = await asyncio.gather(*(self.group.do("k", work) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_shared_work_survives_one_cancelled_caller(self):
+        """Cancelling one caller leaves the shared task running for the others"""
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.ensure_future(self.group.do("k", work))
+        second = asyncio.ensure_future(self.group.do("k", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "done"
+        assert self.group.stats()["abandoned"] == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_shared_work_cancelled_when_all_callers_leave(self):
+        """The shared task is cancelled once no caller is waiting"""
+        cancelled = []
+
+        async def work():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        caller = asyncio.ensure_future(self.group.do("k", work))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+
+        assert cancelled == [True]
+        assert self.group.stats()["abandoned"] == 1
@@ -0,0 +1,114 @@
+"""
+Unit tests for the stage-DAG executor and the agent pipeline built on it
+"""
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from services.stage_dag import Stage, StageDAG
+
+
+class TestStageDAG:
+    """Test cases for StageDAG"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_independent_stages_overlap(self):
+        """Two stages sharing one input run concurrently and feed the final stage"""
+        async def source():
+            return 1
+
+        async def left(source):
+            await asyncio.sleep(0.1)
+            return source + 1
+
+        async def right(source):
+            await asyncio.sleep(0.1)
+            return source + 2
+
+        async def sink(left, right):
+            return left * right
+
+        dag = StageDAG([
+            Stage("sink", sink, ("left", "right")),
+            Stage("source", source),
+            Stage("left", left, ("source",)),
+            Stage("right", right, ("source",)),
+        ])
+        started = time.monotonic()
+        results = await dag.run()
+
+        assert results["sink"] == 6
+        assert time.monotonic() - started < 0.18
+        report = dag.report()
+        assert set(report["stages"]) == {"source", "left", "right", "sink"}
+        assert all(t["status"] == "completed" for t in report["stages"].values())
+        assert report["overlap_seconds"] > 0.05
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failure_cancels_running_stages(self):
+        """A failing stage raises and cancels its still-running siblings"""
+        async def boom():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("stage failed")
+
+        async def slow():
+            await asyncio.sleep(5)
+
+        dag = StageDAG([Stage("boom", boom), Stage("slow", slow)])
+
+        with pytest.raises(RuntimeError, match="stage failed"):
+            await dag.run()
+        assert dag.timings["boom"]["status"] == "failed"
+        assert dag.timings["slow"]["status"] == "cancelled"
+
+    @pytest.mark.unit
+    def test_rejects_cycles(self):
+        """Cyclic dependencies are refused at construction"""
+        async def noop(**_):
+            return None
+
+        with pytest.raises(ValueError, match="cycle"):
+            StageDAG([Stage("a", noop, ("b",)), Stage("b", noop, ("a",))])
+
+
+class TestAgentPipeline:
+    """Test cases for AgentService._analyze_with_fallback on the stage DAG"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_web_search_overlaps_roadmap_generation(self):
+        """Blocking discovery runs on the executor while the roadmap stage is generating"""
+        from services.agents.agent_service import AgentService
+
+        with patch.object(AgentService, "_init_gemini_fallback"):
+            service = AgentService(api_key="test-key")
+        events = []
+
+        async def fake_call(prompt, schema_class, max_retries=None, deadline=None):
+            name = schema_class.__name__
+            events.append(f"start {name}")
+            if name == "LearningRoadmap":
+                await asyncio.sleep(0.1)
+            events.append(f"end {name}")
+            if name == "CareerMatchAnalysis":
+                return {"best_match": {"title": "Data Scientist"}}
+            return {"stage": name, "prompt": prompt}
+
+        def discover_courses(skill, level="intermediate"):
+            events.append("discover courses")
+            return [{"title": "Course"}]
+
+        with patch.object(service, "_call_gemini_with_schema", side_effect=fake_call), \
+             patch("services.agents.tools.resource_discovery_tool.discover_courses_for_skill", side_effect=discover_courses), \
+             patch("services.agents.tools.resource_discovery_tool.discover_certifications_for_career", return_value=[]):
+            result = await service._analyze_with_fallback("python", "Intermediate")
+
+        assert events.index("discover courses") < events.index("end LearningRoadmap")
+        assert "Real-time Discovered Resources" in result["resources"]["prompt"]
+        assert set(result["stage_timings"]["stages"]) == {
+            "skill_assessment", "career_analysis", "learning_roadmap", "discovered_resources", "resources",
+        }
@@ -0,0 +1,125 @@
+"""
+Unit tests for the YouTube quota ledger
+"""
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from services.youtube_quota import CACHE_ONLY, MINIMAL, NORMAL, REDUCED, QuotaLedger
+
+
+class Clock:
+    def __init__(self, hour=12):
+        self.now = datetime(2026, 3, 10, hour, tzinfo=timezone.utc).timestamp()
+
+    def __call__(self):
+        return self.now
+
+
+class TestQuotaLedger:
+    """Test cases for QuotaLedger"""
+
+    @pytest.mark.unit
+    def test_records_units_per_endpoint_and_day(self):
+        """Calls are charged at each endpoint's unit cost and bucketed by quota day"""
+        clock = Clock()
+        ledger = QuotaLedger(daily_limit=10000, clock=clock)
+        ledger.record("search", calls=2)
+        ledger.record("videos")
+        clock.now += 86400
+        ledger.record("search")
+
+        stats = ledger.stats()
+        assert stats["spent"] == 100
+        assert stats["history"] == {"2026-03-10": 201, "2026-03-11": 100}
+        assert ledger.remaining() == 9900
+
+    @pytest.mark.unit
+    def test_projects_exhaustion_from_burn_rate(self):
+        """At the current burn rate the budget runs out before the reset"""
+        ledger = QuotaLedger(daily_limit=10000, clock=Clock(hour=12))
+        ledger.record("search", calls=60)  # 6000 units in 12 hours
+
+        exhaustion = ledger.projected_exhaustion()
+
+        assert exhaustion is not None
+        assert exhaustion.hour == 20
+        assert QuotaLedger(daily_limit=10000, clock=Clock(hour=12)).projected_exhaustion() is None
+
+    @pytest.mark.unit
+    def test_mode_degrades_as_budget_tightens(self):
+        """Plans get cheaper as the remaining fraction falls, ending in cache-only"""
+        ledger = QuotaLedger(daily_limit=10000, clock=Clock(hour=23))
+
+        assert ledger.mode() == NORMAL
+        ledger.record("search", calls=55)
+        assert ledger.mode() == REDUCED
+        ledger.record("search", calls=30)
+        assert ledger.mode() == MINIMAL
+        ledger.record("search", calls=14)
+        assert ledger.mode() == CACHE_ONLY
+        assert not ledger.plan().allows_api
+
+    @pytest.mark.unit
+    def test_fast_burn_steps_down_early(self):
+        """A burn rate that would exhaust the budget before reset degrades one step"""
+        ledger = QuotaLedger(daily_limit=10000, clock=Clock(hour=4))
+        ledger.record("search", calls=30)
+
+        assert ledger.mode() == REDUCED
+
+    @pytest.mark.unit
+    def test_persists_across_restarts(self, tmp_path):
+        """Spend and quotaExceeded marks survive a new ledger on the same file"""
+        path = str(tmp_path / "quota.json")
+        clock = Clock()
+        ledger = QuotaLedger(clock=clock, path=path)
+        ledger.record("search", calls=3)
+        ledger.mark_exhausted()
+        ledger.flush()
+
+        restored = QuotaLedger(clock=clock, path=path)
+        assert restored.spent() == 300
+        assert restored.remaining() == 0
+        assert restored.mode() == CACHE_ONLY
+
+    @pytest.mark.unit
+    def test_saves_are_debounced_onto_the_executor(self, tmp_path):
+        """Bursts of records produce one background write; flush persists the rest"""
+        class DeferredExecutor:
+            def __init__(self):
+                self.jobs = []
+
+            def submit(self, fn, *args):
+                self.jobs.append(lambda: fn(*args))
+
+        executor = DeferredExecutor()
+        path = tmp_path / "quota.json"
+        ledger = QuotaLedger(clock=Clock(), path=str(path), save_interval_seconds=60, executor=executor)
+
+        for _ in range(5):
+            ledger.record("search")
+        assert len(executor.jobs) == 1
+        assert not path.exists()
+
+        executor.jobs.pop()()
+        assert QuotaLedger(clock=Clock(), path=str(path)).spent() == 100
+
+        ledger.flush()
+        assert QuotaLedger(clock=Clock(), path=str(path)).spent() == 500
+
+    @pytest.mark.unit
+    def test_skipped_save_is_flushed_after_the_interval(self, tmp_path):
+        """Records that land inside the debounce window are written once it elapses"""
+        path = tmp_path / "quota.json"
+        ledger = QuotaLedger(clock=Clock(), path=str(path), save_interval_seconds=0.05)
+
+        for _ in range(3):
+            ledger.record("search")
+        assert QuotaLedger(clock=Clock(), path=str(path)).spent() == 100
+
+        deadline = time.monotonic() + 2
+        while QuotaLedger(clock=Clock(), path=str(path)).spent() != 300 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert QuotaLedger(clock=Clock(), path=str(path)).spent() == 300